@@ -0,0 +1,51 @@
+"""
+Automind: agents, LLM wrappers and tools.
+
+The public names below are resolved lazily, on first access, so `import automind` stays cheap and a backend
+(Gemini, Hugging Face, vLLM, DuckDuckGo, ...) is only imported when it is actually used.
+
+Example:
+    from automind import ThinkAgent, Gemini_model, WikiSearch
+"""
+import importlib
+
+_EXPORTS = {
+    "SingleAgent": "automind.agents.SingleAgent",
+    "ThinkAgent": "automind.agents.ThinkAgent",
+    "AgentBatch": "automind.agents.batch",
+    "AgentPool": "automind.agents.pool",
+    "Gemini_model": "automind.llms.gemini",
+    "AnyhfLLM": "automind.llms.hf",
+    "VLLM_model": "automind.llms.fast_hf",
+    "InMemoryCache": "automind.llms.cache",
+    "SQLiteCache": "automind.llms.cache",
+    "TieredCache": "automind.llms.cache",
+    "model_registry": "automind.llms.registry",
+    "warmup": "automind.llms.registry",
+    "BaseAction": "automind.actions.base",
+    "cached": "automind.actions.cache",
+    "http_client": "automind.actions.http",
+    "DuckDuckGoSearch": "automind.actions.tools.duckduckgosearch",
+    "WikiSearch": "automind.actions.tools.wikisearch",
+    "Scratchpad": "automind.memory.scratchpad",
+    "ObservationProcessor": "automind.memory.retrieval",
+    "VectorMemory": "automind.memory.vector",
+    "Tracer": "automind.tracing",
+    "EventBus": "automind.events",
+    "Scheduler": "automind.scheduler",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'automind' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from abc import abstractmethod
-from typing import Any , get_type_hints
+from typing import Any , ClassVar, Optional, get_type_hints
 from textwrap import dedent
+import asyncio
 import json
 
 
@@ -9,9 +10,19 @@ class BaseAction(BaseModel):
     """
     A base class for defining actions that can be executed. This class is meant to be inherited by other classes
     that implement the `execute` method.
+
+    Attributes:
+        resource (ClassVar[Optional[str]]): The upstream the action calls, e.g. `wikipedia`. An agent's
+            `automind.scheduler.Scheduler` limits the calls in flight per resource. `None` leaves the action
+            unlimited.
+        speculative (ClassVar[bool]): Whether the action is a read-only fetch that agents may start speculatively,
+            before the LLM has chosen it, and discard if unused.
     """
 
     llm: Any = None
+    resource: ClassVar[Optional[str]] = None
+    speculative: ClassVar[bool] = False
+    _cache_status: Optional[str] = PrivateAttr(default=None)
 
     @abstractmethod
     def execute(self):
@@ -20,18 +31,30 @@ class BaseAction(BaseModel):
         """
         pass
 
+    async def aexecute(self):
+        """
+        Asynchronously executes the action.
+
+        The default implementation runs `execute` in the event loop's default executor, so blocking
+        tools can be awaited without stalling other coroutines. Subclasses with a native async
+        implementation can override this method.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.execute)
+
     @classmethod
-    def get_tool_info(cls):
+    def get_tool_spec(cls) -> dict:
         """
-        A class method that returns information about the tool (class) and its parameters in JSON format.
+        A class method that returns information about the tool (class) and its parameters.
 
         Returns:
-            str: A JSON-formatted string containing the class name, class docstring, parameter names and their 
-            descriptions (excluding those in `expel_types`), and the return type of the `execute` method.
+            dict: The class name, class docstring, parameter names and their descriptions (excluding those
+            in `expel_types`), and the return type of the `execute` method.
         """
         type_hints = get_type_hints(cls.execute)
         expel_types = ['llm']
-        tool_info = {
+        returns = type_hints.get('return')
+        return {
             "cls": {
                 "kls": cls.__name__,
                 "doc": dedent(cls.__doc__).strip() if cls.__doc__ else "",
@@ -41,7 +64,15 @@ class BaseAction(BaseModel):
                 for field_name, field in cls.model_fields.items()
                 if field_name not in expel_types
             },
-            "returns": type_hints.get('return', 'void').__name__
+            "returns": getattr(returns, '__name__', 'void')
         }
 
-        return json.dumps(tool_info, indent=2)
+    @classmethod
+    def get_tool_info(cls):
+        """
+        A class method that returns information about the tool (class) and its parameters in JSON format.
+
+        Returns:
+            str: A JSON-formatted string of `get_tool_spec`.
+        """
+        return json.dumps(cls.get_tool_spec(), indent=2)
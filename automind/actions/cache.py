@@ -0,0 +1,167 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, Callable, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+import functools
+import hashlib
+import json
+import threading
+import time
+
+
+class ToolCache(BaseModel):
+    """
+    A thread-safe LRU cache for tool results with per-entry TTLs and single-flight coalescing:
+    while a result is being computed, concurrent callers asking for the same key wait for that
+    computation instead of starting their own.
+
+    Attributes:
+        max_size (int): The maximum number of results kept; the least recently used result is evicted first.
+        hits (int): The number of calls served from the cache.
+        misses (int): The number of calls that executed the tool.
+        coalesced (int): The number of calls that waited on an identical in-flight call.
+    """
+
+    max_size: int = 1024
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    _entries: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _inflight: dict = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def get_or_compute(self, key: str, fn: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Returns the cached result for `key`, computing it with `fn` if needed.
+
+        Args:
+            key (str): The cache key.
+            fn (Callable[[], Any]): The function computing the result on a miss.
+            ttl (Optional[float]): The number of seconds the result stays valid. `None` keeps it until evicted.
+
+        Returns:
+            Any: The cached or freshly computed result.
+        """
+        return self.fetch(key, fn, ttl=ttl)[0]
+
+    def fetch(self, key: str, fn: Callable[[], Any], ttl: Optional[float] = None) -> Tuple[Any, str]:
+        """
+        Same as `get_or_compute`, also reporting how the result was obtained.
+
+        Args:
+            key (str): The cache key.
+            fn (Callable[[], Any]): The function computing the result on a miss.
+            ttl (Optional[float]): The number of seconds the result stays valid. `None` keeps it until evicted.
+
+        Returns:
+            Tuple[Any, str]: The result, and either `hit`, `miss` or `coalesced`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at >= time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value, "hit"
+                del self._entries[key]
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result(), "coalesced"
+
+        try:
+            value = fn()
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            expires_at = time.time() + ttl if ttl is not None else None
+            self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(value)
+        return value, "miss"
+
+    def clear(self):
+        """
+        Removes every cached result.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The hit, miss and coalesced counters and the resulting hit rate.
+        """
+        total = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / total if total else 0.0
+        }
+
+
+tool_cache = ToolCache()
+
+
+def action_cache_key(action: Any) -> str:
+    """
+    Builds the cache key of an action from its class and its field values (excluding `llm`).
+
+    Args:
+        action (BaseAction): The action instance.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the call.
+    """
+    kls = type(action)
+    payload = json.dumps(
+        {"kls": f"{kls.__module__}.{kls.__qualname__}", "params": action.model_dump(exclude={"llm"})},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached(ttl: Optional[float] = None, cache: Optional[ToolCache] = None):
+    """
+    Decorates the `execute` method of an action so that its results are cached and identical
+    concurrent calls are coalesced into a single execution. The outcome of the last call (`hit`, `miss`
+    or `coalesced`) is recorded on the action as `_cache_status`.
+
+    Args:
+        ttl (Optional[float]): The number of seconds a result stays valid. `None` keeps it until evicted.
+        cache (Optional[ToolCache]): The cache to use. Defaults to the process-wide `tool_cache`.
+
+    Returns:
+        Callable: The decorator.
+
+    Example:
+        class WikiSearch(BaseAction):
+            @cached(ttl=3600)
+            def execute(self) -> str:
+                ...
+    """
+    def decorator(execute):
+        @functools.wraps(execute)
+        def wrapper(self):
+            store = cache if cache is not None else tool_cache
+            value, self._cache_status = store.fetch(action_cache_key(self), lambda: execute(self), ttl=ttl)
+            return value
+        return wrapper
+    return decorator
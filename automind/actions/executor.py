@@ -0,0 +1,187 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, List, Optional
+import asyncio
+import re
+import threading
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor(max_workers: int = 32) -> ThreadPoolExecutor:
+    """
+    Returns the process-wide thread pool used to run actions concurrently, creating it on first use.
+
+    Args:
+        max_workers (int): The number of worker threads of the pool when it is created.
+
+    Returns:
+        ThreadPoolExecutor: The shared thread pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="automind-action")
+        return _executor
+
+
+def describe_action(action: Any) -> str:
+    """
+    Returns a short human readable description of an action call, e.g. `WikiSearch(query='Jaipur')`.
+
+    Args:
+        action (BaseAction): The action instance.
+
+    Returns:
+        str: The description.
+    """
+    params = ", ".join(f"{key}={value!r}" for key, value in action.model_dump(exclude={"llm"}).items())
+    return f"{type(action).__name__}({params})"
+
+
+def action_query(action: Any) -> str:
+    """
+    Returns the text an action searches for, i.e. its field values joined together, e.g. `Jaipur`.
+
+    Args:
+        action (BaseAction): The action instance.
+
+    Returns:
+        str: The query text.
+    """
+    return " ".join(str(value) for value in action.model_dump(exclude={"llm"}).values())
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalizes a tool query for matching: lowercase, punctuation removed and whitespace collapsed.
+
+    Args:
+        text (str): The query.
+
+    Returns:
+        str: The normalized query.
+    """
+    return " ".join(re.sub(r"[^\w\s]", " ", str(text).lower()).split())
+
+
+def action_key(action: Any) -> str:
+    """
+    Returns a key identifying an action call regardless of the formatting of its arguments, i.e. its description
+    with normalized argument values, e.g. `WikiSearch(query='jaipur')` for `WikiSearch(query=' Jaipur!')`.
+
+    Args:
+        action (BaseAction): The action instance.
+
+    Returns:
+        str: The key.
+    """
+    params = ", ".join(
+        f"{key}={normalize_query(value)!r}" for key, value in action.model_dump(exclude={"llm"}).items()
+    )
+    return f"{type(action).__name__}({params})"
+
+
+def timeout_message(action: Any, timeout: float) -> str:
+    """
+    Returns:
+        str: The observation reported for an action that did not finish within `timeout` seconds.
+    """
+    return f"Error: {type(action).__name__} timed out after {timeout}s."
+
+
+def error_message(action: Any, exc: BaseException) -> str:
+    """
+    Returns:
+        str: The observation reported for an action that raised `exc`.
+    """
+    return f"Error: {type(action).__name__} failed with {type(exc).__name__}: {exc}"
+
+
+def execute_actions(actions: List[Any], timeout: Optional[float] = None, call: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Executes actions concurrently on the shared thread pool.
+
+    A single action without timeout runs inline in the calling thread. Otherwise every action runs in the
+    pool. Either way, an action that does not finish within `timeout` seconds, or that raises, is reported as
+    an error observation instead of failing the whole step.
+
+    Args:
+        actions (List[BaseAction]): The actions to execute.
+        timeout (Optional[float]): The maximum number of seconds to wait for each action.
+        call (Optional[Callable[[Any], Any]]): Executes one action, e.g. under a scheduler slot. Defaults to
+            the action's `execute`.
+
+    Returns:
+        List[Any]: The results, in the order of `actions`.
+    """
+    call = call or (lambda action: action.execute())
+    if len(actions) == 1 and timeout is None:
+        try:
+            return [call(actions[0])]
+        except Exception as exc:
+            return [error_message(actions[0], exc)]
+
+    futures = [get_executor().submit(call, action) for action in actions]
+    wait(futures, timeout=timeout)
+
+    results = []
+    for action, future in zip(actions, futures):
+        if not future.done():
+            future.cancel()
+            results.append(timeout_message(action, timeout))
+        elif future.exception() is not None:
+            results.append(error_message(action, future.exception()))
+        else:
+            results.append(future.result())
+    return results
+
+
+async def aexecute_actions(actions: List[Any], timeout: Optional[float] = None, call: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+    """
+    Asynchronous counterpart of `execute_actions`, awaiting every action's `aexecute` concurrently. Failures
+    and timeouts are reported as error observations.
+
+    Args:
+        actions (List[BaseAction]): The actions to execute.
+        timeout (Optional[float]): The maximum number of seconds to wait for each action.
+        call (Optional[Callable[[Any], Any]]): Returns the awaitable executing one action. Defaults to the
+            action's `aexecute`.
+
+    Returns:
+        List[Any]: The results, in the order of `actions`.
+    """
+    call = call or (lambda action: action.aexecute())
+    if len(actions) == 1 and timeout is None:
+        try:
+            return [await call(actions[0])]
+        except Exception as exc:
+            return [error_message(actions[0], exc)]
+
+    async def run(action):
+        try:
+            return await asyncio.wait_for(call(action), timeout=timeout)
+        except asyncio.TimeoutError:
+            return timeout_message(action, timeout)
+        except Exception as exc:
+            return error_message(action, exc)
+
+    return list(await asyncio.gather(*(run(action) for action in actions)))
+
+
+def merge_observations(actions: List[Any], results: List[Any]) -> Any:
+    """
+    Merges the results of several actions into a single observation.
+
+    Args:
+        actions (List[BaseAction]): The executed actions.
+        results (List[Any]): Their results, in the same order.
+
+    Returns:
+        Any: The result itself for a single action, otherwise one labelled section per action.
+    """
+    if len(actions) == 1:
+        return results[0]
+    return "\n\n".join(
+        f"[{describe_action(action)}]\n{result}" for action, result in zip(actions, results)
+    )
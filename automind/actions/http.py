@@ -0,0 +1,230 @@
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import threading
+import time
+
+DEFAULT_USER_AGENT = "automind/0.1 (https://github.com/BhavyaBhola/Automind)"
+
+
+class TokenBucket(BaseModel):
+    """
+    A thread-safe token bucket limiting the rate of requests sent to an upstream.
+
+    Attributes:
+        rate (float): The number of tokens added per second, i.e. the sustained number of requests per second.
+        capacity (float): The maximum number of tokens, i.e. the size of a burst.
+    """
+
+    rate: float
+    capacity: float = 1.0
+    _tokens: float = PrivateAttr(default=None)
+    _updated: float = PrivateAttr(default_factory=time.monotonic)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any):
+        self._tokens = self.capacity
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until one is available.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Takes a token without waiting, possibly ahead of time.
+
+        Args:
+            max_wait (Optional[float]): The longest acceptable wait. If the token would only be usable later, it
+                is not taken.
+
+        Returns:
+            Optional[float]: The number of seconds the caller must wait before using the token, or None if no
+            token was taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max((1 - tokens) / self.rate, 0.0)
+            if max_wait is not None and wait > max_wait:
+                self._tokens = tokens
+                return None
+            self._tokens = tokens - 1
+            return wait
+
+
+class HTTPClient(BaseModel):
+    """
+    A shared HTTP client for the search tools.
+
+    Requests go through a single `requests.Session` whose connection pools keep connections (and their TLS
+    sessions) alive across calls and threads. Each upstream host has its own token bucket, and transient
+    failures (connection errors, timeouts, 429 and 5xx responses) are retried with jittered exponential backoff.
+
+    Attributes:
+        timeout (Tuple[float, float]): The connect and read timeouts, in seconds.
+        pool_connections (int): The number of hosts whose connection pools are kept.
+        pool_maxsize (int): The maximum number of connections kept alive per host.
+        max_attempts (int): The maximum number of attempts per request.
+        backoff (float): The base of the exponential backoff, in seconds.
+        max_backoff (float): The maximum wait between two attempts, in seconds.
+        retry_statuses (Tuple[int, ...]): The response statuses that are retried.
+        rate_limits (Dict[str, float]): The maximum number of requests per second for each host.
+        default_rate_limit (Optional[float]): The maximum number of requests per second for other hosts.
+            `None` leaves them unlimited.
+        burst (float): The number of requests a host may receive at once before being rate limited.
+        headers (Dict[str, str]): Headers sent with every request.
+    """
+
+    timeout: Tuple[float, float] = (5.0, 20.0)
+    pool_connections: int = 16
+    pool_maxsize: int = 32
+    max_attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    rate_limits: Dict[str, float] = Field(default_factory=lambda: {"en.wikipedia.org": 10.0, "duckduckgo.com": 1.0})
+    default_rate_limit: Optional[float] = None
+    burst: float = 2.0
+    headers: Dict[str, str] = Field(default_factory=lambda: {"User-Agent": DEFAULT_USER_AGENT})
+    _session: Any = PrivateAttr(default=None)
+    _buckets: Dict[str, TokenBucket] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def session(self):
+        """
+        The pooled `requests.Session`, created on first use.
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers.update(self.headers)
+                    self._session = session
+        return self._session
+
+    def limiter(self, host: str) -> Optional[TokenBucket]:
+        """
+        Returns the token bucket of a host, creating it on first use.
+
+        Args:
+            host (str): The host name.
+
+        Returns:
+            Optional[TokenBucket]: The bucket, or None when the host is not rate limited.
+        """
+        rate = self.rate_limits.get(host, self.default_rate_limit)
+        if rate is None:
+            return None
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(rate=rate, capacity=max(self.burst, 1.0))
+            return self._buckets[host]
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """
+        Returns:
+            bool: Whether a failed attempt may be retried.
+        """
+        import requests
+
+        if isinstance(exc, requests.HTTPError):
+            return exc.response is not None and exc.response.status_code in self.retry_statuses
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+    def call(self, host: str, fn: Callable[[], Any], retry_on: Tuple[type, ...] = ()) -> Any:
+        """
+        Calls `fn` under the rate limit of `host`, retrying transient failures.
+
+        Args:
+            host (str): The upstream host, selecting the token bucket.
+            fn (Callable[[], Any]): The call, e.g. a request made by a third-party client.
+            retry_on (Tuple[type, ...]): Additional exception types that are retried.
+
+        Returns:
+            Any: The result of `fn`.
+        """
+        from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+        bucket = self.limiter(host)
+
+        def attempt():
+            if bucket is not None:
+                bucket.acquire()
+            return fn()
+
+        retrying = Retrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_random_exponential(multiplier=self.backoff, max=self.max_backoff),
+            retry=retry_if_exception(lambda exc: self.is_retryable(exc) or isinstance(exc, retry_on)),
+            reraise=True
+        )
+        return retrying(attempt)
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Sends a request through the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL.
+            **kwargs: Passed to `requests.Session.request`, e.g. `params`. `timeout` defaults to the client's.
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.HTTPError: If the response still has an error status after the retries.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+
+        def send():
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return self.call(urlsplit(url).hostname or "", send)
+
+    def get_json(self, url: str, params: Optional[dict] = None, **kwargs) -> Any:
+        """
+        Sends a GET request and decodes its JSON response.
+
+        Args:
+            url (str): The URL.
+            params (Optional[dict]): The query parameters.
+            **kwargs: Passed to `request`.
+
+        Returns:
+            Any: The decoded response.
+        """
+        return self.request("GET", url, params=params, **kwargs).json()
+
+    def close(self):
+        """
+        Closes the pooled connections.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+http_client = HTTPClient()
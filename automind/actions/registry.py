@@ -0,0 +1,99 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Tuple
+import functools
+import json
+
+
+class ToolRegistry(BaseModel):
+    """
+    An immutable, precomputed view of an agent's action set.
+
+    The tool catalog embedded in the prompts is serialized once, as compact JSON, and reused across
+    iterations and agents instead of being rebuilt for every prompt. Tools requested by the LLM are
+    resolved by name with a dict lookup, so only registered tools can ever be dispatched.
+
+    Attributes:
+        tools (Tuple[Any, ...]): The action classes, in the order they were given.
+        by_name (Dict[str, Any]): The action classes keyed by class name.
+        catalog (str): The compact JSON list of every tool's `get_tool_spec`.
+        names (str): The comma-separated tool names.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    tools: Tuple[Any, ...]
+    by_name: Dict[str, Any]
+    catalog: str
+    names: str
+
+    def get(self, name: str) -> Any:
+        """
+        Resolves a tool name produced by the LLM.
+
+        Args:
+            name (str): The tool name.
+
+        Returns:
+            Any: The registered action class.
+
+        Raises:
+            ValueError: If no tool with this name is registered.
+        """
+        try:
+            return self.by_name[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool {name!r}. Available tools: {self.names}") from None
+
+    def instantiate(self, name: str, arguments: dict, **extra) -> Any:
+        """
+        Instantiates a registered tool from the arguments produced by the LLM. Arguments that are not
+        fields of the tool (e.g. `type`) are ignored.
+
+        Args:
+            name (str): The tool name.
+            arguments (dict): The arguments produced by the LLM.
+            **extra: Additional field values, e.g. `llm`.
+
+        Returns:
+            BaseAction: The tool instance.
+        """
+        tool_cls = self.get(name)
+        params = {
+            field_name: value for field_name, value in (arguments or {}).items()
+            if field_name in tool_cls.model_fields and field_name not in extra
+        }
+        return tool_cls(**params, **extra)
+
+
+@functools.lru_cache(maxsize=128)
+def build_registry(tools: Tuple[Any, ...]) -> ToolRegistry:
+    """
+    Builds the registry of a tuple of action classes. Results are memoized per action set.
+
+    Args:
+        tools (Tuple[Any, ...]): The action classes.
+
+    Returns:
+        ToolRegistry: The registry.
+    """
+    return ToolRegistry(
+        tools=tools,
+        by_name={tool.__name__: tool for tool in tools},
+        catalog=json.dumps([tool.get_tool_spec() for tool in tools], separators=(",", ":"), ensure_ascii=False),
+        names=", ".join(tool.__name__ for tool in tools)
+    )
+
+
+def get_registry(actions: Any) -> ToolRegistry:
+    """
+    Returns the registry of an action set, building it on first use.
+
+    Args:
+        actions (Any): A `ToolRegistry`, or an iterable of action classes.
+
+    Returns:
+        ToolRegistry: The registry.
+    """
+    if isinstance(actions, ToolRegistry):
+        return actions
+    return build_registry(tuple(actions))
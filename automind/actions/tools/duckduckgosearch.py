@@ -1,6 +1,28 @@
 from automind.actions.base import BaseAction
+from automind.actions.cache import cached
+from automind.actions.http import http_client
 from pydantic import Field
-from duckduckgo_search import DDGS
+from typing import ClassVar
+import threading
+
+_clients = threading.local()
+
+
+def get_ddgs():
+    """
+    Returns the DuckDuckGo client of the calling thread, creating it on first use, so its connections
+    are kept alive across searches.
+
+    Returns:
+        DDGS: The client.
+    """
+    from duckduckgo_search import DDGS
+
+    client = getattr(_clients, "ddgs", None)
+    if client is None:
+        client = _clients.ddgs = DDGS(headers=http_client.headers, timeout=int(http_client.timeout[1]))
+    return client
+
 
 class DuckDuckGoSearch(BaseAction):
     """
@@ -9,7 +31,14 @@ class DuckDuckGoSearch(BaseAction):
     query: str = Field(
         ... , description="The search string. be simple"
         )
+    resource: ClassVar[str] = "duckduckgo"
+    speculative: ClassVar[bool] = True
     
+    @cached(ttl=300)
     def execute(self) -> str:
-      results = DDGS().text(self.query, max_results=2)
-      return results
\ No newline at end of file
+      from duckduckgo_search.exceptions import RatelimitException, TimeoutException
+
+      results = http_client.call(
+        "duckduckgo.com", lambda: get_ddgs().text(self.query, max_results=2), retry_on=(RatelimitException, TimeoutException)
+      )
+      return results
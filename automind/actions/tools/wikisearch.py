@@ -1,6 +1,9 @@
 from automind.actions.base import BaseAction
-import wikipedia
+from automind.actions.cache import cached
+from automind.actions.http import http_client
+from automind.events import DEBUG, emit
 from pydantic import Field
+from typing import ClassVar
 
 class WikiSearch(BaseAction):
     """
@@ -9,11 +12,21 @@ class WikiSearch(BaseAction):
     query: str = Field(
         ... , description="The search string. be simple"
         )
+    api_url: ClassVar[str] = "https://en.wikipedia.org/w/api.php"
+    resource: ClassVar[str] = "wikipedia"
+    speculative: ClassVar[bool] = True
     
+    @cached(ttl=3600)
     def execute(self) -> str:
-      search_res = wikipedia.search(self.query)
-      print(search_res)
+      search = http_client.get_json(self.api_url, params={
+        "action": "query", "list": "search", "srsearch": self.query, "srlimit": 5, "srprop": "", "format": "json"
+      })
+      search_res = [hit["title"] for hit in search.get("query", {}).get("search", [])]
+      emit("wiki_search_results", "Wikipedia results for {query}: {results}", level=DEBUG, source="WikiSearch", query=self.query, results=search_res)
       if not search_res:
         return 'No results found.'
-      article = wikipedia.page(search_res[0])
-      return article.title + '\n' + article.content
\ No newline at end of file
+      pages = http_client.get_json(self.api_url, params={
+        "action": "query", "prop": "extracts", "explaintext": 1, "redirects": 1, "titles": search_res[0], "format": "json"
+      })
+      article = next(iter(pages.get("query", {}).get("pages", {}).values()), {})
+      return article.get("title", search_res[0]) + '\n' + article.get("extract", "")
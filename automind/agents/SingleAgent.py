@@ -1,11 +1,12 @@
-from pydantic import BaseModel
-from typing import Any
-from automind.prompts.initial_prompt import generate_initial_prompt
-from automind.prompts.summary_prompt import summary_prompt
-from automind.agents.base import BaseLLM
-import importlib
-import json
-import re
+from pydantic import BaseModel, Field
+from typing import Any, Callable, List, Literal, Optional
+from automind.prompts.initial_prompt import generate_initial_prompt, initial_prompt_prefix
+from automind.prompts.summary_prompt import fused_summary_prompt, summary_prompt
+from automind.agents.base import BaseLLM, LLMRequest, ToolRequest
+from automind.agents.parser import find_json, parse_response, repair_json
+from automind.agents.speculation import Speculation, speculation_stats, speculative_calls
+from automind.actions.registry import get_registry
+from automind.events import DEBUG
 
 
 def extract_output(content: str):
@@ -18,14 +19,62 @@ def extract_output(content: str):
     Returns:
         dict or None: The parsed JSON data if found, otherwise None.
     """
-    json_patters = r"```json(.*?)```"
-    matches = re.search(json_patters, content, re.DOTALL)
-    if not matches:
-        return None
+    blob = find_json(content)
+    return repair_json(blob)[0] if blob is not None else None
 
-    json_content = matches.group(1)
-    json_data = json.loads(json_content)
-    return json_data
+
+def brief(text: str, max_chars: int = 200) -> str:
+    """
+    Shortens a text to its first sentences, within `max_chars`.
+
+    Args:
+        text (str): The text.
+        max_chars (int): The maximum length.
+
+    Returns:
+        str: The beginning of the text, cut at a sentence or word boundary.
+    """
+    text = " ".join(str(text).split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    end = cut.rfind(". ")
+    if end > max_chars // 3:
+        return cut[:end + 1]
+    return cut.rsplit(" ", 1)[0] + "..."
+
+
+def extractive_summary(tool_obj: Any, max_items: int = 5, max_chars: int = 200) -> str:
+    """
+    Builds the summary bullet points straight from the tool output, without calling the LLM. Structured results,
+    such as the `title` / `href` / `body` dicts returned by DuckDuckGo, give one item each; a text result (e.g. a
+    Wikipedia article) gives a single item titled by its first line.
+
+    Args:
+        tool_obj (Any): The (merged) result returned by the tools.
+        max_items (int): The maximum number of items.
+        max_chars (int): The maximum length of the summary of each item.
+
+    Returns:
+        str: The bullet points.
+    """
+    items = tool_obj if isinstance(tool_obj, list) else [tool_obj]
+    bullets = []
+    for item in items[:max_items]:
+        if isinstance(item, dict):
+            title = item.get("title") or item.get("name") or ""
+            link = item.get("href") or item.get("url") or item.get("link") or ""
+            body = item.get("body") or item.get("snippet") or item.get("content") or ""
+        else:
+            title, _, body = str(item).strip().partition("\n")
+            link = ""
+        lines = [f"- **Title:** {title.strip()}"]
+        if link:
+            lines.append(f"- **Link:** {link}")
+        if body.strip():
+            lines.append(f"- **Summary:** {brief(body, max_chars)}")
+        bullets.append("\n".join(lines))
+    return "\n\n".join(bullets)
 
 
 class SingleAgent(BaseLLM):
@@ -38,6 +87,21 @@ class SingleAgent(BaseLLM):
         actions (Any): The available actions the agent can perform.
         num_iterations (int): The number of iterations the agent will perform.
         backstory (str): The backstory or context for the task.
+        summary (bool): Whether the tool output is summarized.
+        summary_mode (str): How the tool output is summarized:
+            `llm` asks the LLM for the summary in a separate call;
+            `fused` continues the tool selection prompt with the tool output, so the LLM's prefix cache serves
+            everything but the tool output;
+            `extractive` builds the bullet points from the structured tool output without calling the LLM;
+            `capped` only calls the LLM when the tool output exceeds `summary_threshold` tokens, and is
+            extractive otherwise.
+        summary_threshold (int): The number of tokens of tool output above which the `capped` mode calls the LLM.
+        speculative (bool): Whether the `speculative` tools (e.g. WikiSearch, DuckDuckGoSearch) are called with the
+            question while the LLM chooses the action. A prefetch is used if the LLM picks the same tool and query
+            (ignoring case and punctuation), and discarded otherwise.
+        speculation_stats (Any): The `automind.agents.speculation.SpeculationStats` recording the hit rate and the
+            latency saved. Defaults to the process-wide `speculation_stats`.
+        stop_sequences (Optional[List[str]]): Sequences halting the generation once the action has been written.
 
     Methods:
         generate_prompt(): Generates the initial prompt for the language model.
@@ -46,56 +110,195 @@ class SingleAgent(BaseLLM):
     """
 
     summary:bool
+    summary_mode: Literal["llm", "fused", "extractive", "capped"] = "llm"
+    summary_threshold: int = 1000
+    speculative: bool = False
+    speculation_stats: Any = None
+    stop_sequences: Optional[List[str]] = Field(default_factory=lambda: ["</output>"])
 
     def generate_prompt(self):
         """
-        Generates the initial prompt using the provided question, actions, and backstory.
+        Generates the initial prompt using the provided question, actions, and backstory. The backstory is
+        shortened if the prompt exceeds the agent's context budget.
 
         Returns:
             str: The generated prompt string.
         """
-        return generate_initial_prompt(question=self.question, actions=self.actions, backstory=self.backstory)
+        prompt = generate_initial_prompt(question=self.question, actions=self.actions, backstory=self.backstory, parallel=self.parallel_actions)
+        budget = self.prompt_budget()
+        if budget is None or self.prompt_tokens(prompt) <= budget:
+            return prompt
+        return self.fit_backstory(
+            lambda backstory: generate_initial_prompt(question=self.question, actions=self.actions, backstory=backstory, parallel=self.parallel_actions),
+            budget
+        )
 
-    def run_task(self):
+    def generate_summary_prompt(self, tool_obj: Any, render: Callable[[Any], str] = summary_prompt) -> str:
         """
-        Runs the task by interacting with the language model, executing the appropriate tool,
-        and returning the tool's response.
+        Generates the prompt summarizing the tool output, shortening the output if the prompt exceeds the
+        agent's context budget.
+
+        Args:
+            tool_obj (Any): The (merged) result returned by the tools.
+            render (Callable[[Any], str]): Renders the prompt from the tool output.
 
         Returns:
-            dict: The response containing the tool name and its execution result.
+            str: The summary prompt.
+        """
+        prompt = render(tool_obj)
+        budget = self.prompt_budget()
+        if budget is None or self.count_tokens(prompt) <= budget:
+            return prompt
+        allowed = max(budget - self.count_tokens(render("")), 0)
+        return render(self.get_token_counter().truncate(str(tool_obj), allowed))
+
+    def summarize(self, tool_obj: Any, prompt: str, llm_response: str):
+        """
+        Summarizes the tool output according to `summary_mode`.
+
+        Args:
+            tool_obj (Any): The (merged) result returned by the tools.
+            prompt (str): The tool selection prompt.
+            llm_response (str): The tool selection response.
+
+        Yields:
+            LLMRequest: The summary request, unless the summary is extractive.
+
+        Returns:
+            str: The summary.
+        """
+        mode = self.summary_mode
+        if mode == "capped":
+            mode = "llm" if self.count_tokens(tool_obj) > self.summary_threshold else "extractive"
+
+        if mode == "extractive":
+            with self.span("summary_extraction"):
+                return extractive_summary(tool_obj)
+
+        self.emit("summary_start", f"\n{'-' * 30}\n📝 Generating Summary...\n{'-' * 30}")
+        if mode == "fused":
+            selection = llm_response.split("</output>")[0]
+            render = lambda observation: fused_summary_prompt(prompt, selection, observation)
+        else:
+            render = summary_prompt
+        return (yield LLMRequest(prompt=self.build_prompt(self.generate_summary_prompt, tool_obj, render)))
+
+    def prompt_prefix(self) -> str:
+        """
+        Returns:
+            str: The static beginning of the initial prompt (format instructions, action catalog and backstory).
+        """
+        return initial_prompt_prefix(actions=self.actions, backstory=self.backstory, parallel=self.parallel_actions)
+
+    def speculate(self) -> Optional[Speculation]:
+        """
+        Starts the speculative tool calls, if `speculative` is set.
+
+        Returns:
+            Optional[Speculation]: The speculation in progress, or None.
+        """
+        if not self.speculative:
+            return None
+        calls = speculative_calls(get_registry(self.actions).tools, self.question)
+        return Speculation.start(calls, self.speculation_stats or speculation_stats, execute=self.tool_call())
+
+    def select_tools(self, llm_response: str):
+        """
+        Parses the LLM response and loads the tools it selected.
+
+        Args:
+            llm_response (str): The raw response generated by the LLM.
+
+        Returns:
+            List[BaseAction]: The tool instances to execute.
+
+        Raises:
+            ValueError: If the response holds no valid action.
         """
-        llm_response = self.llm.run(self.generate_prompt())
-        llm_response = extract_output(llm_response)
+        with self.span("output_parsing", response_chars=len(llm_response)) as span:
+            parsed = parse_response(llm_response)
+            span.set(has_action=parsed.action is not None, repaired=parsed.repaired)
+        if parsed.action is None:
+            raise ValueError(f"No valid action in the LLM response: {parsed.action_error or 'no JSON action found'}")
+        with self.span("tool_dispatch"):
+            tools = self.load_tools(parsed.action)
+
+        for tool in tools:
+            self.emit("tool_loaded", f"\n{'-' * 30}\n📦 Loading Tool: {{tool}} from module: {{module}}\n{'-' * 30}", level=DEBUG, tool=type(tool).__name__, module=type(tool).__module__)
+        self.emit("tool_start", f"\n{'-' * 30}\n🚀 Executing Tool: {{tools}}...\n{'-' * 30}", tools=", ".join(type(tool).__name__ for tool in tools))
+        return tools
 
-        cls_name = llm_response['name']
-        mod_name = llm_response['arguments']['module']
-        
-        print(f"\n{'-' * 30}\n📦 Loading Tool: {cls_name} from module: {mod_name}\n{'-' * 30}")
-        tool_cls = getattr(importlib.import_module(mod_name), cls_name)
-        tool_cls = tool_cls(query=llm_response['arguments']['query'])
-        setattr(tool_cls, 'llm', self.llm)
-        
-        print(f"\n{'-' * 30}\n🚀 Executing Tool: {cls_name}...\n{'-' * 30}")
-        tool_obj = tool_cls.execute()
+    def tool_response(self, tools, tool_obj: Any):
+        """
+        Wraps the tool output into the agent's response.
 
-        print(f"\n{'-' * 30}\n🛠️ Tool Execution Completed.\n{'-' * 30}")
-        print(f"Tool Name: {cls_name}\nTool Response: {tool_obj}\n")
+        Args:
+            tools (List[BaseAction]): The executed tools.
+            tool_obj (Any): The (merged) result returned by the tools.
+
+        Returns:
+            dict: The response containing the tool name and its execution result.
+        """
+        cls_name = ', '.join(type(tool).__name__ for tool in tools)
+        self.emit("tool_response", f"\n{'-' * 30}\n🛠️ Tool Execution Completed.\n{'-' * 30}\nTool Name: {{tool}}\nTool Response: {{response}}\n", tool=cls_name, response=tool_obj)
 
-        response = {
+        return {
             "tool_name": cls_name,
             "tool_response": tool_obj
         }
 
+    def task(self):
+        """
+        The agent's workflow: requests an LLM response, executes the tools it selects and, if `summary`
+        is set, summarizes the tool output according to `summary_mode`.
+
+        Yields:
+            LLMRequest or ToolRequest: The next LLM call or tool execution needed.
+
+        Returns:
+            dict or str: The tool response, or its summary.
+        """
+        prompt = self.build_prompt(self.generate_prompt)
+        speculation = self.speculate()
+        tools = []
+        try:
+            llm_response = yield LLMRequest(prompt=prompt, stop=self.stop_sequences, until_action=True)
+            tools = self.select_tools(llm_response)
+        finally:
+            prefetched = speculation.resolve(tools) if speculation is not None else {}
+        if speculation is not None:
+            self.emit("speculation", "🔮 Prefetched {hits} of {tools} tool calls\n", level=DEBUG, hits=len(prefetched), tools=len(tools))
+        tool_obj = self.process_observation((yield ToolRequest(tools=tools, prefetched=prefetched)), self.question)
+        response = self.tool_response(tools, tool_obj)
+
         if self.summary:
-            print(f"\n{'-' * 30}\n📝 Generating Summary...\n{'-' * 30}")
-            response = self.llm.run(summary_prompt(tool_obj))
-            print(f"\n{'-' * 30}\n📄 Summary Generated:\n{'-' * 30}")
-            print(f"{response}\n")
+            response = yield from self.summarize(tool_obj, prompt, llm_response)
+            self.emit("summary", f"\n{'-' * 30}\n📄 Summary Generated ({{mode}}):\n{'-' * 30}\n{{summary}}\n", summary=response, mode=self.summary_mode)
+            self.remember_answer(response)
             return response
-        
-        print(print(f"\n{'='*30}\n🎯 Final Answer:\n{response}\n{'='*30}"))
+
+        self.emit("final_answer", f"\n{'='*30}\n🎯 Final Answer:\n{{answer}}\n{'='*30}", answer=response)
         return response
 
+    def run_task(self):
+        """
+        Runs the task by interacting with the language model, executing the appropriate tool,
+        and returning the tool's response.
+
+        Returns:
+            dict: The response containing the tool name and its execution result.
+        """
+        return self.drive(self.task())
+
+    async def arun_task(self):
+        """
+        Asynchronous counterpart of `run_task`. The LLM calls and the tool execution are awaited,
+        so many agents can make progress concurrently on a single event loop.
+
+        Returns:
+            dict: The response containing the tool name and its execution result.
+        """
+        return await self.adrive(self.task())
 
     def run(self):
         """
@@ -105,3 +308,12 @@ class SingleAgent(BaseLLM):
             dict: The final response from the task execution.
         """
         return self.run_task()
+
+    async def arun(self):
+        """
+        Executes the agent's task asynchronously by awaiting the arun_task method.
+
+        Returns:
+            dict: The final response from the task execution.
+        """
+        return await self.arun_task()
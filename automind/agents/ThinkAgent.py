@@ -1,9 +1,10 @@
-from typing import Any
-import importlib
-import json
-import re
-from automind.agents.base import BaseLLM
-from automind.prompts.thinking_prompt import generate_thinking_prompt
+from typing import Any, List, Optional
+from pydantic import Field
+from automind.agents.base import BaseLLM, LLMRequest, ToolRequest
+from automind.agents.parser import ParsedResponse, find_json, parse_response, repair_json
+from automind.prompts.thinking_prompt import generate_thinking_prompt, thinking_prompt_prefix
+from automind.memory.scratchpad import Scratchpad
+from automind.events import DEBUG, WARNING
 
 def extract_thought(text: str) -> Any:
     """
@@ -15,9 +16,7 @@ def extract_thought(text: str) -> Any:
     Returns:
         str or None: The extracted 'Thought' text if found, otherwise None.
     """
-    thought_match = re.search(r'Thought: (.*?)(?=Action:)', text, re.DOTALL)
-    thought = thought_match.group(1).strip() if thought_match else None
-    return thought
+    return parse_response(text).thought
 
 def extract_action(text: str) -> Any:
     """
@@ -29,12 +28,8 @@ def extract_action(text: str) -> Any:
     Returns:
         str or None: The extracted 'Action' text if found, otherwise None.
     """
-    action_match = re.search(r'Action:\n(```json\n.*?\n```)', text, re.DOTALL)
-    
-    if action_match:
-        return f"Action:\n{action_match.group(1)}"
-    else:
-        return None
+    parsed = parse_response(text)
+    return parsed.action_text if parsed.action is not None else None
 
 def extract_final_answer(text: str) -> Any:
     """
@@ -46,14 +41,7 @@ def extract_final_answer(text: str) -> Any:
     Returns:
         str or None: The extracted 'Final Answer' text if found, otherwise None.
     """
-    pattern = r"Final Answer:([\s\S]*)"
-    match = re.search(pattern, text)
-
-    if match:
-        final_answer = match.group(1)
-        return final_answer
-    else:
-        return None
+    return parse_response(text).final_answer
 
 def extract_output(content: str) -> Any:
     """
@@ -65,14 +53,13 @@ def extract_output(content: str) -> Any:
     Returns:
         dict or None: The parsed JSON data if found, otherwise None.
     """
-    json_patters = r"```json(.*?)```"
-    matches = re.search(json_patters, content, re.DOTALL)
-    if not matches:
-        return None
+    blob = find_json(content)
+    return repair_json(blob)[0] if blob is not None else None
 
-    json_content = matches.group(1)
-    json_data = json.loads(json_content)
-    return json_data
+INVALID_ACTION_OBSERVATION = (
+    "Error: no valid action was found. Respond with a Thought followed by an Action containing a valid $JSON_BLOB, "
+    "or with the Final Answer."
+)
 
 class ThinkAgent(BaseLLM):
     """
@@ -83,61 +70,191 @@ class ThinkAgent(BaseLLM):
 
     Attributes:
         agent_scratchpad (str): A buffer to keep track of the thought process, actions, and observations.
+        scratchpad (Scratchpad): The bounded store backing `agent_scratchpad`, which truncates observations and
+            compacts older steps to keep the prompt within a token budget.
+        stop_sequences (Optional[List[str]]): Sequences halting the generation, by default before the model writes
+            an `Observation:` it cannot know.
     """
     agent_scratchpad: str = ""
+    scratchpad: Scratchpad = Field(default_factory=Scratchpad)
+    stop_sequences: Optional[List[str]] = Field(default_factory=lambda: ["Observation:"])
 
-    def generate_prompt(self):
+    def generate_prompt(self, final: bool = False):
         """
         Generates a prompt for the LLM using the given question, actions, backstory, and current agent state.
 
+        When the prompt exceeds the agent's context budget, the scratchpad is shrunk first (older steps compacted
+        then evicted, recent observations shortened), and the backstory only as a last resort.
+
+        Args:
+            final (bool): Whether the prompt must ask for the final answer, without any further action.
+
         Returns:
             str: The generated prompt for the LLM.
         """
-        return generate_thinking_prompt(question=self.question, actions=self.actions, backstory=self.backstory, agent_scratchpad=self.agent_scratchpad)
+        prompt = generate_thinking_prompt(question=self.question, actions=self.actions, backstory=self.backstory, agent_scratchpad=self.agent_scratchpad, parallel=self.parallel_actions, final=final)
+        budget = self.prompt_budget()
+        if budget is None or self.prompt_tokens(prompt) <= budget:
+            return prompt
 
-    def run_task(self):
+        empty = generate_thinking_prompt(question=self.question, actions=self.actions, backstory=self.backstory, agent_scratchpad="", parallel=self.parallel_actions, final=final)
+        before = self.scratchpad.total_tokens
+        self.scratchpad.fit(budget - self.prompt_tokens(empty))
+        self.agent_scratchpad = self.scratchpad.render()
+        self.emit("prompt_trimmed", "✂️ Scratchpad trimmed from {before} to {after} tokens to fit a {budget} token prompt\n", level=DEBUG, before=before, after=self.scratchpad.total_tokens, budget=budget)
+
+        return self.fit_backstory(
+            lambda backstory: generate_thinking_prompt(question=self.question, actions=self.actions, backstory=backstory, agent_scratchpad=self.agent_scratchpad, parallel=self.parallel_actions, final=final),
+            budget
+        )
+
+    def model_post_init(self, __context: Any):
+        if self.scratchpad.token_counter is None and self.prompt_budget() is not None:
+            self.scratchpad.token_counter = self.get_token_counter()
+
+    def prompt_prefix(self) -> str:
+        """
+        Returns:
+            str: The static beginning of the thinking prompt (instructions, tool catalog and backstory).
+        """
+        return thinking_prompt_prefix(actions=self.actions, backstory=self.backstory, parallel=self.parallel_actions)
+
+    def parse(self, llm_response: str) -> ParsedResponse:
+        """
+        Parses an LLM response into its thought, action and final answer.
+
+        Args:
+            llm_response (str): The raw response generated by the LLM.
+
+        Returns:
+            ParsedResponse: The sections of the response.
         """
-        Executes the task by iterating through a sequence of thoughts and actions until the desired number of iterations is reached.
+        with self.span("output_parsing", response_chars=len(llm_response)) as span:
+            parsed = parse_response(llm_response)
+            span.set(has_action=parsed.action is not None, repaired=parsed.repaired)
+        self.emit("thought", "💡 Thought:\n{thought}\n", thought=parsed.thought)
+        return parsed
 
-        During each iteration, it generates a prompt, invokes the LLM to obtain a response, extracts the thought and action,
-        performs the action, observes the result, and updates the agent's scratchpad.
+    def plan_step(self, parsed: ParsedResponse):
+        """
+        Loads the tools requested by a parsed LLM response.
+
+        Args:
+            parsed (ParsedResponse): The parsed response.
+
+        Returns:
+            List[BaseAction] or None: The tool instances to execute, or None when the response contains no action,
+            or an action that cannot be parsed or dispatched.
+        """
+        if parsed.action_error is not None:
+            self.emit("invalid_action", "⚠️ Invalid action: {error}\n", level=WARNING, error=parsed.action_error)
+            return None
+        if parsed.action is None:
+            return None
+
+        try:
+            with self.span("tool_dispatch"):
+                tools = self.load_tools(parsed.action)
+        except (ValueError, KeyError, TypeError) as exc:
+            self.emit("invalid_action", "⚠️ Invalid action: {error}\n", level=WARNING, error=exc)
+            return None
+
+        self.emit("action", "🛠️ Action being used: {tools}\n", tools=", ".join(type(tool).__name__ for tool in tools))
+        return tools
+
+    def observe(self, thought: str, action: str, observation: Any):
+        """
+        Records the outcome of a step in the agent's scratchpad.
+
+        Args:
+            thought (str): The thought produced by the LLM.
+            action (str): The action text produced by the LLM.
+            observation (Any): The result returned by the tool.
+        """
+        observation = self.process_observation(observation, f"{self.question} {thought or ''}")
+        self.emit("observation", "👁️ Observation:\n{observation}\n", observation=observation)
+
+        # Update the scratchpad with thought, action, and observation
+        step = self.scratchpad.add(thought, action, observation)
+        self.agent_scratchpad = self.scratchpad.render()
+        self.emit("scratchpad", "✂️ Scratchpad: {saved} tokens saved this step, {total} in total\n", level=DEBUG, saved=step.tokens_saved, total=self.scratchpad.tokens_saved)
+
+    def finish(self, llm_response: str, parsed: Optional[ParsedResponse] = None):
+        """
+        Extracts the final answer from the last LLM response, falling back to the whole response
+        when it does not follow the `Final Answer:` format.
+
+        Args:
+            llm_response (str): The last response generated by the LLM.
+            parsed (Optional[ParsedResponse]): The response, if already parsed.
+
+        Returns:
+            Any: The final answer extracted from the response.
+        """
+        final_answer = (parsed or parse_response(llm_response)).final_answer
+        if final_answer is None:
+            final_answer = llm_response.strip()
+        self.emit("final_answer", f"\n{'='*30}\n🎯 Final Answer:\n{{answer}}\n{'='*30}", answer=final_answer)
+        self.remember_answer(final_answer)
+        return final_answer
+
+    def task(self):
+        """
+        The agent's workflow: iterates through a sequence of thoughts and actions until the model gives its final
+        answer or the maximum number of iterations is reached.
+
+        During each iteration, it generates a prompt, requests an LLM response (halted at `stop_sequences`),
+        and stops as soon as the response holds a final answer and no action. Otherwise it extracts the thought
+        and action, requests the execution of the action, observes the result, and updates the agent's scratchpad.
+        A response without a usable action is recorded with a reminder of the expected format instead of crashing.
+        Once all iterations are used, a last LLM call asks for the final answer.
+
+        Yields:
+            LLMRequest or ToolRequest: The next LLM call or tool execution needed.
 
         Returns:
             Any: The final answer extracted from the LLM's response.
         """
         steps = 1
         while steps <= self.num_iterations:
-            print(f"\n{'-'*30}\nIteration: {steps}\n{'-'*30}")
-            print("🤔 Thinking...\n")
-            
-            llm_response = self.llm.run(self.generate_prompt())
-            thought = extract_thought(llm_response)
-            print(f"💡 Thought:\n{thought}\n")
-
-            action = extract_action(llm_response)
-            action_response = extract_output(action)
-            cls_name = action_response['name']
-            print(f"🛠️ Action being used: {cls_name}\n")
-
-            mod_name = action_response['arguments']['module']
-            tool_cls = getattr(importlib.import_module(mod_name), cls_name)
-            tool_cls = tool_cls(query=action_response['arguments']['query'])
-            setattr(tool_cls, 'llm', self.llm)
-            tool_obj = tool_cls.execute()
-            observation = tool_obj
-
-            print(f"👁️ Observation:\n{observation}\n")
-
-            # Update the scratchpad with thought, action, and observation
-            self.agent_scratchpad += f"Thought: {thought}\n"
-            self.agent_scratchpad += f"Action: {action}\n"
-            self.agent_scratchpad += f"Observation: {observation}\n"
-            
-            steps += 1 
-            
-        final_answer = extract_final_answer(llm_response)
-        print(f"\n{'='*30}\n🎯 Final Answer:\n{final_answer}\n{'='*30}")
-        return final_answer
+            self.emit("iteration", f"\n{'-'*30}\nIteration: {{step}}\n{'-'*30}\n🤔 Thinking...\n", step=steps)
+
+            llm_response = yield LLMRequest(prompt=self.build_prompt(self.generate_prompt), stop=self.stop_sequences, until_action=True)
+            parsed = self.parse(llm_response)
+            tools = self.plan_step(parsed)
+
+            if tools is None:
+                if parsed.action is None and parsed.final_answer is not None:
+                    return self.finish(llm_response, parsed)
+                observation = INVALID_ACTION_OBSERVATION
+            else:
+                observation = yield ToolRequest(tools=tools)
+            self.observe(parsed.thought, parsed.action_text, observation)
+
+            steps += 1
+
+        self.emit("iterations_exhausted", f"\n{'-'*30}\nIterations exhausted, requesting the final answer\n{'-'*30}")
+        llm_response = yield LLMRequest(prompt=self.build_prompt(self.generate_prompt, final=True), stop=self.stop_sequences)
+        return self.finish(llm_response)
+
+    def run_task(self):
+        """
+        Executes the task by driving `task` with blocking LLM and tool calls.
+
+        Returns:
+            Any: The final answer extracted from the LLM's response.
+        """
+        return self.drive(self.task())
+
+    async def arun_task(self):
+        """
+        Asynchronous counterpart of `run_task`. The LLM call and the tool execution are awaited,
+        so many agents can make progress concurrently on a single event loop.
+
+        Returns:
+            Any: The final answer extracted from the LLM's response.
+        """
+        return await self.adrive(self.task())
 
     def run(self):
         """
@@ -149,3 +266,12 @@ class ThinkAgent(BaseLLM):
             Any: The result from running the task.
         """
         return self.run_task()
+
+    async def arun(self):
+        """
+        Runs the agent's task execution process asynchronously.
+
+        Returns:
+            Any: The result from running the task.
+        """
+        return await self.arun_task()
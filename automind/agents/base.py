@@ -1,6 +1,48 @@
-from pydantic import BaseModel
-from typing import Any , Optional
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any , Dict, List, Optional
 from abc import abstractmethod
+from automind.actions.executor import execute_actions, aexecute_actions, merge_observations, describe_action, action_key, action_query
+from automind.actions.registry import get_registry
+from automind.agents.parser import StreamParser
+from automind.agents.speculation import prefetched_result, aprefetched_result
+from automind.llms.cache import last_cache_hits
+from automind.tracing import NULL_SPAN
+from automind.llms.tokens import get_token_counter
+from automind.events import INFO, WARNING, events as default_events
+from automind.scheduler import DeadlineExceeded, RunCancelled
+from automind.memory.retrieval import ObservationProcessor
+from contextlib import nullcontext
+import asyncio
+
+class LLMRequest(BaseModel):
+    """
+    A request, yielded by an agent's `task`, to run the LLM on a prompt. The response is sent back into the task.
+
+    Attributes:
+        prompt (str): The prompt to send to the LLM.
+        stop (Optional[List[str]]): Sequences at which the LLM generation stops.
+        until_action (bool): Whether a streamed response may be cut as soon as the JSON block of its `Action:` section
+            closes, because nothing generated after the action is used. Final answers are never cut.
+    """
+
+    prompt: str
+    stop: Optional[List[str]] = None
+    until_action: bool = False
+
+
+class ToolRequest(BaseModel):
+    """
+    A request, yielded by an agent's `task`, to execute tools. The merged observation is sent back into the task.
+
+    Attributes:
+        tools (List[Any]): The tool instances to execute.
+        prefetched (Dict[int, Any]): The future of the result of each tool, by position, already started
+            speculatively (see `automind.agents.speculation`). These tools are not executed again.
+    """
+
+    tools: List[Any]
+    prefetched: Dict[int, Any] = Field(default_factory=dict)
+
 
 class BaseLLM(BaseModel):
     """
@@ -15,6 +57,34 @@ class BaseLLM(BaseModel):
         actions (Any): The available actions or tools that the LLM can use to complete a task.
         num_iterations (int): The number of iterations the agent should run to refine the output.
         backstory (str): An optional backstory or context that provides additional information to the LLM.
+        parallel_actions (bool): Whether the LLM may request several independent actions in one response,
+            which are then executed concurrently.
+        tool_timeout (Optional[float]): The maximum number of seconds to wait for each action. An action that
+            times out is reported as an error observation.
+        stream (bool): Whether LLM responses are streamed. Streamed tokens are passed to `on_token`, and a
+            response is cut as soon as its JSON action block closes so the tools start right away.
+        on_token (Any): An optional callable receiving each streamed chunk. Defaults to emitting a `token` event.
+        stop_sequences (Optional[List[str]]): Sequences passed to the LLM to halt the generation, e.g. before
+            the model starts writing an observation it cannot know.
+        memory (Any): An optional long-term memory (see `automind.memory.vector.VectorMemory`). Tool calls it can
+            answer are not executed, and observations and final answers are stored in it.
+        observation_processor (Any): The `automind.memory.retrieval.ObservationProcessor` keeping only the passages
+            of long observations most relevant to the question, before they reach the prompt. Defaults to one with
+            a budget of 3000 characters; pass None to keep observations whole.
+        tracer (Any): An optional `automind.tracing.Tracer` recording timed spans for each stage of a run (prompt
+            build, LLM call, output parsing, tool dispatch and tool execution).
+        token_counter (Any): The `automind.llms.tokens.TokenCounter` measuring prompts. Defaults to the LLM's own
+            counter when a context budget applies, otherwise to an estimate of four characters per token.
+        context_budget (Optional[int]): The maximum number of prompt tokens. Defaults to the LLM's
+            `prompt_budget()`. Prompts exceeding it are trimmed, in priority order, before the LLM is called.
+        events (Any): The `automind.events.EventBus` receiving the agent's progress events. Defaults to the
+            process-wide bus, which writes to the console from a background thread.
+        scheduler (Any): An optional `automind.scheduler.Scheduler`, shared by many agents, limiting the LLM and
+            tool calls in flight per resource.
+        priority (int): The priority of the agent's requests in the scheduler's queues. Higher values are
+            served first.
+        deadline (Optional[float]): The number of seconds the run may take when a `scheduler` is set. Past it,
+            the run is abandoned and raises `automind.scheduler.DeadlineExceeded`.
     """
 
     question: str
@@ -22,6 +92,21 @@ class BaseLLM(BaseModel):
     actions: Any
     num_iterations: Optional[int] = 1
     backstory: str
+    parallel_actions: bool = False
+    tool_timeout: Optional[float] = None
+    stream: bool = False
+    on_token: Any = None
+    stop_sequences: Optional[List[str]] = None
+    memory: Any = None
+    observation_processor: Any = Field(default_factory=ObservationProcessor)
+    tracer: Any = None
+    token_counter: Any = None
+    context_budget: Optional[int] = None
+    events: Any = None
+    scheduler: Any = None
+    priority: int = 0
+    deadline: Optional[float] = None
+    _run: Any = PrivateAttr(default=None)
 
     @abstractmethod
     def generate_prompt(self):
@@ -33,6 +118,404 @@ class BaseLLM(BaseModel):
         """
         pass
 
+    def prompt_prefix(self) -> str:
+        """
+        Returns the static beginning shared by the agent's prompts for every question asked with the same
+        actions and backstory. It can be sent once ahead of time (e.g. with `BaseLLM.warmup`) to fill a
+        prefix cache.
+
+        Returns:
+            str: The static prefix, or an empty string if the agent's prompts have none.
+        """
+        return ""
+
+    @abstractmethod
+    def task(self):
+        """
+        Abstract generator describing the agent's workflow.
+
+        The generator yields `LLMRequest` and `ToolRequest` objects, receives the LLM response or the tool
+        observation for each of them, and returns the final result. Keeping the workflow free of I/O lets the
+        same logic be driven synchronously (`drive`), asynchronously (`adrive`) or in lockstep with other
+        agents (`automind.agents.batch.AgentBatch`).
+        """
+        pass
+
+    def prompt_budget(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: The maximum number of prompt tokens, or None when prompts are not budgeted.
+        """
+        if self.context_budget is not None:
+            return self.context_budget
+        budget = getattr(self.llm, "prompt_budget", None)
+        return budget() if budget is not None else None
+
+    def get_token_counter(self):
+        """
+        Returns the counter measuring the agent's prompts, resolving it on first use.
+
+        Returns:
+            TokenCounter: The counter.
+        """
+        if self.token_counter is None:
+            if self.prompt_budget() is not None and hasattr(self.llm, "token_counter"):
+                self.token_counter = self.llm.token_counter()
+            else:
+                self.token_counter = get_token_counter("chars")
+        return self.token_counter
+
+    def count_tokens(self, text: Any) -> int:
+        """
+        Counts the tokens of a text with the agent's token counter.
+
+        Args:
+            text (Any): The text to measure.
+
+        Returns:
+            int: The number of tokens.
+        """
+        return self.get_token_counter().count(text)
+
+    def prompt_tokens(self, prompt: str) -> int:
+        """
+        Counts the tokens of a prompt, measuring its static prefix separately so that its count is served
+        from the token counter's cache.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            int: The number of tokens.
+        """
+        prefix = self.prompt_prefix()
+        if prefix and prompt.startswith(prefix):
+            return self.count_tokens(prefix) + self.count_tokens(prompt[len(prefix):])
+        return self.count_tokens(prompt)
+
+    def fit_backstory(self, render, budget: int) -> str:
+        """
+        Last resort of the prompt budgeting: renders a prompt with the backstory shortened by as many tokens
+        as the prompt exceeds `budget`.
+
+        Args:
+            render (Callable[[str], str]): Renders the prompt from a backstory.
+            budget (int): The maximum number of prompt tokens.
+
+        Returns:
+            str: The prompt.
+        """
+        prompt = render(self.backstory)
+        excess = self.prompt_tokens(prompt) - budget
+        if excess <= 0:
+            return prompt
+
+        counter = self.get_token_counter()
+        prompt = render(counter.truncate(self.backstory, max(counter.count(self.backstory) - excess, 0)))
+        tokens = self.count_tokens(prompt)
+        if tokens > budget:
+            self.emit("prompt_over_budget", "⚠️ Prompt is {tokens} tokens, over the budget of {budget}\n", level=WARNING, tokens=tokens, budget=budget)
+        return prompt
+
+    def span(self, name: str, **attributes):
+        """
+        Opens a tracing span with the agent's `tracer`, or a no-op span when tracing is disabled.
+
+        Args:
+            name (str): The stage name.
+            **attributes: Initial measurements attached to the span.
+
+        Returns:
+            ContextManager: A context manager yielding the span.
+        """
+        if self.tracer is None:
+            return nullcontext(NULL_SPAN)
+        return self.tracer.span(name, **attributes)
+
+    def build_prompt(self, build, *args, **kwargs) -> str:
+        """
+        Builds a prompt inside a `prompt_build` span.
+
+        Args:
+            build (Callable): The prompt builder, e.g. `generate_prompt`.
+            *args: Positional arguments of the builder.
+            **kwargs: Keyword arguments of the builder.
+
+        Returns:
+            str: The prompt.
+        """
+        with self.span("prompt_build") as span:
+            prompt = build(*args, **kwargs)
+            if self.tracer is not None:
+                span.set(prompt_chars=len(prompt), prompt_tokens=self.prompt_tokens(prompt))
+        return prompt
+
+    def llm_span(self, request: LLMRequest):
+        """
+        Opens an `llm_call` span measuring the prompt of a request.
+
+        Args:
+            request (LLMRequest): The LLM request being served.
+
+        Returns:
+            ContextManager: A context manager yielding the span.
+        """
+        if self.tracer is None:
+            return nullcontext(NULL_SPAN)
+        return self.span(
+            "llm_call",
+            prompt_chars=len(request.prompt),
+            prompt_tokens=self.prompt_tokens(request.prompt),
+            streamed=self.stream
+        )
+
+    def record_llm_response(self, span: Any, response: str):
+        """
+        Attaches the measurements of an LLM response to its `llm_call` span.
+
+        Args:
+            span (Span): The span opened by `llm_span`.
+            response (str): The LLM response.
+        """
+        if self.tracer is None:
+            return
+        hits = last_cache_hits.get()
+        span.set(
+            response_chars=len(response),
+            response_tokens=self.count_tokens(response),
+            cache_hit=None if hits is None else bool(hits)
+        )
+
+    def drive(self, task):
+        """
+        Runs a task generator to completion, serving its requests with blocking calls.
+
+        Args:
+            task (Generator): The generator returned by `task`.
+
+        Returns:
+            Any: The value returned by the task.
+        """
+        with self.span("agent_run", agent=type(self).__name__, question=self.question):
+            self.start_run()
+            try:
+                request = next(task)
+                while True:
+                    self.check_run()
+                    if isinstance(request, LLMRequest):
+                        with self.llm_span(request) as span:
+                            result = self.call_llm(request)
+                            self.record_llm_response(span, result)
+                    else:
+                        result = self.execute_tools(request.tools, request.prefetched)
+                    request = task.send(result)
+            except StopIteration as stop:
+                self.finish_run()
+                return stop.value
+            except BaseException as exc:
+                self.finish_run(exc)
+                raise
+
+    async def adrive(self, task):
+        """
+        Runs a task generator to completion, awaiting the LLM and the tools for each request.
+
+        Args:
+            task (Generator): The generator returned by `task`.
+
+        Returns:
+            Any: The value returned by the task.
+        """
+        with self.span("agent_run", agent=type(self).__name__, question=self.question):
+            self.start_run()
+            try:
+                request = next(task)
+                while True:
+                    self.check_run()
+                    if isinstance(request, LLMRequest):
+                        with self.llm_span(request) as span:
+                            result = await self.acall_llm(request)
+                            self.record_llm_response(span, result)
+                    else:
+                        result = await self.aexecute_tools(request.tools, request.prefetched)
+                    request = task.send(result)
+            except StopIteration as stop:
+                self.finish_run()
+                return stop.value
+            except BaseException as exc:
+                self.finish_run(exc)
+                raise
+
+    def start_run(self):
+        """
+        Registers the run with the agent's `scheduler`, starting its deadline.
+        """
+        self._run = None if self.scheduler is None else self.scheduler.start_run(priority=self.priority, timeout=self.deadline)
+
+    def run_stopped(self) -> bool:
+        """
+        Returns:
+            bool: Whether the scheduled run was cancelled or has passed its deadline.
+        """
+        return self._run is not None and self._run.stopped()
+
+    def check_run(self):
+        """
+        Stops the run between two steps once it has been cancelled or has passed its deadline.
+
+        Raises:
+            RunCancelled: If the run was cancelled.
+            DeadlineExceeded: If the run has passed its deadline.
+        """
+        if self._run is not None:
+            self._run.check()
+
+    def finish_run(self, error: Optional[BaseException] = None):
+        """
+        Records the end of the run with the agent's `scheduler`.
+
+        Args:
+            error (Optional[BaseException]): The error the run failed with, if any.
+        """
+        if self._run is None:
+            return
+        self.scheduler.finish_run(self._run, error)
+        if isinstance(error, (DeadlineExceeded, RunCancelled)):
+            self.emit("run_stopped", "⏱️ Run stopped: {error}\n", level=WARNING, error=str(error))
+
+    def cancel(self):
+        """
+        Cancels the agent's scheduled run, from any thread: its pending requests fail with `RunCancelled`.
+        """
+        if self._run is not None:
+            self._run.cancel()
+
+    def call_llm(self, request: LLMRequest) -> str:
+        """
+        Serves an LLM request, holding a slot of the LLM's resource when a `scheduler` is set. Responses
+        served from the LLM's cache do not wait for a slot.
+
+        Args:
+            request (LLMRequest): The LLM request to serve.
+
+        Returns:
+            str: The LLM response.
+        """
+        if self.scheduler is None:
+            return self.stream_llm(request) if self.stream else self.llm.run(request.prompt, stop=request.stop)
+
+        cached = self.llm.cached_response(request.prompt, stop=request.stop)
+        if cached is not None:
+            return self.replay_cached(cached)
+        if self.stream:
+            return self.scheduler.call(self.llm.resource(), self._run, self.stream_llm, request, lookup=False)
+        return self.scheduler.call(self.llm.resource(), self._run, self.llm.run, request.prompt, stop=request.stop, lookup=False)
+
+    async def acall_llm(self, request: LLMRequest) -> str:
+        """
+        Asynchronous counterpart of `call_llm`.
+
+        Args:
+            request (LLMRequest): The LLM request to serve.
+
+        Returns:
+            str: The LLM response.
+        """
+        if self.scheduler is None:
+            return await self.astream_llm(request) if self.stream else await self.llm.arun(request.prompt, stop=request.stop)
+
+        cached = self.llm.cached_response(request.prompt, stop=request.stop)
+        if cached is not None:
+            return self.replay_cached(cached)
+        if self.stream:
+            return await self.scheduler.acall(self.llm.resource(), self._run, self.astream_llm, request, lookup=False)
+        return await self.scheduler.acall(self.llm.resource(), self._run, self.llm.arun, request.prompt, stop=request.stop, lookup=False)
+
+    def replay_cached(self, response: str) -> str:
+        """
+        Returns a response found by `cached_response`, forwarding it as a single streamed chunk when streaming.
+
+        Args:
+            response (str): The cached response.
+
+        Returns:
+            str: The response.
+        """
+        if self.stream:
+            self.emit_token(response)
+            self.emit_token("\n")
+        return response
+
+    def emit(self, name: str, message: str = "", level: int = INFO, **data):
+        """
+        Emits a progress event on the agent's event bus.
+
+        Args:
+            name (str): The event name.
+            message (str): The message template, filled with `data` when rendered.
+            level (int): The severity.
+            **data: The values referenced by the message template.
+        """
+        (self.events or default_events).emit(name, message, level=level, source=type(self).__name__, **data)
+
+    def emit_token(self, chunk: str):
+        """
+        Forwards a streamed chunk to `on_token`, or emits it as a `token` event when no callback is set.
+
+        Args:
+            chunk (str): The streamed chunk.
+        """
+        if self.on_token is not None:
+            self.on_token(chunk)
+        else:
+            self.emit("token", chunk=chunk)
+
+    def stream_llm(self, request: LLMRequest, lookup: bool = True) -> str:
+        """
+        Streams the LLM response of a request, stopping early once the action block closes if allowed.
+
+        Args:
+            request (LLMRequest): The LLM request to serve.
+            lookup (bool): Whether the LLM's cache is looked up first.
+
+        Returns:
+            str: The response text received.
+        """
+        parser = StreamParser()
+        stream = self.llm.stream(request.prompt, stop=request.stop, lookup=lookup)
+        try:
+            for chunk in stream:
+                self.emit_token(chunk)
+                if parser.feed(chunk) and request.until_action or self.run_stopped():
+                    break
+        finally:
+            stream.close()
+        self.emit_token("\n")
+        return parser.text
+
+    async def astream_llm(self, request: LLMRequest, lookup: bool = True) -> str:
+        """
+        Asynchronous counterpart of `stream_llm`.
+
+        Args:
+            request (LLMRequest): The LLM request to serve.
+            lookup (bool): Whether the LLM's cache is looked up first.
+
+        Returns:
+            str: The response text received.
+        """
+        parser = StreamParser()
+        stream = self.llm.astream(request.prompt, stop=request.stop, lookup=lookup)
+        try:
+            async for chunk in stream:
+                self.emit_token(chunk)
+                if parser.feed(chunk) and request.until_action or self.run_stopped():
+                    break
+        finally:
+            await stream.aclose()
+        self.emit_token("\n")
+        return parser.text
+
     @abstractmethod
     def run_task(self):
         """
@@ -52,3 +535,229 @@ class BaseLLM(BaseModel):
         executing tasks, and iterating to refine the results.
         """
         pass
+
+    @abstractmethod
+    async def arun_task(self):
+        """
+        Abstract method to execute a task asynchronously using the LLM.
+
+        This method should mirror `run_task` while awaiting the LLM and the actions, so many agents
+        can share a single event loop.
+        """
+        pass
+
+    @abstractmethod
+    async def arun(self):
+        """
+        Abstract method to run the entire process for the LLM agent asynchronously.
+        """
+        pass
+
+    def load_tool(self, action_response: dict):
+        """
+        Instantiates the tool requested by the LLM. The tool is resolved by name among the agent's
+        `actions`, so a hallucinated tool name fails fast instead of triggering an import.
+
+        Args:
+            action_response (dict): The parsed JSON action containing the tool `name` and its `arguments`.
+
+        Returns:
+            BaseAction: The tool instance, ready to be executed.
+        """
+        return get_registry(self.actions).instantiate(
+            action_response['name'], action_response.get('arguments'), llm=self.llm
+        )
+
+    def load_tools(self, action_response: Any) -> List[Any]:
+        """
+        Instantiates every tool requested by the LLM.
+
+        Args:
+            action_response (dict or list): A single parsed JSON action, or a list of them when
+                `parallel_actions` is enabled.
+
+        Returns:
+            List[BaseAction]: The tool instances, in the order they were requested.
+        """
+        if isinstance(action_response, dict):
+            action_response = [action_response]
+        return [self.load_tool(action) for action in action_response]
+
+    def process_observation(self, observation: Any, query: str) -> Any:
+        """
+        Passes an observation through the `observation_processor`, if any.
+
+        Args:
+            observation (Any): The merged tool result.
+            query (str): The text the relevant passages are ranked against, e.g. the question and current thought.
+
+        Returns:
+            Any: The processed observation.
+        """
+        if self.observation_processor is None:
+            return observation
+        return self.observation_processor.process(observation, query)
+
+    def recall_tools(self, tools: List[Any]) -> List[Any]:
+        """
+        Looks up each tool call in the long-term `memory`.
+
+        Args:
+            tools (List[BaseAction]): The tools about to be executed.
+
+        Returns:
+            List[Any]: For each tool, the relevant snippets recalled from memory, or None when it must be executed.
+        """
+        if self.memory is None:
+            return [None] * len(tools)
+        return [self.memory.recall(action_query(tool), key=action_key(tool)) for tool in tools]
+
+    def remember_tools(self, tools: List[Any], results: List[Any]):
+        """
+        Stores the results of executed tools in the long-term `memory`. Error observations are not stored.
+
+        Args:
+            tools (List[BaseAction]): The executed tools.
+            results (List[Any]): Their results, in the same order.
+        """
+        if self.memory is None:
+            return
+        for tool, result in zip(tools, results):
+            if not (isinstance(result, str) and result.startswith("Error:")):
+                self.memory.add_observation(describe_action(tool), result, key=action_key(tool))
+
+    def remember_answer(self, answer: Any):
+        """
+        Stores the final answer to the agent's question in the long-term `memory`.
+
+        Args:
+            answer (Any): The final answer.
+        """
+        if self.memory is not None and answer:
+            self.memory.add_answer(self.question, answer)
+
+    def execute_tools(self, tools: List[Any], prefetched: Optional[Dict[int, Any]] = None) -> Any:
+        """
+        Executes the tools concurrently and merges their results into a single observation. Tool calls
+        answered by the long-term `memory` are not executed, nor are those already prefetched.
+
+        Args:
+            tools (List[BaseAction]): The tools to execute.
+            prefetched (Optional[Dict[int, Any]]): The future of each tool result started speculatively, by position.
+
+        Returns:
+            Any: The result of a single tool, or the labelled results of several tools.
+
+        Raises:
+            DeadlineExceeded: If the run's deadline passed while the tools were running.
+            RunCancelled: If the run was cancelled while the tools were running.
+        """
+        prefetched = prefetched or {}
+        with self.span("tool_execution", tools=[describe_action(tool) for tool in tools], prefetched=len(prefetched)) as span:
+            results = self.recall_tools(tools)
+            pending = [index for index, result in enumerate(results) if result is None]
+            if pending:
+                timeout = self.step_timeout()
+                fresh = [index for index in pending if index not in prefetched]
+                outputs = dict(zip(fresh, execute_actions([tools[index] for index in fresh], timeout=timeout, call=self.tool_call())))
+                for index in pending:
+                    if index in prefetched:
+                        outputs[index] = prefetched_result(tools[index], prefetched[index], timeout)
+                self.fill_results(tools, results, pending, [outputs[index] for index in pending])
+            observation = merge_observations(tools, results)
+            self.record_tool_results(span, tools, pending, observation)
+        self.check_run()
+        return observation
+
+    async def aexecute_tools(self, tools: List[Any], prefetched: Optional[Dict[int, Any]] = None) -> Any:
+        """
+        Asynchronous counterpart of `execute_tools`.
+
+        Args:
+            tools (List[BaseAction]): The tools to execute.
+            prefetched (Optional[Dict[int, Any]]): The future of each tool result started speculatively, by position.
+
+        Returns:
+            Any: The result of a single tool, or the labelled results of several tools.
+
+        Raises:
+            DeadlineExceeded: If the run's deadline passed while the tools were running.
+            RunCancelled: If the run was cancelled while the tools were running.
+        """
+        prefetched = prefetched or {}
+        with self.span("tool_execution", tools=[describe_action(tool) for tool in tools], prefetched=len(prefetched)) as span:
+            results = self.recall_tools(tools)
+            pending = [index for index, result in enumerate(results) if result is None]
+            if pending:
+                timeout = self.step_timeout()
+                fresh = [index for index in pending if index not in prefetched]
+                matched = [index for index in pending if index in prefetched]
+                executed, *waited = await asyncio.gather(
+                    aexecute_actions([tools[index] for index in fresh], timeout=timeout, call=self.tool_call(asynchronous=True)),
+                    *(aprefetched_result(tools[index], prefetched[index], timeout) for index in matched)
+                )
+                outputs = dict(zip(fresh, executed))
+                outputs.update(zip(matched, waited))
+                self.fill_results(tools, results, pending, [outputs[index] for index in pending])
+            observation = merge_observations(tools, results)
+            self.record_tool_results(span, tools, pending, observation)
+        self.check_run()
+        return observation
+
+    def step_timeout(self) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: The number of seconds to wait for the tools of a step: `tool_timeout`, shortened to
+            the time left before the run's deadline. A step cut short by the deadline raises `DeadlineExceeded`
+            once the tools return, rather than reporting their timeout as an observation.
+        """
+        remaining = None if self._run is None else self._run.remaining()
+        if remaining is None or self.tool_timeout is None:
+            return self.tool_timeout if remaining is None else remaining
+        return min(self.tool_timeout, remaining)
+
+    def tool_call(self, asynchronous: bool = False):
+        """
+        Returns:
+            Optional[Callable[[Any], Any]]: The callable executing one tool under the `scheduler`, or None to
+            execute tools directly.
+        """
+        if self.scheduler is None:
+            return None
+        if asynchronous:
+            return lambda tool: self.scheduler.aexecute(tool, self._run)
+        return lambda tool: self.scheduler.execute(tool, self._run)
+
+    def record_tool_results(self, span: Any, tools: List[Any], pending: List[int], observation: Any):
+        """
+        Attaches the measurements of a tool execution step to its `tool_execution` span.
+
+        Args:
+            span (Span): The `tool_execution` span.
+            tools (List[BaseAction]): All the tools of the step.
+            pending (List[int]): The positions of the tools that were executed rather than recalled from memory.
+            observation (Any): The merged observation.
+        """
+        if self.tracer is None:
+            return
+        text = str(observation)
+        span.set(
+            memory_hits=len(tools) - len(pending),
+            cache_status=[tools[index]._cache_status for index in pending],
+            observation_chars=len(text),
+            observation_tokens=self.count_tokens(text)
+        )
+
+    def fill_results(self, tools: List[Any], results: List[Any], pending: List[int], executed: List[Any]):
+        """
+        Places the results of the executed tools among the recalled ones and stores them in memory.
+
+        Args:
+            tools (List[BaseAction]): All the tools of the step.
+            results (List[Any]): The recalled results, updated in place.
+            pending (List[int]): The positions of the tools that were executed.
+            executed (List[Any]): Their results, in the same order.
+        """
+        for index, result in zip(pending, executed):
+            results[index] = result
+        self.remember_tools([tools[index] for index in pending], executed)
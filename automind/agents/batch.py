@@ -0,0 +1,242 @@
+from pydantic import BaseModel, Field
+from typing import Any, List
+from automind.agents.base import LLMRequest
+from automind.actions.executor import execute_actions, merge_observations
+from automind.agents.speculation import prefetched_result
+from automind.llms.cache import last_cache_hits
+from automind.tracing import NULL_SPAN
+from contextlib import nullcontext
+
+
+class AgentBatch(BaseModel):
+    """
+    Runs many agents in lockstep so that their LLM calls are submitted as batches.
+
+    At every round, the pending prompts of all agents sharing an LLM are gathered into a single `llm.batch`
+    call, and the tools requested by all agents are executed concurrently. Agents advance independently, so
+    an agent that finishes early simply drops out of the following rounds.
+
+    Attributes:
+        agent_cls (Any): The agent class to instantiate for each question, e.g. `SingleAgent` or `ThinkAgent`.
+        llm (Any): The LLM shared by the agents.
+        actions (Any): The available actions or tools.
+        backstory (str): The backstory given to every agent.
+        agent_kwargs (dict): Any additional keyword arguments for the agent class (e.g. `num_iterations`, `summary`).
+        return_exceptions (bool): Whether an agent failure is returned in place of its result instead of raised.
+            This covers failures of the agent itself as well as of its LLM call or its tools; the other agents
+            of the batch keep running.
+        tracer (Any): An optional `automind.tracing.Tracer` recording a span for each batched LLM call and
+            each round of tool execution.
+    """
+
+    agent_cls: Any
+    llm: Any
+    actions: Any
+    backstory: str
+    agent_kwargs: dict = Field(default_factory=dict)
+    return_exceptions: bool = False
+    tracer: Any = None
+
+    def span(self, name: str, **attributes):
+        """
+        Opens a tracing span with the batch's `tracer`, or a no-op span when tracing is disabled.
+
+        Args:
+            name (str): The stage name.
+            **attributes: Initial measurements attached to the span.
+
+        Returns:
+            ContextManager: A context manager yielding the span.
+        """
+        if self.tracer is None:
+            return nullcontext(NULL_SPAN)
+        return self.tracer.span(name, **attributes)
+
+    def build_agents(self, questions: List[str]) -> List[Any]:
+        """
+        Instantiates one agent per question.
+
+        Args:
+            questions (List[str]): The questions to answer.
+
+        Returns:
+            List[Any]: The agents, in the order of `questions`.
+        """
+        return [
+            self.agent_cls(question=question, llm=self.llm, actions=self.actions, backstory=self.backstory, **self.agent_kwargs)
+            for question in questions
+        ]
+
+    def run_many(self, questions: List[str]) -> List[Any]:
+        """
+        Answers many questions, batching the LLM calls of the agents at each step.
+
+        Args:
+            questions (List[str]): The questions to answer.
+
+        Returns:
+            List[Any]: The result of each agent, in the order of `questions`.
+        """
+        return self.run_agents(self.build_agents(questions))
+
+    def run_agents(self, agents: List[Any]) -> List[Any]:
+        """
+        Drives already built agents in lockstep until all of them are done.
+
+        Args:
+            agents (List[Any]): The agents to run.
+
+        Returns:
+            List[Any]: The result of each agent, in the order of `agents`.
+        """
+        tasks = [agent.task() for agent in agents]
+        results: List[Any] = [None] * len(agents)
+        pending = {}
+        for index, task in enumerate(tasks):
+            self.advance(index, task, None, pending, results, start=True)
+
+        while pending:
+            replies = {}
+            self.serve_llm_requests(agents, pending, replies)
+            self.serve_tool_requests(agents, pending, replies)
+            pending = {}
+            for index, reply in replies.items():
+                self.advance(index, tasks[index], reply, pending, results)
+
+        return results
+
+    def advance(self, index: int, task: Any, reply: Any, pending: dict, results: List[Any], start: bool = False):
+        """
+        Sends a reply into an agent's task and records its next request, or its result once it is done.
+
+        Args:
+            index (int): The position of the agent.
+            task (Generator): The agent's task generator.
+            reply (Any): The LLM response or tool observation answering the previous request, or the exception
+                that failed it, which is thrown into the task.
+            pending (dict): The next request of each running agent, updated in place.
+            results (List[Any]): The result of each agent, updated in place.
+            start (bool): Whether the task is being started rather than resumed.
+        """
+        try:
+            if start:
+                pending[index] = next(task)
+            elif isinstance(reply, Exception):
+                pending[index] = task.throw(reply)
+            else:
+                pending[index] = task.send(reply)
+        except StopIteration as stop:
+            results[index] = stop.value
+        except Exception as exc:
+            if not self.return_exceptions:
+                raise
+            results[index] = exc
+
+    def attempt(self, func, *args, **kwargs) -> Any:
+        """
+        Calls a function serving a single agent, returning its exception instead of raising it when
+        `return_exceptions` is set.
+
+        Args:
+            func (Callable): The function to call.
+            *args: Its positional arguments.
+            **kwargs: Its keyword arguments.
+
+        Returns:
+            Any: The result of the call, or the exception it raised.
+        """
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            if not self.return_exceptions:
+                raise
+            return exc
+
+    def serve_llm_requests(self, agents: List[Any], pending: dict, replies: dict):
+        """
+        Answers all pending LLM requests with one `batch` call per distinct LLM and stop sequences. With
+        `return_exceptions`, a failing batch is retried one prompt at a time so that only the failing prompts
+        are answered with their exception.
+
+        Args:
+            agents (List[Any]): The agents being run.
+            pending (dict): The next request of each running agent.
+            replies (dict): The reply for each agent, updated in place.
+        """
+        groups = {}
+        for index, request in pending.items():
+            if isinstance(request, LLMRequest):
+                groups.setdefault((id(agents[index].llm), tuple(request.stop or ())), []).append(index)
+
+        for indices in groups.values():
+            llm = agents[indices[0]].llm
+            prompts = [pending[index].prompt for index in indices]
+            stop = pending[indices[0]].stop
+            with self.span("llm_batch", prompts=len(prompts), prompt_chars=sum(len(prompt) for prompt in prompts)) as span:
+                responses = self.attempt(llm.batch, prompts, stop=stop)
+                if isinstance(responses, Exception):
+                    span.set(error=type(responses).__name__)
+                    responses = [responses] if len(prompts) == 1 else [self.attempt(llm.run, prompt, stop=stop) for prompt in prompts]
+                else:
+                    span.set(response_chars=sum(len(resp) for resp in responses), cache_hits=last_cache_hits.get())
+            replies.update(zip(indices, responses))
+
+    def serve_tool_requests(self, agents: List[Any], pending: dict, replies: dict):
+        """
+        Executes the tools requested by all agents concurrently and merges the observations per agent. Tool calls
+        answered by an agent's long-term memory, or prefetched speculatively, are not executed. With
+        `return_exceptions`, a failure while serving one agent is handed to that agent alone.
+
+        Args:
+            agents (List[Any]): The agents being run.
+            pending (dict): The next request of each running agent.
+            replies (dict): The reply for each agent, updated in place.
+        """
+        groups = {}
+        for index, request in pending.items():
+            if not isinstance(request, LLMRequest):
+                groups.setdefault(agents[index].tool_timeout, []).append(index)
+
+        for timeout, indices in groups.items():
+            recalled = {}
+            for index in indices:
+                recalled[index] = self.attempt(agents[index].recall_tools, pending[index].tools)
+                if isinstance(recalled[index], Exception):
+                    replies[index] = recalled.pop(index)
+            calls = [
+                (index, position, tool)
+                for index in recalled
+                for position, tool in enumerate(pending[index].tools)
+                if recalled[index][position] is None and position not in pending[index].prefetched
+            ]
+            with self.span("tool_execution", tools=len(calls)):
+                outputs = execute_actions([tool for _, _, tool in calls], timeout=timeout) if calls else []
+
+            executed = {index: ([], []) for index in recalled}
+            for (index, position, _), output in zip(calls, outputs):
+                executed[index][0].append(position)
+                executed[index][1].append(output)
+            for index in recalled:
+                replies[index] = self.attempt(self.observe, agents[index], pending[index], recalled[index], executed[index], timeout)
+
+    def observe(self, agent: Any, request: Any, results: List[Any], executed: tuple, timeout: Any) -> Any:
+        """
+        Completes an agent's tool results with its prefetched ones and merges them into its observation.
+
+        Args:
+            agent (Any): The agent that requested the tools.
+            request (ToolRequest): Its tool request.
+            results (List[Any]): The results recalled from its memory, updated in place.
+            executed (tuple): The positions of the tools executed for it, and their results.
+            timeout (Any): The tool timeout of the agent.
+
+        Returns:
+            Any: The merged observation.
+        """
+        positions, outputs = executed
+        for position, future in request.prefetched.items():
+            if results[position] is None:
+                positions.append(position)
+                outputs.append(prefetched_result(request.tools[position], future, timeout))
+        agent.fill_results(request.tools, results, positions, outputs)
+        return merge_observations(request.tools, results)
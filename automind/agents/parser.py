@@ -0,0 +1,324 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, List, Optional, Tuple
+import json
+import re
+
+MARKER_PATTERN = re.compile(
+    r"^[ \t>#*_]*(thought|action input|action|final answer|observation)[ \t*_]*:[ \t*_]*",
+    re.IGNORECASE | re.MULTILINE
+)
+FENCE = "```"
+OUTPUT_TAGS = re.compile(r"</?output>", re.IGNORECASE)
+TRAILING_COMMA = re.compile(r",\s*([}\]])")
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+PYTHON_LITERAL = re.compile(r"\b(True|False|None)\b")
+
+
+class ParsedResponse(BaseModel):
+    """
+    The sections of a ReAct style LLM response.
+
+    Attributes:
+        thought (Optional[str]): The text of the `Thought:` section.
+        action (Any): The parsed JSON action (a dict, or a list of dicts for parallel actions).
+        action_text (Optional[str]): The action as recorded in the scratchpad, without its `Action:` label: the
+            normalized JSON block, or the raw section when the JSON could not be parsed.
+        action_error (Optional[str]): Why the action could not be parsed, if an action was found but was invalid.
+        final_answer (Optional[str]): The text following `Final Answer:`.
+        repaired (bool): Whether the action JSON had to be repaired before it could be parsed.
+    """
+
+    thought: Optional[str] = None
+    action: Any = None
+    action_text: Optional[str] = None
+    action_error: Optional[str] = None
+    final_answer: Optional[str] = None
+    repaired: bool = False
+
+
+def split_sections(text: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Splits a response on its `Thought:`, `Action:`, `Final Answer:` (and similar) markers in a single scan.
+    Markers are matched case-insensitively at the start of a line, and may be decorated with markdown.
+
+    Args:
+        text (str): The response.
+
+    Returns:
+        List[Tuple[Optional[str], str]]: The lowercase marker name and the text of each section, in order. Text
+        preceding the first marker has the name None.
+    """
+    sections = []
+    name, start = None, 0
+    for match in MARKER_PATTERN.finditer(text):
+        if match.start() > start or name is not None:
+            sections.append((name, text[start:match.start()]))
+        name, start = match.group(1).lower(), match.end()
+    sections.append((name, text[start:]))
+    return sections
+
+
+def balanced_end(text: str, start: int) -> Tuple[int, List[str], bool]:
+    """
+    Scans a JSON value from the bracket at `start`, keeping track of strings and nesting.
+
+    Args:
+        text (str): The text.
+        start (int): The position of the opening `{` or `[`.
+
+    Returns:
+        Tuple[int, List[str], bool]: The position after the closing bracket (or the end of the text), the
+        brackets still open, and whether the scan ended inside a string.
+    """
+    closing = {"{": "}", "[": "]"}
+    stack: List[str] = []
+    quote = None
+    escaped = False
+    for position in range(start, len(text)):
+        char = text[position]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in closing:
+            stack.append(closing[char])
+        elif char in "}]":
+            if stack and stack[-1] == char:
+                stack.pop()
+            if not stack:
+                return position + 1, [], False
+    return len(text), stack, quote is not None
+
+
+def find_json(text: str) -> Optional[str]:
+    """
+    Locates the JSON blob of an action: the content of a ```json (or bare ```) fence, which may be left unclosed
+    by a truncated generation, otherwise the first bracketed value.
+
+    Args:
+        text (str): The text to search.
+
+    Returns:
+        Optional[str]: The JSON text, or None if the text holds none.
+    """
+    text = OUTPUT_TAGS.sub("", text)
+    fence = text.find(FENCE)
+    if fence != -1:
+        body_start = fence + len(FENCE)
+        if text[body_start:body_start + 4].lower() == "json":
+            body_start += 4
+        body_end = text.find(FENCE, body_start)
+        body = text[body_start:body_end if body_end != -1 else len(text)]
+        if body.strip():
+            return body.strip()
+
+    starts = [position for position in (text.find("{"), text.find("[")) if position != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end, _, _ = balanced_end(text, start)
+    return text[start:end].strip()
+
+
+def sub_outside_strings(pattern: re.Pattern, repl: Any, text: str) -> str:
+    """
+    Applies `pattern.sub` to the parts of a JSON text that are outside quoted strings, tracking strings the
+    same way `balanced_end` does.
+
+    Args:
+        pattern (re.Pattern): The pattern to replace.
+        repl (Any): The replacement, as accepted by `re.sub`.
+        text (str): The JSON text.
+
+    Returns:
+        str: The text with the replacements made.
+    """
+    pieces = []
+    start = 0
+    quote = None
+    escaped = False
+    for position, char in enumerate(text):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+                pieces.append(text[start:position + 1])
+                start = position + 1
+        elif char in "\"'":
+            pieces.append(pattern.sub(repl, text[start:position]))
+            quote, start = char, position
+    pieces.append(text[start:] if quote else pattern.sub(repl, text[start:]))
+    return "".join(pieces)
+
+
+def repair_json(text: str) -> Tuple[Any, bool]:
+    """
+    Parses near-valid JSON as produced by LLMs: trailing commas, single quotes, Python literals, text after the
+    value and brackets or strings left open by a truncated generation are fixed before parsing.
+
+    Args:
+        text (str): The JSON text.
+
+    Returns:
+        Tuple[Any, bool]: The parsed value, and whether it had to be repaired.
+
+    Raises:
+        ValueError: If the text cannot be parsed even after repair.
+    """
+    try:
+        return json.loads(text), False
+    except ValueError:
+        pass
+
+    candidate = text.strip()
+    if candidate and candidate[0] in "{[":
+        end, stack, in_string = balanced_end(candidate, 0)
+        candidate = candidate[:end]
+        if in_string:
+            candidate += '"' if candidate.count('"') % 2 else "'"
+        candidate = candidate.rstrip().rstrip(",") + "".join(reversed(stack))
+    if '"' not in candidate:
+        candidate = candidate.replace("'", '"')
+    candidate = sub_outside_strings(PYTHON_LITERAL, lambda match: PYTHON_LITERALS[match.group(1)], candidate)
+    candidate = sub_outside_strings(TRAILING_COMMA, r"\1", candidate)
+
+    try:
+        return json.loads(candidate), True
+    except ValueError as exc:
+        raise ValueError(f"Invalid action JSON: {exc}") from None
+
+
+def format_action(action: Any) -> str:
+    """
+    Returns:
+        str: The normalized JSON block of a parsed action, as recorded in the scratchpad.
+    """
+    return f"```json\n{json.dumps(action, indent=2, ensure_ascii=False)}\n```"
+
+
+def parse_response(text: str) -> ParsedResponse:
+    """
+    Parses a (possibly partial) ReAct style response in one pass.
+
+    The response is split on its markers once; the action JSON is then looked up in the `Action:` section, or
+    anywhere in the response when it has no such section (e.g. SingleAgent's `<output>` format), and repaired
+    if needed.
+
+    Args:
+        text (str): The response.
+
+    Returns:
+        ParsedResponse: The sections found.
+    """
+    parsed = ParsedResponse()
+    action_section = None
+    for name, body in split_sections(text):
+        if name == "thought" and parsed.thought is None:
+            parsed.thought = body.strip()
+        elif name in ("action", "action input") and action_section is None:
+            action_section = body
+        elif name == "final answer" and parsed.final_answer is None:
+            parsed.final_answer = body
+            break
+
+    if action_section is None and parsed.final_answer is None:
+        action_section = text
+    if action_section is None:
+        return parsed
+
+    blob = find_json(action_section)
+    if blob is None:
+        if action_section is not text:
+            parsed.action_text = action_section.strip()
+            parsed.action_error = "no JSON action found"
+        return parsed
+
+    try:
+        parsed.action, parsed.repaired = repair_json(blob)
+        parsed.action_text = format_action(parsed.action)
+    except ValueError as exc:
+        parsed.action_text = action_section.strip()
+        parsed.action_error = str(exc)
+    return parsed
+
+
+class StreamParser(BaseModel):
+    """
+    Follows a streamed response chunk by chunk, detecting the end of its action block without rescanning the
+    text received so far: only the last, incomplete line is scanned again when a chunk arrives.
+
+    A code block closes the action only if it was opened in an `Action:` section, or before any marker (e.g.
+    SingleAgent's `<output>` format). Code blocks in other sections, and anything after `Final Answer:`, never
+    do.
+
+    Attributes:
+        text (str): The text received so far.
+    """
+
+    text: str = ""
+    _line_start: int = PrivateAttr(default=0)
+    _state: Tuple[str, Optional[str], bool, bool] = PrivateAttr(default=("", None, False, False))
+
+    def scan(self, state: Tuple[str, Optional[str], bool, bool], start: int, end: int) -> Tuple[str, Optional[str], bool, bool]:
+        """
+        Follows the markers and fences of `text[start:end]`.
+
+        Args:
+            state (Tuple[str, Optional[str], bool, bool]): The state at `start`: the current section (empty
+                before the first marker), the section the open code block started in (None when no block is
+                open), whether the action closed and whether a final answer started.
+            start (int): The position to scan from, at the start of a line.
+            end (int): The position to scan to.
+
+        Returns:
+            Tuple[str, Optional[str], bool, bool]: The state at `end`.
+        """
+        section, opened, closed, final = state
+        events = [(match.start(), match.end(), match.group(1).lower()) for match in MARKER_PATTERN.finditer(self.text, start, end)]
+        position = self.text.find(FENCE, start, end)
+        while position != -1:
+            events.append((position, position + len(FENCE), None))
+            position = self.text.find(FENCE, position + len(FENCE), end)
+
+        for _, _, name in sorted(events):
+            if name is None and opened is None:
+                opened = section
+            elif name is None:
+                closed = closed or (not final and opened in ("", "action", "action input"))
+                opened = None
+            elif opened is None:
+                section = name
+                final = final or name == "final answer"
+        return section, opened, closed, final
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Appends a chunk.
+
+        Args:
+            chunk (str): The next chunk.
+
+        Returns:
+            bool: Whether a complete fenced action block has been received.
+        """
+        self.text += chunk
+        line_end = self.text.rfind("\n", self._line_start) + 1
+        if line_end > self._line_start:
+            self._state = self.scan(self._state, self._line_start, line_end)
+            self._line_start = line_end
+        return self.scan(self._state, self._line_start, len(self.text))[2]
+
+    def result(self) -> ParsedResponse:
+        """
+        Returns:
+            ParsedResponse: The sections of the text received so far.
+        """
+        return parse_response(self.text)
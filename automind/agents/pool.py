@@ -0,0 +1,313 @@
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+from automind.actions.registry import get_registry
+from automind.events import events
+from collections import deque
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import traceback
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TOKENIZERS_PARALLELISM")
+
+
+class PoolResult(BaseModel):
+    """
+    The outcome of one question answered by an `AgentPool` worker.
+
+    Attributes:
+        index (int): The position of the question in the submitted sequence.
+        question (str): The question.
+        result (Any): The agent's result, or None if it failed.
+        error (Optional[str]): The formatted traceback of the failure, if any.
+        worker (int): The slot of the worker that answered the question.
+    """
+
+    index: int
+    question: str
+    result: Any = None
+    error: Optional[str] = None
+    worker: int
+
+
+class WorkerError(RuntimeError):
+    """
+    Raised by `AgentPool.run_many` when an agent failed in a worker process.
+    """
+
+
+def worker_main(slot: int, settings: dict, tasks: Any, results: Any):
+    """
+    The loop of a worker process: builds the LLM and the tool registry once, then answers questions from
+    `tasks` until it receives None.
+
+    Results are pickled by the worker itself, so a result that cannot be pickled is reported as a failure
+    instead of being lost by the queue.
+
+    Args:
+        slot (int): The worker slot.
+        settings (dict): The agent class, LLM class and fields, actions, backstory, agent kwargs and threads per
+            worker of the pool.
+        tasks (multiprocessing.Queue): The `(batch, index, question)` triples assigned to this worker.
+        results (multiprocessing.Queue): The `(batch, slot, index, pickled result, error)` messages sent back to
+            the parent.
+    """
+    if settings["threads_per_worker"] is not None:
+        for name in THREAD_ENV_VARS[:3]:
+            os.environ[name] = str(settings["threads_per_worker"])
+        os.environ[THREAD_ENV_VARS[3]] = "false"
+
+    llm = settings["llm_cls"](**settings["llm_fields"])
+    llm.warmup()
+    actions = get_registry(settings["actions"])
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            events.flush()
+            return
+        batch, index, question = task
+        try:
+            agent = settings["agent_cls"](
+                question=question, llm=llm, actions=actions, backstory=settings["backstory"], **settings["agent_kwargs"]
+            )
+            result, error = agent.run(), None
+        except Exception:
+            result, error = None, traceback.format_exc()
+        try:
+            payload = pickle.dumps(result)
+        except Exception:
+            payload, error = pickle.dumps(None), f"The result cannot be sent back to the parent process:\n{traceback.format_exc()}"
+        results.put((batch, slot, index, payload, error))
+
+
+class AgentPool(BaseModel):
+    """
+    Answers questions with agents spread over several worker processes, so that CPU-bound local models
+    (e.g. `AnyhfLLM` with `device="cpu"`) use every core instead of contending for a single GIL.
+
+    Each worker builds its own copy of the LLM and of the tool registry once, then answers the questions the
+    parent hands it, one at a time, over its own queue. Results are yielded as soon as they complete. Since the
+    parent records each assignment when it dispatches it, a worker that dies (e.g. killed by the OOM killer) is
+    replaced, and the question it was given is queued again, up to `max_retries` times.
+
+    The pool can be used as a context manager to keep the workers, and their loaded models, across calls.
+
+    Attributes:
+        agent_cls (Any): The agent class to instantiate for each question, e.g. `SingleAgent` or `ThinkAgent`.
+        llm (Any): The LLM wrapper, re-created from its field values in every worker, where its model is built.
+            Its field values (e.g. its `cache`) must be picklable.
+        actions (Any): The available action classes. They must be importable by the workers.
+        backstory (str): The backstory given to every agent.
+        agent_kwargs (dict): Any additional keyword arguments for the agent class (e.g. `num_iterations`, `summary`).
+        num_workers (int): The number of worker processes. Defaults to the number of CPUs.
+        threads_per_worker (Optional[int]): The number of math library threads per worker, so that the workers
+            do not oversubscribe the cores. `None` keeps the library defaults.
+        max_retries (int): The number of times a question is retried after its worker died.
+        start_method (str): The multiprocessing start method. `spawn` is safe with CUDA and threads.
+        return_exceptions (bool): Whether `run_many` returns a `WorkerError` in place of a failed result
+            instead of raising it.
+        restarts (int): The number of workers replaced after dying.
+    """
+
+    agent_cls: Any
+    llm: Any
+    actions: Any
+    backstory: str
+    agent_kwargs: dict = Field(default_factory=dict)
+    num_workers: int = Field(default_factory=lambda: os.cpu_count() or 1)
+    threads_per_worker: Optional[int] = 1
+    max_retries: int = 1
+    start_method: str = "spawn"
+    return_exceptions: bool = False
+    restarts: int = 0
+    _context: Any = PrivateAttr(default=None)
+    _queues: List[Any] = PrivateAttr(default_factory=list)
+    _results: Any = PrivateAttr(default=None)
+    _workers: List[Any] = PrivateAttr(default_factory=list)
+    _assigned: Dict[int, Tuple[int, int]] = PrivateAttr(default_factory=dict)
+    _batches: Any = PrivateAttr(default_factory=itertools.count)
+
+    def start_worker(self, slot: int):
+        """
+        Starts the worker process of a slot, with a new task queue.
+
+        Args:
+            slot (int): The worker slot.
+        """
+        settings = {
+            "agent_cls": self.agent_cls,
+            "llm_cls": type(self.llm),
+            "llm_fields": {name: value for name, value in self.llm if name != "model"},
+            "actions": tuple(get_registry(self.actions).tools),
+            "backstory": self.backstory,
+            "agent_kwargs": self.agent_kwargs,
+            "threads_per_worker": self.threads_per_worker,
+        }
+        self._queues[slot] = self._context.Queue()
+        process = self._context.Process(
+            target=worker_main, args=(slot, settings, self._queues[slot], self._results), name=f"automind-worker-{slot}", daemon=True
+        )
+        process.start()
+        self._workers[slot] = process
+
+    def start(self):
+        """
+        Starts the worker processes, if they are not running yet.
+        """
+        if self._workers:
+            return
+        self._context = multiprocessing.get_context(self.start_method)
+        self._results = self._context.Queue()
+        self._queues = [None] * self.num_workers
+        self._workers = [None] * self.num_workers
+        for slot in range(self.num_workers):
+            self.start_worker(slot)
+
+    def close(self):
+        """
+        Stops the worker processes once they have answered the questions assigned to them.
+        """
+        if not self._workers:
+            return
+        for tasks in self._queues:
+            tasks.put(None)
+        for process in self._workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._workers = []
+        self._queues = []
+        self._assigned.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def imap_unordered(self, questions: Iterable[str]) -> Iterator[PoolResult]:
+        """
+        Answers questions on the worker processes, yielding each result as soon as it completes.
+
+        Args:
+            questions (Iterable[str]): The questions to answer.
+
+        Yields:
+            PoolResult: The outcome of each question, in completion order.
+        """
+        owned = not self._workers
+        self.start()
+        questions = list(questions)
+        batch = next(self._batches)
+        pending = deque(range(len(questions)))
+        remaining = set(range(len(questions)))
+        attempts: Dict[int, int] = {}
+        try:
+            while remaining:
+                self.dispatch(batch, questions, pending)
+                try:
+                    message = self._results.get(timeout=0.5)
+                except queue.Empty:
+                    yield from self.recover(batch, questions, pending, attempts, remaining)
+                    continue
+
+                message_batch, slot, index, payload, error = message
+                if self._assigned.get(slot) == (message_batch, index):
+                    del self._assigned[slot]
+                if message_batch != batch or index not in remaining:
+                    continue
+                remaining.discard(index)
+                try:
+                    result = pickle.loads(payload)
+                except Exception:
+                    result, error = None, f"The result cannot be loaded by the parent process:\n{traceback.format_exc()}"
+                yield PoolResult(index=index, question=questions[index], result=result, error=error, worker=slot)
+        finally:
+            if owned:
+                self.close()
+
+    def dispatch(self, batch: int, questions: List[str], pending: Deque[int]):
+        """
+        Assigns pending questions to the idle workers, one question per worker.
+
+        Args:
+            batch (int): The number of the `imap_unordered` call the questions belong to.
+            questions (List[str]): The submitted questions.
+            pending (Deque[int]): The indices of the questions not assigned yet, updated in place.
+        """
+        for slot, tasks in enumerate(self._queues):
+            if not pending:
+                return
+            if slot in self._assigned:
+                continue
+            index = pending.popleft()
+            self._assigned[slot] = (batch, index)
+            tasks.put((batch, index, questions[index]))
+
+    def recover(self, batch: int, questions: List[str], pending: Deque[int], attempts: Dict[int, int], remaining: set) -> Iterator[PoolResult]:
+        """
+        Replaces the workers that died, queueing their question again or reporting it as failed once it has
+        been retried `max_retries` times.
+
+        Args:
+            batch (int): The number of the `imap_unordered` call the questions belong to.
+            questions (List[str]): The submitted questions.
+            pending (Deque[int]): The indices of the questions not assigned yet, updated in place.
+            attempts (Dict[int, int]): The number of retries of each question, updated in place.
+            remaining (set): The indices of the unanswered questions, updated in place.
+
+        Yields:
+            PoolResult: The questions given up on.
+        """
+        for slot, process in enumerate(self._workers):
+            if process.is_alive():
+                continue
+            exitcode = process.exitcode
+            self.restarts += 1
+            self.start_worker(slot)
+
+            assigned = self._assigned.pop(slot, None)
+            if assigned is None or assigned[0] != batch:
+                if self.restarts > self.num_workers * (self.max_retries + 1):
+                    raise WorkerError(f"Worker processes keep dying before answering (last exit code {exitcode}).")
+                continue
+            index = assigned[1]
+            if index not in remaining:
+                continue
+            attempts[index] = attempts.get(index, 0) + 1
+            if attempts[index] <= self.max_retries:
+                pending.appendleft(index)
+            else:
+                remaining.discard(index)
+                yield PoolResult(
+                    index=index, question=questions[index], worker=slot,
+                    error=f"Worker {slot} died with exit code {exitcode} after {attempts[index]} attempts."
+                )
+
+    def run_many(self, questions: List[str]) -> List[Any]:
+        """
+        Answers many questions on the worker processes.
+
+        Args:
+            questions (List[str]): The questions to answer.
+
+        Returns:
+            List[Any]: The result of each agent, in the order of `questions`.
+
+        Raises:
+            WorkerError: If an agent failed and `return_exceptions` is not set.
+        """
+        results: List[Any] = [None] * len(questions)
+        for outcome in self.imap_unordered(questions):
+            if outcome.error is None:
+                results[outcome.index] = outcome.result
+                continue
+            error = WorkerError(f"Question {outcome.index} failed in worker {outcome.worker}:\n{outcome.error}")
+            if not self.return_exceptions:
+                raise error
+            results[outcome.index] = error
+        return results
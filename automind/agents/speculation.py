@@ -0,0 +1,191 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, Dict, List, Optional
+from automind.actions.executor import action_query, error_message, get_executor, normalize_query, timeout_message
+from concurrent.futures import TimeoutError as FutureTimeout
+import asyncio
+import threading
+import time
+
+
+def speculative_calls(actions: List[Any], question: str) -> List[Any]:
+    """
+    Guesses the tool calls an agent is likely to make for a question: each `speculative` action taking a single
+    argument, called with the question itself.
+
+    Args:
+        actions (List[Any]): The available action classes.
+        question (str): The question.
+
+    Returns:
+        List[BaseAction]: The guessed tool calls.
+    """
+    calls = []
+    for action in actions:
+        if not getattr(action, "speculative", False):
+            continue
+        fields = [name for name in action.model_fields if name != "llm"]
+        if len(fields) == 1:
+            calls.append(action(**{fields[0]: question}))
+    return calls
+
+
+class SpeculationStats(BaseModel):
+    """
+    Thread-safe counters of speculative tool prefetching.
+
+    Attributes:
+        prefetched (int): The number of tool calls started speculatively.
+        hits (int): The number of executed tool calls served by a prefetch.
+        misses (int): The number of executed tool calls no prefetch matched.
+        wasted (int): The number of prefetches discarded because no executed call matched them.
+        latency_saved (float): The number of seconds of tool latency overlapped with the LLM call, in total.
+    """
+
+    prefetched: int = 0
+    hits: int = 0
+    misses: int = 0
+    wasted: int = 0
+    latency_saved: float = 0.0
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def record(self, prefetched: int = 0, hits: int = 0, misses: int = 0, wasted: int = 0, latency_saved: float = 0.0):
+        """
+        Adds to the counters.
+        """
+        with self._lock:
+            self.prefetched += prefetched
+            self.hits += hits
+            self.misses += misses
+            self.wasted += wasted
+            self.latency_saved += latency_saved
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The counters, the hit rate of the executed tool calls and the average latency saved per hit.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "prefetched": self.prefetched,
+                "hits": self.hits,
+                "misses": self.misses,
+                "wasted": self.wasted,
+                "hit_rate": self.hits / total if total else 0.0,
+                "latency_saved": self.latency_saved,
+                "avg_latency_saved": self.latency_saved / self.hits if self.hits else 0.0,
+            }
+
+
+speculation_stats = SpeculationStats()
+"""The process-wide speculation counters, used by agents without their own."""
+
+
+class Speculation(BaseModel):
+    """
+    The tool calls prefetched for one agent run, executed on the shared thread pool while the LLM is generating.
+
+    Attributes:
+        calls (List[Any]): The prefetched tool calls.
+        stats (Any): The `SpeculationStats` updated once the speculation is resolved.
+    """
+
+    calls: List[Any]
+    stats: Any
+    _futures: List[Any] = PrivateAttr(default_factory=list)
+    _started: List[float] = PrivateAttr(default_factory=list)
+    _finished: Dict[int, float] = PrivateAttr(default_factory=dict)
+    _resolved: bool = PrivateAttr(default=False)
+
+    @classmethod
+    def start(cls, calls: List[Any], stats: SpeculationStats, execute: Optional[Any] = None) -> "Speculation":
+        """
+        Starts the tool calls.
+
+        Args:
+            calls (List[BaseAction]): The tool calls to prefetch.
+            stats (SpeculationStats): The counters to update.
+            execute (Optional[Callable[[Any], Any]]): Executes one tool call, e.g. under a scheduler slot.
+                Defaults to the call's `execute`.
+
+        Returns:
+            Speculation: The speculation in progress.
+        """
+        speculation = cls(calls=calls, stats=stats)
+        execute = execute or (lambda action: action.execute())
+        for position, call in enumerate(calls):
+            speculation._started.append(time.monotonic())
+            future = get_executor().submit(execute, call)
+            future.add_done_callback(lambda _, position=position: speculation._finished.setdefault(position, time.monotonic()))
+            speculation._futures.append(future)
+        stats.record(prefetched=len(calls))
+        return speculation
+
+    def resolve(self, tools: List[Any]) -> Dict[int, Any]:
+        """
+        Matches the tool calls chosen by the LLM against the prefetched ones, and discards the others. A tool call
+        matches a prefetch of the same action with the same normalized query. Only the first call resolves the
+        speculation; later ones match nothing.
+
+        Args:
+            tools (List[BaseAction]): The tool calls chosen by the LLM.
+
+        Returns:
+            Dict[int, Future]: The future of the prefetched result of each matched tool, by position in `tools`.
+        """
+        if self._resolved:
+            return {}
+        self._resolved = True
+        now = time.monotonic()
+        available = {
+            (type(call), normalize_query(action_query(call))): position for position, call in enumerate(self.calls)
+        }
+        matched: Dict[int, Any] = {}
+        saved = 0.0
+        for index, tool in enumerate(tools):
+            position = available.pop((type(tool), normalize_query(action_query(tool))), None)
+            if position is None:
+                continue
+            matched[index] = self._futures[position]
+            saved += min(self._finished.get(position, now), now) - self._started[position]
+
+        used = {id(future) for future in matched.values()}
+        for future in self._futures:
+            if id(future) not in used:
+                future.cancel()
+        self.stats.record(
+            hits=len(matched), misses=len(tools) - len(matched), wasted=len(self.calls) - len(matched), latency_saved=saved
+        )
+        return matched
+
+
+def prefetched_result(action: Any, future: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Waits for the prefetched result of a tool call.
+
+    Args:
+        action (BaseAction): The tool call.
+        future (Future): The future of its prefetch.
+        timeout (Optional[float]): The maximum number of seconds to wait.
+
+    Returns:
+        Any: The result, or an error observation if the prefetch failed or timed out.
+    """
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        return timeout_message(action, timeout)
+    except Exception as exc:
+        return error_message(action, exc)
+
+
+async def aprefetched_result(action: Any, future: Any, timeout: Optional[float] = None) -> Any:
+    """
+    Asynchronous counterpart of `prefetched_result`.
+    """
+    try:
+        return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=timeout)
+    except asyncio.TimeoutError:
+        return timeout_message(action, timeout)
+    except Exception as exc:
+        return error_message(action, exc)
@@ -0,0 +1,292 @@
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Callable, Dict, List, Optional
+from abc import abstractmethod
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+import traceback
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+
+
+class Event(BaseModel):
+    """
+    Something that happened during a run, e.g. a thought, a tool call or a final answer.
+
+    The message is a `str.format` template filled with `data` only when a handler renders it, so events
+    carrying large payloads (tool responses, observations) cost nothing to emit when nobody prints them.
+
+    Attributes:
+        name (str): The event name, e.g. `observation`.
+        message (str): The message template.
+        level (int): The severity, using the `logging` levels.
+        source (Optional[str]): The name of the agent or action emitting the event.
+        data (Dict[str, Any]): The values referenced by the message template.
+        timestamp (float): The wall clock time of the event, in seconds since the epoch.
+    """
+
+    name: str
+    message: str = ""
+    level: int = INFO
+    source: Optional[str] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+    timestamp: float = Field(default_factory=time.time)
+
+    def render(self, max_chars: Optional[int] = None) -> str:
+        """
+        Fills the message template.
+
+        Args:
+            max_chars (Optional[int]): The maximum number of characters kept from each value. `None` keeps them whole.
+
+        Returns:
+            str: The message.
+        """
+        data = self.data
+        if max_chars is not None:
+            data = {key: truncate(value, max_chars) for key, value in data.items()}
+        return self.message.format(**data) if data else self.message
+
+
+def truncate(value: Any, max_chars: int) -> Any:
+    """
+    Shortens the text of a value to at most `max_chars` characters.
+
+    Args:
+        value (Any): The value.
+        max_chars (int): The maximum number of characters.
+
+    Returns:
+        Any: The value itself if short enough, otherwise its truncated text.
+    """
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = str(value)
+    if len(text) <= max_chars:
+        return value
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more characters]"
+
+
+class BaseHandler(BaseModel):
+    """
+    A base class for event handlers.
+
+    Attributes:
+        level (int): The minimum level of the events handled.
+    """
+
+    level: int = DEBUG
+
+    @abstractmethod
+    def handle(self, event: Event):
+        """
+        Abstract method processing an event.
+
+        Args:
+            event (Event): The event.
+        """
+        pass
+
+
+class ConsoleHandler(BaseHandler):
+    """
+    Writes events to the console.
+
+    Attributes:
+        level (int): The minimum level of the events written.
+        max_chars (Optional[int]): The maximum number of characters written for each value of an event, so
+            tool responses do not flood the console. `None` writes them whole.
+        stream (Any): The file written to. Defaults to `sys.stdout`.
+    """
+
+    level: int = INFO
+    max_chars: Optional[int] = 2000
+    stream: Any = None
+
+    def handle(self, event: Event):
+        out = self.stream or sys.stdout
+        if event.name == "token":
+            out.write(event.data["chunk"])
+        else:
+            out.write(event.render(self.max_chars) + "\n")
+        out.flush()
+
+
+class LoggingHandler(BaseHandler):
+    """
+    Forwards events to the standard `logging` module.
+
+    Attributes:
+        logger_name (str): The name of the logger.
+        max_chars (Optional[int]): The maximum number of characters logged for each value of an event.
+    """
+
+    logger_name: str = "automind"
+    max_chars: Optional[int] = 2000
+
+    def handle(self, event: Event):
+        if event.name != "token":
+            logging.getLogger(self.logger_name).log(event.level, event.render(self.max_chars), extra={"event": event.name})
+
+
+class CallbackHandler(BaseHandler):
+    """
+    Passes every event to a callable, e.g. to feed a UI or collect metrics.
+
+    Attributes:
+        callback (Callable[[Event], Any]): The callable receiving the events.
+    """
+
+    callback: Callable[[Event], Any]
+
+    def handle(self, event: Event):
+        self.callback(event)
+
+
+class EventBus(BaseModel):
+    """
+    Dispatches events to handlers.
+
+    Events below `level` are dropped before any formatting. When `background` is set, events are queued and
+    handled by a daemon writer thread, so the agents never block on console or file I/O; if the queue is full,
+    new events are dropped and counted in `dropped` rather than slowing the run down.
+
+    Attributes:
+        handlers (List[Any]): The handlers receiving the events.
+        level (int): The minimum level of the events dispatched.
+        enabled (bool): Whether events are dispatched at all.
+        background (bool): Whether events are handled by a background thread instead of the emitting one.
+        max_queue (int): The maximum number of events waiting for the background thread.
+        dropped (int): The number of events dropped because the queue was full.
+        handler_errors (int): The number of events a handler failed to handle.
+    """
+
+    handlers: List[Any] = Field(default_factory=list)
+    level: int = INFO
+    enabled: bool = True
+    background: bool = True
+    max_queue: int = 10000
+    dropped: int = 0
+    handler_errors: int = 0
+    _failed: set = PrivateAttr(default_factory=set)
+    _queue: Any = PrivateAttr(default=None)
+    _worker: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Returns:
+            bool: Whether an event of this level would be dispatched.
+        """
+        return self.enabled and level >= self.level and bool(self.handlers)
+
+    def emit(self, name: str, message: str = "", level: int = INFO, source: Optional[str] = None, **data):
+        """
+        Emits an event.
+
+        Args:
+            name (str): The event name.
+            message (str): The message template, filled with `data` when rendered.
+            level (int): The severity.
+            source (Optional[str]): The name of the agent or action emitting the event.
+            **data: The values referenced by the message template.
+        """
+        if not self.is_enabled_for(level):
+            return
+        event = Event(name=name, message=message, level=level, source=source, data=data)
+        if not self.background:
+            self.dispatch(event)
+            return
+
+        self.start()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def dispatch(self, event: Event):
+        """
+        Passes an event to every handler accepting its level. A failing handler does not stop the others; its
+        first failure is reported on `sys.stderr`, and every failure is counted in `handler_errors`.
+
+        Args:
+            event (Event): The event.
+        """
+        for handler in self.handlers:
+            if event.level >= handler.level:
+                try:
+                    handler.handle(event)
+                except Exception:
+                    self.report(handler, event)
+
+    def report(self, handler: Any, event: Event):
+        """
+        Records the failure of a handler, writing its traceback to `sys.stderr` the first time the handler fails.
+
+        Args:
+            handler (BaseHandler): The failing handler.
+            event (Event): The event it failed to handle.
+        """
+        with self._lock:
+            self.handler_errors += 1
+            if id(handler) in self._failed:
+                return
+            self._failed.add(id(handler))
+        sys.stderr.write(
+            f"automind: {type(handler).__name__} failed to handle the {event.name!r} event; "
+            f"its further failures are not reported.\n{traceback.format_exc()}"
+        )
+
+    def start(self):
+        """
+        Starts the background writer thread, if it is not running yet.
+        """
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._worker = threading.Thread(target=self.drain, name="automind-events", daemon=True)
+                self._worker.start()
+                atexit.register(self.flush)
+
+    def drain(self):
+        """
+        The background writer loop.
+        """
+        while True:
+            event = self._queue.get()
+            try:
+                self.dispatch(event)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Blocks until every queued event has been handled.
+        """
+        if self._queue is not None:
+            self._queue.join()
+
+
+events = EventBus(handlers=[ConsoleHandler()])
+
+
+def emit(name: str, message: str = "", level: int = INFO, source: Optional[str] = None, **data):
+    """
+    Emits an event on the process-wide `events` bus.
+
+    Args:
+        name (str): The event name.
+        message (str): The message template, filled with `data` when rendered.
+        level (int): The severity.
+        source (Optional[str]): The name of the agent or action emitting the event.
+        **data: The values referenced by the message template.
+    """
+    events.emit(name, message, level=level, source=source, **data)
@@ -1,6 +1,11 @@
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, AsyncIterator, Iterator, List, Optional
 from abc import abstractmethod
+from automind.llms.cache import make_cache_key, last_cache_hits
+from automind.llms.tokens import get_token_counter
+import asyncio
+import functools
+import inspect
 
 class BaseLLM(BaseModel):
     """
@@ -10,10 +15,38 @@ class BaseLLM(BaseModel):
     Attributes:
         configs (Any): Configuration settings for the model.
         model (Any): The actual language model instance, initialized to None by default.
+        cache (Any): An optional response cache (see `automind.llms.cache`). When set, `run` and `arun`
+            serve repeated (model, configs, prompt) calls from the cache instead of the model.
+        context_window (Optional[int]): The maximum number of tokens of a prompt and its response. When set,
+            agents trim their prompts to fit it.
+        shared (bool): Whether the built model is shared, through `automind.llms.registry.model_registry`, with
+            every wrapper of the same class, model name and configs instead of being loaded again.
+
+    Subclasses implement `generate`. A subclass written against the original interface, which implements
+    `run(prompt)` instead, keeps working: its `run` becomes its `generate`, so it also gains the cache.
     """
 
     configs: Any
     model: Any = None
+    cache: Any = None
+    shared: bool = True
+    context_window: Optional[int] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        run = cls.__dict__.get("run")
+        if run is None or "generate" in cls.__dict__ or not getattr(cls.generate, "__isabstractmethod__", False):
+            return
+
+        parameters = inspect.signature(run).parameters
+        takes_stop = "stop" in parameters or any(param.kind is param.VAR_KEYWORD for param in parameters.values())
+
+        @functools.wraps(run)
+        def generate(self, prompt: str, stop: Optional[List[str]] = None):
+            return run(self, prompt, stop=stop) if takes_stop else run(self, prompt)
+
+        cls.generate = generate
+        delattr(cls, "run")
 
     @abstractmethod
     def build(self):
@@ -23,13 +56,306 @@ class BaseLLM(BaseModel):
         """
         pass
 
+    def warmup(self, prompt: Optional[str] = None):
+        """
+        Builds the model ahead of the first request.
+
+        Args:
+            prompt (Optional[str]): A short prompt run once, bypassing the cache, to also trigger the engine's
+                lazy initialization.
+        """
+        if not self.model:
+            self.build()
+        if prompt is not None:
+            self.generate(prompt)
+
     @abstractmethod
-    def run(self, prompt: str):
+    def generate(self, prompt: str, stop: Optional[List[str]] = None):
         """
-        Abstract method to run the language model with a given prompt.
+        Abstract method to generate a response from the language model for a given prompt.
         Implementations should define how the model processes the prompt and generates a response.
 
         Args:
             prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
         """
         pass
+
+    async def agenerate(self, prompt: str, stop: Optional[List[str]] = None):
+        """
+        Asynchronously generates a response for a given prompt.
+
+        The default implementation runs `generate` in the event loop's default executor so that
+        implementations without a native async client do not block the loop. Implementations
+        backed by a client with an async API should override this method.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate, prompt, stop)
+
+    def generate_batch(self, prompts: List[str], stop: Optional[List[str]] = None) -> List[str]:
+        """
+        Generates responses for several prompts.
+
+        The default implementation calls `generate` for each prompt in turn. Implementations whose
+        engine supports batched generation should override this method to submit all prompts at once.
+
+        Args:
+            prompts (List[str]): The input text prompts.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            List[str]: The generated responses, in the order of `prompts`.
+        """
+        return [self.generate(prompt, stop=stop) for prompt in prompts]
+
+    def generate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Generates a response for a given prompt as a stream of text chunks.
+
+        The default implementation yields the whole response of `generate` as a single chunk.
+        Implementations backed by a client with a streaming API should override this method.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the response.
+        """
+        yield self.generate(prompt, stop=stop)
+
+    async def agenerate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of `generate_stream`. The default implementation yields the whole
+        response of `agenerate` as a single chunk.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the response.
+        """
+        yield await self.agenerate(prompt, stop=stop)
+
+    def llm_name(self) -> str:
+        """
+        Returns:
+            str: The identifier of the underlying model, used to build cache keys.
+        """
+        return type(self).__name__
+
+    def resource(self) -> str:
+        """
+        Returns:
+            str: The name of the `automind.scheduler.Scheduler` resource held by the model's calls, e.g. `gemini`
+            or `gpu`. Defaults to the class name.
+        """
+        return type(self).__name__
+
+    def cached_response(self, prompt: str, stop: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Looks a prompt up in `cache` without calling the model. The lookup counts as the call's hit or miss, so
+        a caller generating the response after a miss passes `lookup=False` to `run`, `arun` or `stream`.
+
+        Args:
+            prompt (str): The input text prompt.
+            stop (Optional[List[str]]): The stop sequences of the call.
+
+        Returns:
+            Optional[str]: The cached response, or None.
+        """
+        if self.cache is None:
+            last_cache_hits.set(None)
+            return None
+        resp = self.cache.get(self.cache_key(prompt, stop=stop))
+        last_cache_hits.set(int(resp is not None))
+        return resp
+
+    def token_counter(self):
+        """
+        Returns the token counter matching the model's tokenizer. Defaults to the `cl100k_base` tiktoken
+        encoding, a close approximation for hosted chat models.
+
+        Returns:
+            TokenCounter: The shared counter.
+        """
+        return get_token_counter("tiktoken")
+
+    def prompt_budget(self) -> Optional[int]:
+        """
+        Returns:
+            Optional[int]: The maximum number of prompt tokens, i.e. `context_window` minus the tokens reserved
+            for the response (`max_new_tokens` in the configs, 512 by default), or None without a context window.
+        """
+        if self.context_window is None:
+            return None
+        reserved = (self.configs or {}).get("max_new_tokens") or 512
+        return max(self.context_window - reserved, 0)
+
+    def cache_key(self, prompt: str, stop: Optional[List[str]] = None) -> str:
+        """
+        Builds the cache key of a prompt from the model name, the generation configs (excluding
+        credentials), the prompt itself and the stop sequences.
+
+        Args:
+            prompt (str): The input text prompt.
+            stop (Optional[List[str]]): The stop sequences of the call.
+
+        Returns:
+            str: The cache key.
+        """
+        configs = {
+            key: value for key, value in (self.configs or {}).items()
+            if "api_key" not in key
+        }
+        return make_cache_key(self.llm_name(), configs, prompt, stop=stop)
+
+    def run(self, prompt: str, stop: Optional[List[str]] = None, lookup: bool = True):
+        """
+        Runs the language model with a given prompt, serving the response from `cache` when possible.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+            lookup (bool): Whether `cache` is looked up first. Pass False after a miss of `cached_response`;
+                the response is still stored.
+
+        Returns:
+            str: The generated response.
+        """
+        if self.cache is None:
+            last_cache_hits.set(None)
+            return self.generate(prompt, stop=stop)
+
+        key = self.cache_key(prompt, stop=stop)
+        resp = self.cache.get(key) if lookup else None
+        if lookup:
+            last_cache_hits.set(int(resp is not None))
+        if resp is None:
+            resp = self.generate(prompt, stop=stop)
+            self.cache.set(key, resp)
+        return resp
+
+    async def arun(self, prompt: str, stop: Optional[List[str]] = None, lookup: bool = True):
+        """
+        Asynchronously runs the language model with a given prompt, serving the response from `cache`
+        when possible.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+            lookup (bool): Whether `cache` is looked up first. Pass False after a miss of `cached_response`;
+                the response is still stored.
+
+        Returns:
+            str: The generated response.
+        """
+        if self.cache is None:
+            last_cache_hits.set(None)
+            return await self.agenerate(prompt, stop=stop)
+
+        key = self.cache_key(prompt, stop=stop)
+        resp = self.cache.get(key) if lookup else None
+        if lookup:
+            last_cache_hits.set(int(resp is not None))
+        if resp is None:
+            resp = await self.agenerate(prompt, stop=stop)
+            self.cache.set(key, resp)
+        return resp
+
+    def batch(self, prompts: List[str], stop: Optional[List[str]] = None) -> List[str]:
+        """
+        Runs the language model on several prompts with a single batched generation. Prompts found in
+        `cache` are served from it and only the remaining ones are generated.
+
+        Args:
+            prompts (List[str]): The input text prompts.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            List[str]: The generated responses, in the order of `prompts`.
+        """
+        if self.cache is None:
+            last_cache_hits.set(None)
+            return self.generate_batch(prompts, stop=stop) if prompts else []
+
+        keys = [self.cache_key(prompt, stop=stop) for prompt in prompts]
+        responses = [self.cache.get(key) for key in keys]
+        missing = [index for index, resp in enumerate(responses) if resp is None]
+        last_cache_hits.set(len(prompts) - len(missing))
+        if missing:
+            generated = self.generate_batch([prompts[index] for index in missing], stop=stop)
+            for index, resp in zip(missing, generated):
+                self.cache.set(keys[index], resp)
+                responses[index] = resp
+        return responses
+
+    def stream(self, prompt: str, stop: Optional[List[str]] = None, lookup: bool = True) -> Iterator[str]:
+        """
+        Runs the language model with a given prompt and yields the response as it is generated.
+
+        A cached response is yielded as a single chunk. A streamed response is only cached once it has been
+        consumed entirely, so a consumer that stops early never stores a truncated response.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+            lookup (bool): Whether `cache` is looked up first. Pass False after a miss of `cached_response`;
+                the response is still stored.
+
+        Yields:
+            str: The successive chunks of the response.
+        """
+        key = self.cache_key(prompt, stop=stop) if self.cache is not None else None
+        if lookup:
+            last_cache_hits.set(None if key is None else 0)
+        if key is not None and lookup:
+            resp = self.cache.get(key)
+            if resp is not None:
+                last_cache_hits.set(1)
+                yield resp
+                return
+
+        chunks = []
+        for chunk in self.generate_stream(prompt, stop=stop):
+            chunks.append(chunk)
+            yield chunk
+
+        if key is not None:
+            self.cache.set(key, "".join(chunks))
+
+    async def astream(self, prompt: str, stop: Optional[List[str]] = None, lookup: bool = True) -> AsyncIterator[str]:
+        """
+        Asynchronous counterpart of `stream`.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+            lookup (bool): Whether `cache` is looked up first. Pass False after a miss of `cached_response`;
+                the response is still stored.
+
+        Yields:
+            str: The successive chunks of the response.
+        """
+        key = self.cache_key(prompt, stop=stop) if self.cache is not None else None
+        if lookup:
+            last_cache_hits.set(None if key is None else 0)
+        if key is not None and lookup:
+            resp = self.cache.get(key)
+            if resp is not None:
+                last_cache_hits.set(1)
+                yield resp
+                return
+
+        chunks = []
+        async for chunk in self.agenerate_stream(prompt, stop=stop):
+            chunks.append(chunk)
+            yield chunk
+
+        if key is not None:
+            self.cache.set(key, "".join(chunks))
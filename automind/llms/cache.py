@@ -0,0 +1,246 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, List, Optional
+from abc import abstractmethod
+from collections import OrderedDict
+from contextvars import ContextVar
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+last_cache_hits: ContextVar[Optional[int]] = ContextVar("automind_last_cache_hits", default=None)
+"""The number of prompts served from the cache by the last LLM call in the current context, or None without cache."""
+
+
+def make_cache_key(model_name: str, configs: Any, prompt: str, **kwargs) -> str:
+    """
+    Builds a stable cache key for an LLM call.
+
+    Args:
+        model_name (str): The identifier of the model.
+        configs (Any): The generation settings that influence the response.
+        prompt (str): The prompt sent to the model.
+        **kwargs: Any additional call parameters that influence the response.
+
+    Returns:
+        str: A SHA-256 hex digest of the JSON-serialized inputs.
+    """
+    payload = json.dumps(
+        {"model": model_name, "configs": configs, "prompt": prompt, "kwargs": kwargs},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BaseCache(BaseModel):
+    """
+    A base class for LLM response caches.
+
+    Attributes:
+        ttl (Optional[float]): The number of seconds an entry stays valid. `None` keeps entries until evicted.
+        hits (int): The number of lookups served from the cache.
+        misses (int): The number of lookups that were not found or had expired.
+    """
+
+    ttl: Optional[float] = None
+    hits: int = 0
+    misses: int = 0
+
+    @abstractmethod
+    def lookup(self, key: str) -> Any:
+        """
+        Abstract method returning the value stored under `key`, or `None` if it is missing or expired.
+
+        Args:
+            key (str): The cache key.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        """
+        Abstract method storing `value` under `key`.
+
+        Args:
+            key (str): The cache key.
+            value (Any): The response to store.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """
+        Abstract method removing every entry from the cache.
+        """
+        pass
+
+    def get(self, key: str) -> Any:
+        """
+        Looks up `key` and updates the hit/miss counters.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Any: The cached value, or `None` on a miss.
+        """
+        value = self.lookup(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The hit and miss counters and the resulting hit rate.
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class InMemoryCache(BaseCache):
+    """
+    A thread-safe, in-memory LRU cache.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept; the least recently used entry is evicted first.
+    """
+
+    max_size: int = 1024
+    _entries: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def lookup(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(BaseCache):
+    """
+    A persistent cache stored in a SQLite database, shared across processes and runs.
+
+    Attributes:
+        path (str): The path of the SQLite database file.
+        max_entries (Optional[int]): The maximum number of entries kept; the least recently used entries
+            are evicted first. `None` disables size-based eviction.
+    """
+
+    path: str = ".automind_cache.sqlite"
+    max_entries: Optional[int] = 100_000
+    _conn: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+
+    def lookup(self, key: str) -> Any:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self):
+        """
+        Closes the underlying database connection.
+        """
+        self._conn.close()
+
+
+class TieredCache(BaseCache):
+    """
+    A cache that checks several caches in order, typically a fast `InMemoryCache` in front of a `SQLiteCache`.
+    A hit in a slower tier is copied into the faster tiers before it is returned.
+
+    Attributes:
+        tiers (List[BaseCache]): The caches, from fastest to slowest.
+    """
+
+    tiers: List[Any]
+
+    def lookup(self, key: str) -> Any:
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster in self.tiers[:index]:
+                    faster.set(key, value)
+                return value
+        return None
+
+    def set(self, key: str, value: Any):
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["tiers"] = [tier.stats() for tier in self.tiers]
+        return stats
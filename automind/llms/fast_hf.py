@@ -1,5 +1,7 @@
 from automind.llms.base import BaseLLM
-from langchain_community.llms import VLLM
+from automind.llms.registry import model_registry
+from automind.llms.tokens import get_token_counter
+from typing import AsyncIterator, Iterator, List, Optional
 
 class VLLM_model(BaseLLM):
     """
@@ -13,12 +15,17 @@ class VLLM_model(BaseLLM):
 
     def build(self):
         """
-        Builds and initializes the Hugging Face language model using the provided configurations.
+        Builds and initializes the Hugging Face language model using the provided configurations. The engine
+        is shared with every identical wrapper, so the weights are loaded once per process. Automatic prefix
+        caching is enabled unless `enable_prefix_caching` is set to False in the configs, so the KV cache of
+        the static prompt prefixes is reused across requests.
 
         Returns:
             VLLM: The initialized language model instance.
         """
-        self.model = VLLM(
+        from langchain_community.llms import VLLM
+
+        self.model = model_registry.get_or_create(self, lambda: VLLM(
             model=self.hf_model_name,
             trust_remote_code=True,  # mandatory for HF models
             max_new_tokens=self.configs.get("max_new_tokens"),
@@ -27,24 +34,110 @@ class VLLM_model(BaseLLM):
             temperature=self.configs.get("temperature"),
             repetition_penalty=self.configs.get("repetition_penalty"),
             dtype=self.configs.get("dtype"),
-            vllm_kwargs=self.configs.get("vllm_kwargs")
-        )
+            vllm_kwargs={
+                "enable_prefix_caching": self.configs.get("enable_prefix_caching", True),
+                **(self.configs.get("vllm_kwargs") or {})
+            }
+        ))
 
         return self.model
 
-    def run(self, prompt: str):
+    def token_counter(self):
+        """
+        Returns:
+            TokenCounter: The counter using the model's own Hugging Face tokenizer.
+        """
+        return get_token_counter("hf", self.hf_model_name)
+
+    def resource(self) -> str:
+        """
+        Returns:
+            str: `gpu`, the scheduler resource of the vLLM engine.
+        """
+        return "gpu"
+
+    def llm_name(self) -> str:
+        """
+        Returns:
+            str: The name of the model, used to build cache keys.
+        """
+        return self.hf_model_name
+
+    def generate(self, prompt: str, stop: Optional[List[str]] = None):
         """
         Runs the language model with a given prompt. Builds the model if it is not already built.
 
         Args:
             prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
 
         Returns:
             str: The generated response from the model.
         """
         if not self.model:
             self.build()
-        return self.model.invoke(prompt)
+        return self.model.invoke(prompt, stop=stop)
+
+    def generate_batch(self, prompts: List[str], stop: Optional[List[str]] = None) -> List[str]:
+        """
+        Generates responses for several prompts in a single batched call to the underlying engine.
+
+        Args:
+            prompts (List[str]): The input prompts for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            List[str]: The generated responses, in the order of `prompts`.
+        """
+        if not self.model:
+            self.build()
+        return self.model.batch(prompts, stop=stop)
+
+    async def agenerate(self, prompt: str, stop: Optional[List[str]] = None):
+        """
+        Asynchronously runs the language model with a given prompt using the model's `ainvoke`.
+
+        Args:
+            prompt (str): The input text prompt to be processed by the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            str: The generated response from the model.
+        """
+        if not self.model:
+            self.build()
+        return await self.model.ainvoke(prompt, stop=stop)
+
+    def generate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Streams the generated text chunk by chunk.
+
+        Args:
+            prompt (str): The input prompt for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the generated text.
+        """
+        if not self.model:
+            self.build()
+        yield from self.model.stream(prompt, stop=stop)
+
+    async def agenerate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Asynchronously streams the generated text chunk by chunk.
+
+        Args:
+            prompt (str): The input prompt for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the generated text.
+        """
+        if not self.model:
+            self.build()
+        async for chunk in self.model.astream(prompt, stop=stop):
+            yield chunk
 
 
 
@@ -58,6 +151,7 @@ configs = {
     "temperature": 0.8,
     "repetition_penalty": 1.1,
     "dtype": "float16",
+    "enable_prefix_caching": True,         # reuse the KV cache of shared prompt prefixes
     "vllm_kwargs": {                      # add None if quantized models are not used
         "quantization": "awq"
     }
@@ -1,5 +1,6 @@
 from automind.llms.base import BaseLLM
-from langchain_google_genai import ChatGoogleGenerativeAI
+from automind.llms.registry import model_registry
+from typing import AsyncIterator, Iterator, List, Optional
 
 class Gemini_model(BaseLLM):
     """
@@ -13,30 +14,111 @@ class Gemini_model(BaseLLM):
 
     def build(self):
         """
-        Initializes the Google Generative AI model using the provided configuration.
+        Initializes the Google Generative AI model using the provided configuration, reusing the client
+        of an identical wrapper if one was already built.
 
         Returns:
             ChatGoogleGenerativeAI: The initialized Google Generative AI model instance.
         """
-        self.model = ChatGoogleGenerativeAI(
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        self.model = model_registry.get_or_create(self, lambda: ChatGoogleGenerativeAI(
             google_api_key=self.configs.get("google_api_key"),
             model=self.gemini_model_name,
             temperature=self.configs.get("temperature")
-        )
+        ))
 
         return self.model
+
+    def resource(self) -> str:
+        """
+        Returns:
+            str: `gemini`, the scheduler resource shared by every Gemini model.
+        """
+        return "gemini"
+
+    def llm_name(self) -> str:
+        """
+        Returns:
+            str: The name of the model, used to build cache keys.
+        """
+        return self.gemini_model_name
     
-    def run(self, prompt: str) -> str:
+    def generate(self, prompt: str, stop: Optional[List[str]] = None) -> str:
         """
         Runs the model with the given prompt and returns the response content.
 
         Args:
             prompt (str): The input prompt to send to the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            str: The response content from the model.
+        """
+        if not self.model:
+            self.build()
+        resp = self.model.invoke(prompt, stop=stop)
+        return resp.content
+
+    def generate_batch(self, prompts: List[str], stop: Optional[List[str]] = None) -> List[str]:
+        """
+        Runs the model on several prompts concurrently using the client's `batch`.
+
+        Args:
+            prompts (List[str]): The input prompts to send to the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            List[str]: The response contents, in the order of `prompts`.
+        """
+        if not self.model:
+            self.build()
+        return [resp.content for resp in self.model.batch(prompts, stop=stop)]
+
+    async def agenerate(self, prompt: str, stop: Optional[List[str]] = None) -> str:
+        """
+        Asynchronously runs the model with the given prompt using the client's native `ainvoke`.
+
+        Args:
+            prompt (str): The input prompt to send to the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
 
         Returns:
             str: The response content from the model.
         """
         if not self.model:
             self.build()
-        resp = self.model.invoke(prompt)
+        resp = await self.model.ainvoke(prompt, stop=stop)
         return resp.content
+
+    def generate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Streams the response content of the model chunk by chunk.
+
+        Args:
+            prompt (str): The input prompt to send to the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the response content.
+        """
+        if not self.model:
+            self.build()
+        for chunk in self.model.stream(prompt, stop=stop):
+            yield chunk.content
+
+    async def agenerate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Asynchronously streams the response content of the model chunk by chunk.
+
+        Args:
+            prompt (str): The input prompt to send to the model.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the response content.
+        """
+        if not self.model:
+            self.build()
+        async for chunk in self.model.astream(prompt, stop=stop):
+            yield chunk.content
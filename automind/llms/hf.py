@@ -1,5 +1,31 @@
 from automind.llms.base import BaseLLM
-from langchain_huggingface import HuggingFacePipeline
+from automind.llms.registry import model_registry
+from automind.llms.tokens import get_token_counter
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, Union
+
+
+def resolve_device(device: Union[int, str]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Translates a device setting into the `device` and `device_map` arguments of a Hugging Face pipeline.
+
+    Args:
+        device (Union[int, str]): A GPU index, `cuda`, `cuda:<index>`, `cpu` or `auto`.
+
+    Returns:
+        Tuple[Optional[int], Optional[str]]: The pipeline device index (-1 for CPU) and device map.
+    """
+    if isinstance(device, int):
+        return device, None
+    if device == "cpu":
+        return -1, None
+    if device == "auto":
+        return None, "auto"
+    if device == "cuda":
+        return 0, None
+    if device.startswith("cuda:"):
+        return int(device.split(":", 1)[1]), None
+    raise ValueError(f"Unsupported device {device!r}. Use a GPU index, 'cuda:<index>', 'cpu' or 'auto'.")
+
 
 class AnyhfLLM(BaseLLM):
     """
@@ -8,22 +34,31 @@ class AnyhfLLM(BaseLLM):
 
     Attributes:
         hf_model_name (str): The name of the Hugging Face model to be used.
+        device (Union[int, str]): Where the model runs: a GPU index, `cuda:<index>`, `cpu`, or `auto` to spread
+            the weights over the available devices.
     """
 
     hf_model_name: str
+    device: Union[int, str] = 0
 
     def build(self):
         """
         Builds and initializes the Hugging Face model pipeline with the specified model ID 
-        and configurations.
+        and configurations. The pipeline is shared with every identical wrapper, so the weights
+        are loaded once per process.
 
         Returns:
             HuggingFacePipeline: An initialized Hugging Face model pipeline.
         """
-        self.model = HuggingFacePipeline.from_model_id(
+        from langchain_huggingface import HuggingFacePipeline
+
+        device, device_map = resolve_device(self.device)
+        self.model = model_registry.get_or_create(self, lambda: HuggingFacePipeline.from_model_id(
             model_id=self.hf_model_name, 
             task="text-generation",
-            device=0,
+            device=device,
+            device_map=device_map,
+            batch_size=self.configs.get("batch_size", 4),
             pipeline_kwargs={
                 "temperature": self.configs.get("temperature"),
                 "max_new_tokens": self.configs.get("max_new_tokens"),
@@ -31,21 +66,106 @@ class AnyhfLLM(BaseLLM):
                 "top_p": self.configs.get("top_p"),
                 "repetition_penalty": self.configs.get("repetition_penalty")
             }
-        )
+        ))
         
         return self.model
 
-    def run(self, prompt):
+    def token_counter(self):
+        """
+        Returns:
+            TokenCounter: The counter using the model's own Hugging Face tokenizer.
+        """
+        return get_token_counter("hf", self.hf_model_name)
+
+    def resource(self) -> str:
+        """
+        Returns:
+            str: `cpu` for a model running on the CPU (`cpu` or the pipeline index -1), `gpu` otherwise.
+        """
+        device, _ = resolve_device(self.device)
+        return "cpu" if device == -1 else "gpu"
+
+    def llm_name(self) -> str:
+        """
+        Returns:
+            str: The name of the model, used to build cache keys.
+        """
+        return self.hf_model_name
+
+    def generate(self, prompt, stop: Optional[List[str]] = None):
         """
         Runs the model pipeline to generate text based on the provided prompt.
 
         Args:
             prompt (str): The input prompt for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
 
         Returns:
             str: The generated text response from the model.
         """
         if not self.model:
             self.build()
-        resp = self.model.invoke(prompt)
+        resp = self.model.invoke(prompt, stop=stop)
         return resp
+
+    def generate_batch(self, prompts: List[str], stop: Optional[List[str]] = None) -> List[str]:
+        """
+        Generates responses for several prompts in a single batched call to the underlying engine.
+
+        Args:
+            prompts (List[str]): The input prompts for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            List[str]: The generated responses, in the order of `prompts`.
+        """
+        if not self.model:
+            self.build()
+        return self.model.batch(prompts, stop=stop)
+
+    async def agenerate(self, prompt, stop: Optional[List[str]] = None):
+        """
+        Asynchronously runs the model pipeline using the pipeline's `ainvoke`.
+
+        Args:
+            prompt (str): The input prompt for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Returns:
+            str: The generated text response from the model.
+        """
+        if not self.model:
+            self.build()
+        resp = await self.model.ainvoke(prompt, stop=stop)
+        return resp
+
+    def generate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Streams the generated text chunk by chunk.
+
+        Args:
+            prompt (str): The input prompt for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the generated text.
+        """
+        if not self.model:
+            self.build()
+        yield from self.model.stream(prompt, stop=stop)
+
+    async def agenerate_stream(self, prompt: str, stop: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """
+        Asynchronously streams the generated text chunk by chunk.
+
+        Args:
+            prompt (str): The input prompt for the model to generate text from.
+            stop (Optional[List[str]]): Sequences at which the generation stops.
+
+        Yields:
+            str: The successive chunks of the generated text.
+        """
+        if not self.model:
+            self.build()
+        async for chunk in self.model.astream(prompt, stop=stop):
+            yield chunk
@@ -0,0 +1,117 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, Callable, Dict, Iterable, Optional
+import hashlib
+import json
+import threading
+
+
+def model_key(llm: Any) -> str:
+    """
+    Builds the key identifying the model an LLM wrapper builds: its class and every setting (model name,
+    configs, device, ...), excluding the built model and the response cache.
+
+    Args:
+        llm (BaseLLM): The LLM wrapper.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    kls = type(llm)
+    payload = json.dumps(
+        {"kls": f"{kls.__module__}.{kls.__qualname__}", "settings": llm.model_dump(exclude={"model", "cache", "shared"})},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ModelRegistry(BaseModel):
+    """
+    A process-wide pool of built models, so that LLM wrappers with the same class, model name and configs share
+    a single client or a single copy of the weights.
+
+    Concurrent builds of the same model are coalesced: the first caller loads it while the others wait for it.
+
+    Attributes:
+        builds (int): The number of models actually built.
+        reuses (int): The number of builds served with an already built model.
+    """
+
+    builds: int = 0
+    reuses: int = 0
+    _models: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _building: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def get_or_create(self, llm: Any, create: Callable[[], Any]) -> Any:
+        """
+        Returns the model of an LLM wrapper, creating it with `create` if no identical wrapper built it yet.
+
+        Args:
+            llm (BaseLLM): The LLM wrapper.
+            create (Callable[[], Any]): The function loading the model.
+
+        Returns:
+            Any: The shared model.
+        """
+        if not getattr(llm, "shared", True):
+            return create()
+
+        key = model_key(llm)
+        with self._lock:
+            if key in self._models:
+                self.reuses += 1
+                return self._models[key]
+            lock = self._building.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._lock:
+                if key in self._models:
+                    self.reuses += 1
+                    return self._models[key]
+            model = create()
+            with self._lock:
+                self._models[key] = model
+                self._building.pop(key, None)
+                self.builds += 1
+            return model
+
+    def release(self, llm: Any) -> bool:
+        """
+        Drops the shared model of an LLM wrapper, so that it can be garbage collected once no wrapper uses it.
+
+        Args:
+            llm (BaseLLM): The LLM wrapper.
+
+        Returns:
+            bool: Whether a model was registered for it.
+        """
+        with self._lock:
+            return self._models.pop(model_key(llm), None) is not None
+
+    def clear(self):
+        """
+        Drops every shared model.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self):
+        return len(self._models)
+
+
+model_registry = ModelRegistry()
+
+
+def warmup(llms: Iterable[Any], prompt: Optional[str] = None):
+    """
+    Builds models ahead of the first request, e.g. at application startup, so the first agent run does not pay
+    for loading weights or creating clients.
+
+    Args:
+        llms (Iterable[BaseLLM]): The LLM wrappers to build.
+        prompt (Optional[str]): A short prompt run once on each model, to also trigger lazy initialization inside
+            the engine (CUDA context, kernel compilation, connection setup).
+    """
+    for llm in llms:
+        llm.warmup(prompt)
@@ -0,0 +1,206 @@
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+from typing import Any, Dict, List, Optional
+from abc import abstractmethod
+from collections import OrderedDict
+from automind.events import WARNING, emit
+import threading
+
+
+class TokenCounter(BaseModel):
+    """
+    A base class for token counters.
+
+    Counts are memoized in an LRU cache keyed on the text, so segments that recur in every prompt (instructions,
+    tool catalog, backstory) are only tokenized once.
+
+    Attributes:
+        cache_size (int): The maximum number of texts whose count is cached.
+        max_cached_chars (int): Texts longer than this are counted without being cached.
+    """
+
+    cache_size: int = 4096
+    max_cached_chars: int = 200_000
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @abstractmethod
+    def encode(self, text: str) -> List[int]:
+        """
+        Abstract method tokenizing a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            List[int]: The token ids.
+        """
+        pass
+
+    @abstractmethod
+    def prefix(self, text: str, max_tokens: int) -> str:
+        """
+        Abstract method returning the beginning of a text that fits in a number of tokens.
+
+        Args:
+            text (str): The text.
+            max_tokens (int): The number of tokens.
+
+        Returns:
+            str: The longest beginning of the text of at most `max_tokens` tokens.
+        """
+        pass
+
+    def count(self, text: Any) -> int:
+        """
+        Counts the tokens of a text.
+
+        Args:
+            text (Any): The text to measure.
+
+        Returns:
+            int: The number of tokens.
+        """
+        text = str(text)
+        if len(text) > self.max_cached_chars:
+            return len(self.encode(text))
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+        count = len(self.encode(text))
+        with self._lock:
+            self._cache[text] = count
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return count
+
+    def truncate(self, text: str, max_tokens: int, marker: str = " ...[truncated]") -> str:
+        """
+        Shortens a text to at most `max_tokens` tokens, marker included.
+
+        Args:
+            text (str): The text.
+            max_tokens (int): The token budget.
+            marker (str): Appended to a shortened text.
+
+        Returns:
+            str: The text itself if it fits, otherwise its truncated beginning.
+        """
+        if self.count(text) <= max_tokens:
+            return text
+        keep = max_tokens - self.count(marker)
+        if keep <= 0:
+            return ""
+        return self.prefix(text, keep) + marker
+
+
+class CharTokenCounter(TokenCounter):
+    """
+    Estimates token counts from the number of characters, without any tokenizer. Used when no tokenizer is
+    available for a model.
+
+    Attributes:
+        chars_per_token (int): The assumed number of characters per token.
+    """
+
+    chars_per_token: int = 4
+
+    def encode(self, text: str) -> List[int]:
+        return list(range((len(text) + self.chars_per_token - 1) // self.chars_per_token))
+
+    def prefix(self, text: str, max_tokens: int) -> str:
+        return text[:max_tokens * self.chars_per_token]
+
+    def count(self, text: Any) -> int:
+        return (len(str(text)) + self.chars_per_token - 1) // self.chars_per_token
+
+
+class TiktokenCounter(TokenCounter):
+    """
+    Counts tokens with a `tiktoken` encoding.
+
+    Attributes:
+        encoding_name (str): The name of the encoding, e.g. `cl100k_base`.
+    """
+
+    encoding_name: str = "cl100k_base"
+    _encoding: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any):
+        import tiktoken
+
+        self._encoding = tiktoken.get_encoding(self.encoding_name)
+
+    def encode(self, text: str) -> List[int]:
+        return self._encoding.encode(text, disallowed_special=())
+
+    def prefix(self, text: str, max_tokens: int) -> str:
+        return self._encoding.decode(self.encode(text)[:max_tokens])
+
+
+class HFTokenCounter(TokenCounter):
+    """
+    Counts tokens with the tokenizer of a Hugging Face model.
+
+    Attributes:
+        model_name (str): The name of the Hugging Face model.
+    """
+
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_name: str
+    _tokenizer: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any):
+        from transformers import AutoTokenizer
+
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+
+    def encode(self, text: str) -> List[int]:
+        return self._tokenizer.encode(text, add_special_tokens=False)
+
+    def prefix(self, text: str, max_tokens: int) -> str:
+        return self._tokenizer.decode(self.encode(text)[:max_tokens])
+
+
+_counters: Dict[tuple, TokenCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_token_counter(kind: str = "tiktoken", name: Optional[str] = None) -> TokenCounter:
+    """
+    Returns the process-wide token counter of a tokenizer, creating it on first use. When the tokenizer
+    cannot be loaded (package missing, files not downloadable), a warning event is emitted and a
+    `CharTokenCounter` is returned instead.
+
+    Args:
+        kind (str): Either `tiktoken`, `hf` or `chars`.
+        name (Optional[str]): The tiktoken encoding or the Hugging Face model name.
+
+    Returns:
+        TokenCounter: The shared counter.
+    """
+    if kind == "tiktoken":
+        name = name or "cl100k_base"
+    key = (kind, name)
+    with _counters_lock:
+        if key in _counters:
+            return _counters[key]
+
+    try:
+        if kind == "tiktoken":
+            counter = TiktokenCounter(encoding_name=name)
+        elif kind == "hf":
+            counter = HFTokenCounter(model_name=name)
+        else:
+            counter = CharTokenCounter()
+    except (ImportError, OSError) as exc:
+        emit(
+            "token_counter_fallback",
+            "⚠️ Cannot load the {tokenizer} tokenizer, estimating tokens from characters: {error}\n",
+            level=WARNING, tokenizer=name, error=exc
+        )
+        counter = CharTokenCounter()
+
+    with _counters_lock:
+        return _counters.setdefault(key, counter)
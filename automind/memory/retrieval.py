@@ -0,0 +1,165 @@
+from pydantic import BaseModel
+from typing import Any, List
+from collections import Counter
+import math
+import re
+
+
+def chunk_text(text: str, max_chars: int) -> List[str]:
+    """
+    Splits a text into chunks of at most `max_chars` characters, preferably on paragraph boundaries.
+
+    Args:
+        text (str): The text to split.
+        max_chars (int): The maximum number of characters per chunk.
+
+    Returns:
+        List[str]: The non-empty chunks, in order.
+    """
+    chunks, current = [], ""
+    for paragraph in text.split("\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        while len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + len(paragraph) + 1 > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits a text into lowercase word tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        List[str]: The tokens.
+    """
+    return re.findall(r"\w+", text.lower())
+
+
+def bm25_scores(query: str, documents: List[str], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """
+    Scores documents against a query with Okapi BM25.
+
+    Args:
+        query (str): The query.
+        documents (List[str]): The documents to score.
+        k1 (float): The term frequency saturation parameter.
+        b (float): The document length normalization parameter.
+
+    Returns:
+        List[float]: The score of each document, in order.
+    """
+    docs = [Counter(tokenize(document)) for document in documents]
+    lengths = [sum(doc.values()) for doc in docs]
+    avg_length = sum(lengths) / len(docs) if docs else 0.0
+    terms = set(tokenize(query))
+    doc_freq = {term: sum(1 for doc in docs if term in doc) for term in terms}
+
+    scores = []
+    for doc, length in zip(docs, lengths):
+        score = 0.0
+        for term in terms:
+            freq = doc.get(term, 0)
+            if not freq:
+                continue
+            idf = math.log(1 + (len(docs) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += idf * freq * (k1 + 1) / (freq + k1 * (1 - b + b * length / (avg_length or 1.0)))
+        scores.append(score)
+    return scores
+
+
+class ObservationProcessor(BaseModel):
+    """
+    Shrinks long tool observations before they reach the prompt.
+
+    An observation longer than `max_chars` is split into chunks of `chunk_chars` characters, the chunks are
+    ranked against the current question and thought (with BM25, or by cosine similarity when an `embedder` is
+    given), and only the best matching chunks fitting in `max_chars` are kept, in their original order.
+
+    Attributes:
+        max_chars (int): The character budget of a processed observation. Shorter observations are passed through unchanged.
+        chunk_chars (int): The maximum number of characters per chunk.
+        embedder (Any): An optional object with a sentence-transformers compatible `encode` method, used
+            to rank chunks by embedding similarity instead of BM25.
+        separator (str): The text inserted between non-adjacent kept chunks.
+    """
+
+    max_chars: int = 3000
+    chunk_chars: int = 600
+    embedder: Any = None
+    separator: str = "\n...\n"
+
+    def rank(self, query: str, chunks: List[str]) -> List[float]:
+        """
+        Scores chunks against a query.
+
+        Args:
+            query (str): The question and current thought.
+            chunks (List[str]): The chunks to score.
+
+        Returns:
+            List[float]: The score of each chunk, in order.
+        """
+        if self.embedder is None:
+            return bm25_scores(query, chunks)
+
+        import numpy as np
+
+        vectors = np.asarray(self.embedder.encode([query] + chunks), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return list(vectors[1:] @ vectors[0])
+
+    def process(self, observation: Any, query: str) -> Any:
+        """
+        Keeps the passages of an observation most relevant to a query, within `max_chars`.
+
+        Args:
+            observation (Any): The tool result.
+            query (str): The question and current thought.
+
+        Returns:
+            Any: The observation itself when it fits in the budget, otherwise the selected passages.
+        """
+        text = str(observation)
+        if len(text) <= self.max_chars:
+            return observation
+
+        chunks = chunk_text(text, self.chunk_chars)
+        scores = self.rank(query, chunks)
+        order = sorted(
+            (index for index in range(len(chunks)) if scores[index] > 0),
+            key=lambda index: scores[index],
+            reverse=True
+        )
+        if not order:
+            # Nothing matches the query: keep the beginning, which usually summarizes the document.
+            order = list(range(len(chunks)))
+
+        kept, used = [], 0
+        for index in order:
+            cost = len(chunks[index]) + len(self.separator)
+            if used + cost > self.max_chars:
+                continue
+            kept.append(index)
+            used += cost
+
+        passages, previous = [], None
+        for index in sorted(kept):
+            if previous is not None and index != previous + 1:
+                passages.append(self.separator.strip("\n"))
+            passages.append(chunks[index])
+            previous = index
+        return "\n".join(passages)
@@ -0,0 +1,230 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+
+
+class ScratchpadStep(BaseModel):
+    """
+    A single Thought/Action/Observation step recorded in a scratchpad.
+
+    Attributes:
+        thought (str): The thought produced by the LLM.
+        action (str): The action text produced by the LLM, without its `Action:` label.
+        observation (str): The (possibly truncated or compacted) observation returned by the tool.
+        original_tokens (int): The token count of the step before any truncation or compaction.
+        tokens (int): The current token count of the step.
+        compacted (bool): Whether the observation has been summarized or shortened as an older step.
+    """
+
+    thought: Optional[str] = None
+    action: Optional[str] = None
+    observation: str = ""
+    original_tokens: int = 0
+    tokens: int = 0
+    compacted: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        """
+        Returns:
+            int: The number of tokens this step no longer sends to the LLM.
+        """
+        return self.original_tokens - self.tokens
+
+    def render(self) -> str:
+        """
+        Renders the step in the Thought/Action/Observation format used by the prompts.
+
+        Returns:
+            str: The rendered step.
+        """
+        return f"Thought: {self.thought}\nAction:\n{self.action}\nObservation: {self.observation}\n"
+
+
+class Scratchpad(BaseModel):
+    """
+    A bounded scratchpad for iterative agents.
+
+    Every observation is truncated to `max_observation_chars`. Whenever the rendered scratchpad exceeds
+    `max_tokens`, observations of steps older than the `keep_recent` most recent ones are compacted (with
+    `summarizer` if one is given, otherwise by truncation to `compacted_observation_chars`), and if that is
+    still not enough the oldest steps are evicted. The most recent steps are always kept verbatim.
+
+    Attributes:
+        max_tokens (Optional[int]): The token budget of the rendered scratchpad. `None` disables compaction.
+        max_observation_chars (Optional[int]): The maximum characters kept per observation. `None` disables truncation.
+        keep_recent (int): The number of most recent steps that are never compacted nor evicted.
+        compacted_observation_chars (int): The characters kept per observation when an older step is compacted.
+        summarizer (Any): An optional callable `summarizer(text) -> str` used to compact older observations.
+        token_counter (Any): An optional `automind.llms.tokens.TokenCounter` measuring the steps. Defaults to an
+            estimate of four characters per token.
+        steps (List[ScratchpadStep]): The recorded steps.
+        evicted (int): The number of steps evicted so far.
+        evicted_tokens (int): The original token count of the evicted steps.
+    """
+
+    max_tokens: Optional[int] = 3000
+    max_observation_chars: Optional[int] = 8000
+    keep_recent: int = 2
+    compacted_observation_chars: int = 500
+    summarizer: Any = None
+    token_counter: Any = None
+    steps: List[ScratchpadStep] = Field(default_factory=list)
+    evicted: int = 0
+    evicted_tokens: int = 0
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Counts the tokens of a text with `token_counter`, or estimates them assuming roughly four characters
+        per token.
+
+        Args:
+            text (str): The text to measure.
+
+        Returns:
+            int: The number of tokens.
+        """
+        if self.token_counter is not None:
+            return self.token_counter.count(text)
+        return (len(text) + 3) // 4
+
+    def add(self, thought: Optional[str], action: Optional[str], observation: Any) -> ScratchpadStep:
+        """
+        Records a new step, truncating its observation and compacting older steps to stay within budget.
+
+        Args:
+            thought (Optional[str]): The thought produced by the LLM.
+            action (Optional[str]): The action text produced by the LLM.
+            observation (Any): The result returned by the tool.
+
+        Returns:
+            ScratchpadStep: The recorded step.
+        """
+        observation = str(observation)
+        step = ScratchpadStep(thought=thought, action=action, observation=observation)
+        step.original_tokens = self.count_tokens(step.render())
+
+        if self.max_observation_chars is not None and len(observation) > self.max_observation_chars:
+            step.observation = observation[:self.max_observation_chars] + " ...[truncated]"
+        step.tokens = self.count_tokens(step.render())
+
+        self.steps.append(step)
+        self.compact()
+        return step
+
+    def compact(self, max_tokens: Optional[int] = None):
+        """
+        Compacts and then evicts older steps until the scratchpad fits in `max_tokens`.
+
+        Args:
+            max_tokens (Optional[int]): The token budget. Defaults to the scratchpad's `max_tokens`.
+        """
+        max_tokens = max_tokens if max_tokens is not None else self.max_tokens
+        if max_tokens is None:
+            return
+
+        older = len(self.steps) - self.keep_recent
+        for step in self.steps[:max(older, 0)]:
+            if self.total_tokens <= max_tokens:
+                return
+            if not step.compacted:
+                self.compact_step(step)
+
+        while self.total_tokens > max_tokens and len(self.steps) > self.keep_recent:
+            step = self.steps.pop(0)
+            self.evicted += 1
+            self.evicted_tokens += step.original_tokens
+
+    def compact_step(self, step: ScratchpadStep):
+        """
+        Shortens the observation of an older step, with `summarizer` if available.
+
+        Args:
+            step (ScratchpadStep): The step to compact.
+        """
+        if self.summarizer is not None:
+            step.observation = str(self.summarizer(step.observation))
+        elif len(step.observation) > self.compacted_observation_chars:
+            step.observation = step.observation[:self.compacted_observation_chars] + " ...[compacted]"
+        step.compacted = True
+        step.tokens = self.count_tokens(step.render())
+
+    def fit(self, max_tokens: int):
+        """
+        Shrinks the scratchpad to at most `max_tokens` tokens, e.g. to keep a prompt within the model's context.
+        Content is given up in priority order: older steps are compacted then evicted, then the observations of
+        the recent steps are shortened, and finally the recent steps themselves are evicted, oldest first.
+
+        Args:
+            max_tokens (int): The token budget.
+        """
+        max_tokens = max(max_tokens, 0)
+        self.compact(max_tokens)
+
+        for step in self.steps:
+            excess = self.total_tokens - max_tokens
+            if excess <= 0:
+                return
+            allowed = max(self.count_tokens(step.observation) - excess, 0)
+            if self.token_counter is not None:
+                step.observation = self.token_counter.truncate(step.observation, allowed, marker=" ...[trimmed]")
+            else:
+                step.observation = step.observation[:allowed * 4] + " ...[trimmed]"
+            step.compacted = True
+            step.tokens = self.count_tokens(step.render())
+
+        while self.total_tokens > max_tokens and self.steps:
+            step = self.steps.pop(0)
+            self.evicted += 1
+            self.evicted_tokens += step.original_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        """
+        Returns:
+            int: The token count of the rendered scratchpad.
+        """
+        return sum(step.tokens for step in self.steps)
+
+    @property
+    def tokens_saved(self) -> int:
+        """
+        Returns:
+            int: The total number of tokens saved by truncation, compaction and eviction.
+        """
+        return sum(step.tokens_saved for step in self.steps) + self.evicted_tokens
+
+    def report(self) -> List[dict]:
+        """
+        Reports the token usage of each retained step.
+
+        Returns:
+            List[dict]: For each step, its original and current token counts, the tokens saved and
+            whether it was compacted.
+        """
+        return [
+            {
+                "original_tokens": step.original_tokens,
+                "tokens": step.tokens,
+                "tokens_saved": step.tokens_saved,
+                "compacted": step.compacted,
+            }
+            for step in self.steps
+        ]
+
+    def render(self) -> str:
+        """
+        Renders the scratchpad for inclusion in the prompt.
+
+        Returns:
+            str: The rendered steps, preceded by a note when older steps were evicted.
+        """
+        header = f"[{self.evicted} earlier step(s) omitted]\n" if self.evicted else ""
+        return header + "".join(step.render() for step in self.steps)
+
+    def clear(self):
+        """
+        Removes every recorded step.
+        """
+        self.steps = []
+        self.evicted = 0
+        self.evicted_tokens = 0
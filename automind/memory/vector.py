@@ -0,0 +1,229 @@
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, Dict, List, Optional
+from automind.memory.retrieval import chunk_text
+import numpy as np
+import json
+import os
+import threading
+
+
+class MemoryHit(BaseModel):
+    """
+    A snippet retrieved from the memory.
+
+    Attributes:
+        text (str): The stored snippet.
+        score (float): The cosine similarity between the snippet and the query.
+        source (Optional[str]): Where the snippet comes from, e.g. the tool call or the question it answered.
+        kind (str): Either `observation` or `answer`.
+        key (Optional[str]): The key of the tool call that produced the snippet (see
+            `automind.actions.executor.action_key`), if any.
+    """
+
+    text: str
+    score: float
+    source: Optional[str] = None
+    kind: str = "observation"
+    key: Optional[str] = None
+
+
+class VectorMemory(BaseModel):
+    """
+    A long-term memory of past observations and final answers, stored as normalized sentence embeddings
+    and searched by brute-force cosine similarity.
+
+    When `path` is set, the embeddings are appended to a raw float32 file that is memory-mapped for search,
+    and the snippets to a JSON lines file, so the memory persists across runs without loading it in RAM.
+
+    Observations are stored under the key of the tool call that produced them, and `recall` returns them
+    only for a call with the same key. Recalling by similarity alone, which may match a different call with
+    a similar query, is opt-in: it is only done when `threshold` is set.
+
+    Attributes:
+        path (Optional[str]): The directory holding the index. `None` keeps the memory in RAM only.
+        embedding_model (str): The `sentence-transformers` model used to embed snippets.
+        embedder (Any): The embedding model instance, built lazily. Any object with a
+            sentence-transformers compatible `encode` method can be given instead.
+        top_k (int): The maximum number of snippets returned by `recall`.
+        threshold (Optional[float]): The minimum similarity for a snippet of another call, or of a final answer,
+            to count as a memory hit. `None` only recalls the observations of the same call.
+        chunk_chars (int): The maximum number of characters per stored snippet.
+    """
+
+    path: Optional[str] = None
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedder: Any = None
+    top_k: int = 3
+    threshold: Optional[float] = None
+    chunk_chars: int = 1000
+    _vectors: Any = PrivateAttr(default=None)
+    _records: List[dict] = PrivateAttr(default_factory=list)
+    _keys: Dict[str, List[int]] = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any):
+        if self.path is not None:
+            os.makedirs(self.path, exist_ok=True)
+            self.load()
+
+    @property
+    def vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    @property
+    def records_path(self) -> str:
+        return os.path.join(self.path, "records.jsonl")
+
+    def build(self):
+        """
+        Loads the sentence-transformers embedding model.
+
+        Returns:
+            SentenceTransformer: The embedding model.
+        """
+        from sentence_transformers import SentenceTransformer
+
+        self.embedder = SentenceTransformer(self.embedding_model)
+        return self.embedder
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embeds texts into L2-normalized float32 vectors.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            np.ndarray: A `(len(texts), dim)` array.
+        """
+        if self.embedder is None:
+            self.build()
+        vectors = np.asarray(self.embedder.encode(texts), dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def load(self):
+        """
+        Memory-maps the index stored in `path`, if any.
+        """
+        if not os.path.exists(self.records_path) or not os.path.exists(self.vectors_path):
+            return
+        with open(self.records_path, encoding="utf-8") as records:
+            self._records = [json.loads(line) for line in records if line.strip()]
+        self._keys = {}
+        for index, record in enumerate(self._records):
+            self.index_key(record, index)
+        if self._records:
+            dim = os.path.getsize(self.vectors_path) // (4 * len(self._records))
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._records), dim))
+
+    def index_key(self, record: dict, index: int):
+        """
+        Indexes the snippet at `index` under the key of its tool call. The first snippet of an observation
+        replaces the snippets stored before for the same call.
+        """
+        key = record.get("key")
+        if key is None:
+            return
+        if record.get("chunk", 0) == 0:
+            self._keys[key] = []
+        self._keys[key].append(index)
+
+    def add(self, texts: List[str], source: Optional[str] = None, kind: str = "observation", key: Optional[str] = None):
+        """
+        Embeds and stores snippets.
+
+        Args:
+            texts (List[str]): The snippets to store.
+            source (Optional[str]): Where the snippets come from.
+            kind (str): Either `observation` or `answer`.
+            key (Optional[str]): The key of the tool call the snippets come from.
+        """
+        texts = [text for text in texts if text.strip()]
+        if not texts:
+            return
+        vectors = self.embed(texts)
+        records = [{"text": text, "source": source, "kind": kind, "key": key, "chunk": chunk} for chunk, text in enumerate(texts)]
+
+        with self._lock:
+            for record in records:
+                self._records.append(record)
+                self.index_key(record, len(self._records) - 1)
+            if self.path is None:
+                self._vectors = vectors if self._vectors is None else np.vstack([self._vectors, vectors])
+                return
+
+            with open(self.vectors_path, "ab") as out:
+                out.write(vectors.tobytes())
+            with open(self.records_path, "a", encoding="utf-8") as out:
+                out.writelines(json.dumps(record) + "\n" for record in records)
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._records), vectors.shape[1])
+            )
+
+    def add_observation(self, query: str, observation: Any, key: Optional[str] = None):
+        """
+        Stores a tool observation, split into snippets of at most `chunk_chars` characters.
+
+        Args:
+            query (str): A description of the tool call that produced the observation.
+            observation (Any): The tool result.
+            key (Optional[str]): The key of the tool call, under which `recall` finds the observation.
+        """
+        self.add(chunk_text(str(observation), self.chunk_chars), source=query, kind="observation", key=key)
+
+    def add_answer(self, question: str, answer: Any):
+        """
+        Stores the final answer given to a question.
+
+        Args:
+            question (str): The question.
+            answer (Any): The final answer.
+        """
+        self.add([f"Question: {question}\nAnswer: {answer}"], source=question, kind="answer")
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[MemoryHit]:
+        """
+        Returns the snippets most similar to a query.
+
+        Args:
+            query (str): The query.
+            top_k (Optional[int]): The number of snippets to return. Defaults to `top_k`.
+
+        Returns:
+            List[MemoryHit]: The snippets, most similar first.
+        """
+        top_k = top_k or self.top_k
+        with self._lock:
+            vectors, records = self._vectors, list(self._records)
+        if vectors is None or not records:
+            return []
+
+        scores = np.asarray(vectors[:len(records)] @ self.embed([query])[0])
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [MemoryHit(score=float(scores[index]), **records[index]) for index in best]
+
+    def recall(self, query: str, key: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the first `top_k` snippets of the observation stored for the tool call `key`. Without one, and
+        only if `threshold` is set, returns the top snippets whose similarity to the query reaches it.
+
+        Args:
+            query (str): The query.
+            key (Optional[str]): The key of the tool call.
+
+        Returns:
+            Optional[str]: The relevant snippets formatted as an observation, or None on a memory miss.
+        """
+        with self._lock:
+            hits = [MemoryHit(score=1.0, **self._records[index]) for index in self._keys.get(key, [])[:self.top_k]]
+        if not hits and self.threshold is not None:
+            hits = [hit for hit in self.search(query) if hit.score >= self.threshold]
+        if not hits:
+            return None
+        return "\n\n".join(f"[Memory: {hit.source}]\n{hit.text}" for hit in hits)
+
+    def __len__(self):
+        return len(self._records)
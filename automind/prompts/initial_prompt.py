@@ -1,14 +1,16 @@
-def generate_initial_prompt(question, actions, backstory):
-    prompt = f"""
-    You are a helpful assistant with access to the following actions:
+from automind.actions.registry import get_registry
+import functools
 
-    Available actions , Choose the most relevant action(s) to answer users query:
-    {[action.get_tool_info() for action in actions]}
 
-    You have the following backstory:
-    {backstory}
+@functools.lru_cache(maxsize=128)
+def render_initial_prefix(catalog, backstory, parallel):
+    parallel_note = """
+    If answering the query needs several independent actions (for example searching both Wikipedia and the web),
+    you may instead return a JSON list of action objects in the same format. They will be executed in parallel.
+    """ if parallel else ""
 
-    To assist with the user's request, provide a single response in the following format:
+    return f"""
+    You are a helpful assistant. To assist with the user's request, provide a single response in the following format:
 
     <output>
     ```json
@@ -16,8 +18,7 @@ def generate_initial_prompt(question, actions, backstory):
         "name": "<relevant_action_name>",
         "arguments": {{
             "query": "<query_from_user>",
-            "type": "<data_type_of_query>",
-            "module":"<module_name>"
+            "type": "<data_type_of_query>"
         }}
     }}
     ```
@@ -32,13 +33,12 @@ def generate_initial_prompt(question, actions, backstory):
         "name": "WikiSearch",
         "arguments": {{
             "query": "What is capital of France",
-            "type": "str",
-            "module":"automind.actions.tools.wikisearch"
+            "type": "str"
         }}
     }}
     ```
     </output>
-
+    {parallel_note}
 
     Guidelines:
     1. If no action matches the user's request, respond politely that you cannot help.
@@ -47,6 +47,25 @@ def generate_initial_prompt(question, actions, backstory):
     4. Replace <relevant_action_name> with the name of the action being used.
     5. Only provide a single JSON output response, and ensure it's enclosed within <output></output> delimiters.
 
+    Available actions , Choose the most relevant action(s) to answer users query:
+    {catalog}
+
+    You have the following backstory:
+    {backstory}
+    """
+
+
+def initial_prompt_prefix(actions, backstory, parallel=False):
+    """
+    Returns the static beginning of the initial prompt: the format instructions, the action catalog and the
+    backstory, shared by every query so that prefix caches can reuse it. It is rendered once per action set
+    and backstory.
+    """
+    return render_initial_prefix(get_registry(actions).catalog, backstory, parallel)
+
+
+def generate_initial_prompt(question, actions, backstory, parallel=False):
+    prompt = initial_prompt_prefix(actions, backstory, parallel) + f"""
     -- User Query:
     {question}
     """
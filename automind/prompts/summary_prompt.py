@@ -6,3 +6,19 @@ def summary_prompt(response):
     {response}
     """
     return prompt
+
+
+def fused_summary_prompt(prompt, response, observation):
+    """
+    Continues the tool selection call with the tool output, so that the summary is generated as the same
+    conversation: the beginning of the prompt, already processed by the model, can be served from its prefix
+    cache instead of being encoded again.
+    """
+    return f"""{prompt}{response}</output>
+
+    -- Action Output:
+    {observation}
+
+    Now summarize the action output above into bullet points answering the user query, providing only the title, link, and a brief summary of the body for each item.
+    Do not include any additional text—only the bullet points.
+    """
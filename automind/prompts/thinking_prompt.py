@@ -1,30 +1,33 @@
-def generate_thinking_prompt(question, actions, backstory, agent_scratchpad):
-    prompt = f"""
-    You are a helpful assistant with the following backstory:
-    {backstory}
+from automind.actions.registry import get_registry
+import functools
 
-    Answer the following question as best you can:
-    {question}
+
+@functools.lru_cache(maxsize=128)
+def render_thinking_prefix(catalog, names, backstory, parallel):
+    if parallel:
+        action_rule = "The $JSON_BLOB may contain a list of independent actions when several tools are needed for the same step. They are executed in parallel and their observations are returned together."
+    else:
+        action_rule = "The $JSON_BLOB should only contain a SINGLE action, do NOT return a list of multiple actions."
+
+    return f"""
+    You are a helpful assistant. You answer questions by reasoning step by step and using tools.
 
     You have access to the following tools:
-    {[action.get_tool_info() for action in actions]}
+    {catalog}
 
     The way you use the tools is by specifying a JSON blob.
     Specifically, this JSON should have a `name` key (with the name of the tool to use), and an `arguments` key (which contains an object with the required inputs for the tool).
 
-    The only values that should be in the "name" field are: {', '.join([action.__name__ for action in actions])}
-
-    Additionally, for each tool, you must provide the `module` where the tool is located in the `arguments` field. This is essential for the execution context.
+    The only values that should be in the "name" field are: {names}
 
-    The $JSON_BLOB should only contain a SINGLE action, do NOT return a list of multiple actions. Below is a detailed example of a valid $JSON_BLOB:
+    {action_rule} Below is a detailed example of a valid $JSON_BLOB:
 
     ```json
     {{
         "name": "<ToolName>",
         "arguments": {{
             "query": "<Input query>",
-            "type": "<Input type>",
-            "module": "<Full module path of the tool>"
+            "type": "<Input type>"
         }}
     }}
     ```
@@ -35,8 +38,7 @@ def generate_thinking_prompt(question, actions, backstory, agent_scratchpad):
         "name": "WikiSearch",
         "arguments": {{
             "query": "What is the capital of France?",
-            "type": "str",
-            "module": "automind.actions.tools.wikisearch"
+            "type": "str"
         }}
     }}
     ```
@@ -47,8 +49,7 @@ def generate_thinking_prompt(question, actions, backstory, agent_scratchpad):
         "name": "Calculator",
         "arguments": {{
             "query": "5 + 3",
-            "type": "str",
-            "module": "automind.actions.tools.calculator"
+            "type": "str"
         }}
     }}
     ```
@@ -65,7 +66,34 @@ def generate_thinking_prompt(question, actions, backstory, agent_scratchpad):
     Final Answer: the final answer to the original input question
     Begin! Reminder to always use the exact characters `Final Answer` when responding.
 
+    Your backstory:
+    {backstory}
+    """
+
+
+def thinking_prompt_prefix(actions, backstory, parallel=False):
+    """
+    Returns the static beginning of the thinking prompt: the instructions, the tool catalog and the backstory.
+
+    It is identical for every question asked with the same tools and backstory, so provider and vLLM prefix
+    caches can reuse its KV cache across questions and agents. It is rendered once per tool set and backstory.
+    """
+    registry = get_registry(actions)
+    return render_thinking_prefix(registry.catalog, registry.names, backstory, parallel)
+
+
+def generate_thinking_prompt(question, actions, backstory, agent_scratchpad, parallel=False, final=False):
+    final_note = """
+    You have used all the available actions. Do not call any tool: respond now with
+    Thought: I now know the final answer
+    Final Answer: the final answer to the original input question, based on your previous work.
+    """ if final else ""
+
+    prompt = thinking_prompt_prefix(actions, backstory, parallel) + f"""
+    Answer the following question as best you can:
+    Question: {question}
+
     This is your previous work:
     {agent_scratchpad}
-    """
+    {final_note}"""
     return prompt
@@ -0,0 +1,624 @@
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Callable, Dict, List, Optional
+from contextlib import asynccontextmanager, contextmanager
+from automind.actions.http import TokenBucket
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a run scheduled with a deadline is still waiting or working once the deadline has passed.
+    """
+
+
+class RunCancelled(Exception):
+    """
+    Raised in a run that was cancelled with `Run.cancel`.
+    """
+
+
+class QueueFull(RuntimeError):
+    """
+    Raised when a resource already has `max_queue` waiting requests, so that callers shed load instead of
+    queueing without bound.
+    """
+
+
+class Run(BaseModel):
+    """
+    The scheduling state of one agent run: its priority, its deadline and whether it was cancelled.
+
+    Attributes:
+        priority (int): The priority of the run's requests. Waiting requests with a higher priority are served
+            first.
+        timeout (Optional[float]): The number of seconds the run may take, or None for no deadline.
+        started (float): The `time.monotonic()` at which the run started.
+        cancelled (bool): Whether the run was cancelled.
+    """
+
+    priority: int = 0
+    timeout: Optional[float] = None
+    started: float = Field(default_factory=time.monotonic)
+    cancelled: bool = False
+    _listeners: List[Callable[[], Any]] = PrivateAttr(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """
+        The `time.monotonic()` at which the run expires, or None.
+        """
+        return None if self.timeout is None else self.started + self.timeout
+
+    def remaining(self) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: The number of seconds left before the deadline (0 once it has passed), or None
+            without a deadline.
+        """
+        if self.timeout is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def stopped(self) -> bool:
+        """
+        Returns:
+            bool: Whether the run was cancelled or has passed its deadline.
+        """
+        return self.cancelled or self.remaining() == 0.0
+
+    def error(self) -> Exception:
+        """
+        Returns:
+            Exception: The error reported by a stopped run.
+        """
+        if self.cancelled:
+            return RunCancelled("The run was cancelled.")
+        return DeadlineExceeded(f"The run exceeded its deadline of {self.timeout}s.")
+
+    def check(self):
+        """
+        Raises:
+            RunCancelled: If the run was cancelled.
+            DeadlineExceeded: If the run has passed its deadline.
+        """
+        if self.stopped():
+            raise self.error()
+
+    def cancel(self):
+        """
+        Cancels the run: its waiting requests are woken up and fail, and the LLM call in progress is abandoned.
+        """
+        with self._lock:
+            self.cancelled = True
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def listen(self, listener: Callable[[], Any]):
+        """
+        Registers a callable invoked, from the cancelling thread, when the run is cancelled.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+        if self.cancelled:
+            listener()
+
+    def unlisten(self, listener: Callable[[], Any]):
+        """
+        Removes a callable registered with `listen`.
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
+class Waiter(BaseModel):
+    """
+    A request waiting for a slot of a `Resource`.
+
+    Attributes:
+        wake (Any): The callable waking the waiting thread or coroutine up.
+        since (float): The `time.monotonic()` at which the request started waiting.
+        granted (bool): Whether a slot was handed over to the request.
+        abandoned (bool): Whether the request stopped waiting (deadline or cancellation).
+    """
+
+    wake: Any
+    since: float = Field(default_factory=time.monotonic)
+    granted: bool = False
+    abandoned: bool = False
+
+
+class Resource(BaseModel):
+    """
+    A limited upstream (an LLM backend, a GPU, a search API): a semaphore whose waiting requests are served by
+    priority, then in arrival order, with an optional rate limit and backpressure metrics.
+
+    Attributes:
+        name (str): The resource name.
+        limit (int): The maximum number of requests in flight.
+        rate (Optional[float]): The maximum number of requests started per second, or None.
+        max_queue (Optional[int]): The maximum number of waiting requests. Further requests raise `QueueFull`.
+        in_flight (int): The number of requests holding a slot.
+        queued (int): The number of requests waiting for a slot.
+        peak_queued (int): The highest number of waiting requests seen.
+        acquired (int): The number of slots handed out.
+        rejected (int): The number of requests refused because the queue was full.
+        expired (int): The number of requests that stopped waiting because their run expired or was cancelled.
+        total_wait (float): The number of seconds requests spent waiting, in total.
+        max_wait (float): The longest wait, in seconds.
+    """
+
+    name: str
+    limit: int
+    rate: Optional[float] = None
+    max_queue: Optional[int] = None
+    in_flight: int = 0
+    queued: int = 0
+    peak_queued: int = 0
+    acquired: int = 0
+    rejected: int = 0
+    expired: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    _queue: List[Any] = PrivateAttr(default_factory=list)
+    _order: Any = PrivateAttr(default_factory=itertools.count)
+    _bucket: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any):
+        if self.rate is not None:
+            self._bucket = TokenBucket(rate=self.rate, capacity=1.0)
+
+    def enqueue(self, run: Run, wake: Callable[[], Any]) -> Optional[Waiter]:
+        """
+        Takes a free slot, or queues the request when none is free.
+
+        Args:
+            run (Run): The run of the request.
+            wake (Callable[[], Any]): Wakes the request up once it has been granted a slot.
+
+        Returns:
+            Optional[Waiter]: None if a slot was taken, otherwise the queued request.
+
+        Raises:
+            QueueFull: If `max_queue` requests are already waiting.
+        """
+        with self._lock:
+            if self.in_flight < self.limit and not self.queued:
+                self.in_flight += 1
+                self.acquired += 1
+                return None
+            if self.max_queue is not None and self.queued >= self.max_queue:
+                self.rejected += 1
+                raise QueueFull(f"{self.queued} requests are already waiting for {self.name}.")
+            waiter = Waiter(wake=wake)
+            heapq.heappush(self._queue, (-run.priority, next(self._order), waiter))
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            return waiter
+
+    def settle(self, waiter: Waiter, run: Run):
+        """
+        Concludes the wait of a queued request, once it was woken up or its run stopped.
+
+        Raises:
+            RunCancelled: If the run was cancelled before the request was granted a slot.
+            DeadlineExceeded: If the run expired before the request was granted a slot.
+        """
+        with self._lock:
+            if not waiter.granted:
+                waiter.abandoned = True
+                self.queued -= 1
+                self.expired += 1
+                raise run.error()
+
+    def admit(self, run: Run) -> float:
+        """
+        Checks that a request granted a slot may still proceed, then takes its rate limit token. A request that
+        does not proceed leaves the token for the next one.
+
+        Returns:
+            float: The number of seconds to wait before starting, to respect `rate`.
+
+        Raises:
+            RunCancelled: If the run was cancelled.
+            DeadlineExceeded: If the run expired, or would expire before the rate limit allows the request.
+        """
+        if run.stopped():
+            self.release()
+            raise run.error()
+        if self._bucket is None:
+            return 0.0
+        delay = self._bucket.reserve(max_wait=run.remaining())
+        if delay is None:
+            self.release()
+            raise DeadlineExceeded(f"The run would exceed its deadline waiting for {self.name}.")
+        return delay
+
+    def acquire(self, run: Run):
+        """
+        Takes a slot, blocking until one is handed over, the run's deadline passes or the run is cancelled.
+
+        Args:
+            run (Run): The run of the request.
+        """
+        event = threading.Event()
+        waiter = self.enqueue(run, event.set)
+        if waiter is not None:
+            run.listen(event.set)
+            try:
+                while not (waiter.granted or run.stopped()):
+                    event.wait(run.remaining())
+            finally:
+                run.unlisten(event.set)
+            self.settle(waiter, run)
+        delay = self.admit(run)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, run: Run):
+        """
+        Asynchronous counterpart of `acquire`, waiting without blocking the event loop.
+
+        Args:
+            run (Run): The run of the request.
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass
+
+        waiter = self.enqueue(run, wake)
+        if waiter is not None:
+            run.listen(wake)
+            try:
+                while not (waiter.granted or run.stopped()):
+                    try:
+                        await asyncio.wait_for(event.wait(), run.remaining())
+                    except asyncio.TimeoutError:
+                        pass
+                    event.clear()
+            finally:
+                run.unlisten(wake)
+            self.settle(waiter, run)
+        delay = self.admit(run)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def release(self):
+        """
+        Frees a slot, handing it over to the first waiting request by priority.
+        """
+        with self._lock:
+            while self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                if waiter.abandoned:
+                    continue
+                waiter.granted = True
+                self.queued -= 1
+                self.acquired += 1
+                wait = time.monotonic() - waiter.since
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                waiter.wake()
+                return
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The resource's limit and backpressure metrics: requests in flight and waiting, peak queue
+            length, slots handed out, rejected and expired requests, and the average and longest waits.
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "peak_queued": self.peak_queued,
+                "acquired": self.acquired,
+                "rejected": self.rejected,
+                "expired": self.expired,
+                "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+
+class Scheduler(BaseModel):
+    """
+    Bounds the LLM and tool calls in flight across agents, per resource.
+
+    Agents given a `scheduler` take a slot of their LLM's resource (see `BaseLLM.resource`) for each LLM call
+    and a slot of each tool's `resource` for each tool call. When a resource is saturated, requests wait and
+    are served by priority. A run that passes its deadline, or is cancelled, fails with `DeadlineExceeded` or
+    `RunCancelled` instead of holding on: its waiting requests leave the queues and its LLM call in progress is
+    abandoned.
+
+    Attributes:
+        limits (Dict[str, int]): The maximum number of requests in flight per resource.
+        rates (Dict[str, float]): The maximum number of requests started per second per resource, e.g.
+            `{"gemini": 2.0}` to stay under an API quota.
+        default_limit (Optional[int]): The limit of the resources missing from `limits`. `None` leaves them
+            unlimited.
+        max_queue (Optional[int]): The maximum number of requests waiting per resource. Further requests fail
+            with `QueueFull`. `None` lets queues grow without bound.
+        llm_workers (int): The number of threads running scheduled LLM calls. They have their own pool, so that
+            abandoned calls still returning never hold up tools and speculative prefetches.
+        runs_started (int): The number of runs started.
+        runs_completed (int): The number of runs that finished, successfully or not.
+        runs_expired (int): The number of runs that exceeded their deadline.
+        runs_cancelled (int): The number of runs that were cancelled.
+        abandoned (int): The number of calls given up on by their run and still running.
+    """
+
+    limits: Dict[str, int] = Field(default_factory=lambda: {"gemini": 8, "gpu": 1, "cpu": 1, "duckduckgo": 2, "wikipedia": 8})
+    rates: Dict[str, float] = Field(default_factory=dict)
+    default_limit: Optional[int] = None
+    max_queue: Optional[int] = None
+    llm_workers: int = 32
+    runs_started: int = 0
+    runs_completed: int = 0
+    runs_expired: int = 0
+    runs_cancelled: int = 0
+    abandoned: int = 0
+    _resources: Dict[str, Resource] = PrivateAttr(default_factory=dict)
+    _executor: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The thread pool running scheduled LLM calls, created on first use.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.llm_workers, thread_name_prefix="automind-llm")
+            return self._executor
+
+    def _finish_abandoned(self, _):
+        with self._lock:
+            self.abandoned -= 1
+
+    def resource(self, name: Optional[str]) -> Optional[Resource]:
+        """
+        Returns the resource of a name, creating it on first use.
+
+        Args:
+            name (Optional[str]): The resource name.
+
+        Returns:
+            Optional[Resource]: The resource, or None when it is unlimited.
+        """
+        if name is None:
+            return None
+        with self._lock:
+            if name not in self._resources:
+                limit = self.limits.get(name, self.default_limit)
+                if limit is None:
+                    return None
+                self._resources[name] = Resource(name=name, limit=limit, rate=self.rates.get(name), max_queue=self.max_queue)
+            return self._resources[name]
+
+    def start_run(self, priority: int = 0, timeout: Optional[float] = None) -> Run:
+        """
+        Starts a run.
+
+        Args:
+            priority (int): The priority of the run's requests.
+            timeout (Optional[float]): The number of seconds the run may take.
+
+        Returns:
+            Run: The run, passed along with each of its requests.
+        """
+        with self._lock:
+            self.runs_started += 1
+        return Run(priority=priority, timeout=timeout)
+
+    def finish_run(self, run: Run, error: Optional[BaseException] = None):
+        """
+        Records the end of a run.
+
+        Args:
+            run (Run): The run.
+            error (Optional[BaseException]): The error the run failed with, if any.
+        """
+        with self._lock:
+            self.runs_completed += 1
+            if isinstance(error, DeadlineExceeded):
+                self.runs_expired += 1
+            elif isinstance(error, RunCancelled):
+                self.runs_cancelled += 1
+
+    @contextmanager
+    def slot(self, name: Optional[str], run: Optional[Run] = None):
+        """
+        Holds a slot of a resource for the duration of the block.
+
+        Args:
+            name (Optional[str]): The resource name.
+            run (Optional[Run]): The run of the request.
+        """
+        run = run or Run()
+        resource = self.resource(name)
+        if resource is None:
+            run.check()
+            yield
+            return
+        resource.acquire(run)
+        try:
+            yield
+        finally:
+            resource.release()
+
+    @asynccontextmanager
+    async def aslot(self, name: Optional[str], run: Optional[Run] = None):
+        """
+        Asynchronous counterpart of `slot`.
+        """
+        run = run or Run()
+        resource = self.resource(name)
+        if resource is None:
+            run.check()
+            yield
+            return
+        await resource.aacquire(run)
+        try:
+            yield
+        finally:
+            resource.release()
+
+    def call(self, name: Optional[str], run: Optional[Run], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Calls `fn` holding a slot of a resource. The call runs on the scheduler's own thread pool, so that the
+        caller gives up on it as soon as the run expires or is cancelled; the slot is then released when the
+        abandoned call returns. Context variables set by the call (e.g. the cache hits) are copied back.
+
+        Args:
+            name (Optional[str]): The resource name.
+            run (Optional[Run]): The run of the request.
+            fn (Callable[..., Any]): The blocking call.
+            *args: Positional arguments for `fn`.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            Any: The result of `fn`.
+        """
+        run = run or Run()
+        resource = self.resource(name)
+        if resource is not None:
+            resource.acquire(run)
+        else:
+            run.check()
+
+        def target():
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                if resource is not None:
+                    resource.release()
+
+        context = contextvars.copy_context()
+        try:
+            future = self.executor.submit(context.run, target)
+        except BaseException:
+            if resource is not None:
+                resource.release()
+            raise
+
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        run.listen(done.set)
+        try:
+            while not (future.done() or run.stopped()):
+                done.wait(run.remaining())
+        finally:
+            run.unlisten(done.set)
+        if not future.done():
+            with self._lock:
+                self.abandoned += 1
+            future.add_done_callback(self._finish_abandoned)
+            raise run.error()
+
+        result = future.result()
+        for var, value in context.items():
+            var.set(value)
+        return result
+
+    async def acall(self, name: Optional[str], run: Optional[Run], fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Asynchronous counterpart of `call`: awaits `fn(*args, **kwargs)` holding a slot of a resource, and
+        cancels it as soon as the run expires or is cancelled.
+
+        Args:
+            name (Optional[str]): The resource name.
+            run (Optional[Run]): The run of the request.
+            fn (Callable[..., Any]): Returns the awaitable to run.
+            *args: Positional arguments for `fn`.
+            **kwargs: Keyword arguments for `fn`.
+
+        Returns:
+            Any: The result of the awaitable.
+        """
+        run = run or Run()
+        async with self.aslot(name, run):
+            loop = asyncio.get_running_loop()
+            task = asyncio.current_task()
+            state = {"interrupted": False, "finished": False}
+
+            def interrupt():
+                if not (state["interrupted"] or state["finished"]):
+                    state["interrupted"] = True
+                    task.cancel()
+
+            def wake():
+                try:
+                    loop.call_soon_threadsafe(interrupt)
+                except RuntimeError:
+                    pass
+
+            remaining = run.remaining()
+            timer = loop.call_later(remaining, interrupt) if remaining is not None else None
+            run.listen(wake)
+            try:
+                return await fn(*args, **kwargs)
+            except asyncio.CancelledError:
+                if state["interrupted"]:
+                    raise run.error() from None
+                raise
+            finally:
+                state["finished"] = True
+                run.unlisten(wake)
+                if timer is not None:
+                    timer.cancel()
+                if state["interrupted"] and hasattr(task, "uncancel"):
+                    task.uncancel()
+
+    def execute(self, action: Any, run: Optional[Run] = None) -> Any:
+        """
+        Executes an action holding a slot of its `resource`.
+
+        Args:
+            action (BaseAction): The action.
+            run (Optional[Run]): The run of the request.
+
+        Returns:
+            Any: The result of the action.
+        """
+        with self.slot(getattr(action, "resource", None), run):
+            return action.execute()
+
+    async def aexecute(self, action: Any, run: Optional[Run] = None) -> Any:
+        """
+        Asynchronous counterpart of `execute`.
+        """
+        async with self.aslot(getattr(action, "resource", None), run):
+            return await action.aexecute()
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: The backpressure metrics of each resource used so far (see `Resource.stats`), and the number
+            of runs started, completed, expired and cancelled, and of abandoned calls still running.
+        """
+        with self._lock:
+            resources = dict(self._resources)
+            runs = {
+                "started": self.runs_started,
+                "completed": self.runs_completed,
+                "expired": self.runs_expired,
+                "cancelled": self.runs_cancelled,
+                "abandoned": self.abandoned,
+            }
+        return {"resources": {name: resource.stats() for name, resource in resources.items()}, "runs": runs}
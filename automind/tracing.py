@@ -0,0 +1,233 @@
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Any, Dict, List, Optional
+from abc import abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import threading
+import time
+import uuid
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("automind_current_span", default=None)
+
+
+class Span(BaseModel):
+    """
+    A timed unit of work, e.g. an LLM call or a tool execution.
+
+    Attributes:
+        name (str): The stage name, e.g. `llm_call`.
+        trace_id (str): The identifier shared by all the spans of a run.
+        span_id (str): The identifier of the span.
+        parent_id (Optional[str]): The identifier of the enclosing span, if any.
+        start_time (float): The wall clock start time, in seconds since the epoch.
+        end_time (Optional[float]): The wall clock end time, in seconds since the epoch.
+        duration (Optional[float]): The elapsed time, in seconds.
+        attributes (Dict[str, Any]): Measurements attached to the span, e.g. character and token counts.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    start_time: float = Field(default_factory=time.time)
+    end_time: Optional[float] = None
+    duration: Optional[float] = None
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+    def set(self, **attributes):
+        """
+        Attaches measurements to the span.
+
+        Args:
+            **attributes: The measurements to attach.
+        """
+        self.attributes.update(attributes)
+
+
+class NullSpan:
+    """
+    A span that ignores every measurement, used when tracing is disabled.
+    """
+
+    def set(self, **attributes):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class BaseSink(BaseModel):
+    """
+    A base class for span exporters.
+    """
+
+    @abstractmethod
+    def export(self, span: Span):
+        """
+        Abstract method exporting a finished span.
+
+        Args:
+            span (Span): The finished span.
+        """
+        pass
+
+
+class InMemorySink(BaseSink):
+    """
+    Collects finished spans in memory, e.g. for tests or benchmarks.
+
+    Attributes:
+        spans (List[Span]): The finished spans, in completion order.
+    """
+
+    spans: List[Span] = Field(default_factory=list)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def export(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> Dict[str, dict]:
+        """
+        Aggregates the durations of the collected spans per stage.
+
+        Returns:
+            Dict[str, dict]: For each span name, its count, total and mean durations and its p50, p95 and p99
+            latencies, in seconds.
+        """
+        durations: Dict[str, List[float]] = {}
+        with self._lock:
+            for span in self.spans:
+                durations.setdefault(span.name, []).append(span.duration or 0.0)
+
+        summary = {}
+        for name, values in durations.items():
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "total": sum(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+            }
+        return summary
+
+    def clear(self):
+        """
+        Removes every collected span.
+        """
+        with self._lock:
+            self.spans = []
+
+
+class JSONLSink(BaseSink):
+    """
+    Appends finished spans to a JSON lines file.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    path: str
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def export(self, span: Span):
+        line = json.dumps(span.model_dump(), default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as out:
+            out.write(line + "\n")
+
+
+class OpenTelemetrySink(BaseSink):
+    """
+    Re-emits finished spans through the OpenTelemetry API, so they reach any configured OpenTelemetry exporter.
+    Requires the `opentelemetry-api` package.
+
+    Attributes:
+        tracer_name (str): The name of the OpenTelemetry tracer.
+    """
+
+    tracer_name: str = "automind"
+    _tracer: Any = PrivateAttr(default=None)
+
+    def export(self, span: Span):
+        if self._tracer is None:
+            from opentelemetry import trace
+
+            self._tracer = trace.get_tracer(self.tracer_name)
+
+        attributes = {
+            key: value if isinstance(value, (str, bool, int, float)) else str(value)
+            for key, value in span.attributes.items()
+        }
+        attributes.update({
+            "automind.trace_id": span.trace_id,
+            "automind.span_id": span.span_id,
+            "automind.parent_id": span.parent_id or "",
+        })
+        otel_span = self._tracer.start_span(span.name, start_time=int(span.start_time * 1e9), attributes=attributes)
+        otel_span.end(end_time=int(span.end_time * 1e9))
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Returns the q-th percentile of sorted values, using the nearest-rank method.
+
+    Args:
+        values (List[float]): The values, sorted in ascending order.
+        q (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile, or 0.0 when there are no values.
+    """
+    if not values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+class Tracer(BaseModel):
+    """
+    Records nested, timed spans and exports them to pluggable sinks.
+
+    Spans opened while another span is active, in the same thread or asyncio task, become its children.
+
+    Attributes:
+        sinks (List[Any]): The exporters receiving every finished span.
+    """
+
+    sinks: List[Any] = Field(default_factory=list)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Opens a span for the duration of a `with` block.
+
+        Args:
+            name (str): The stage name.
+            **attributes: Initial measurements attached to the span.
+
+        Yields:
+            Span: The span, on which further measurements can be set.
+        """
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as exc:
+            span.set(error=f"{type(exc).__name__}: {exc}")
+            raise
+        finally:
+            span.duration = time.perf_counter() - start
+            span.end_time = span.start_time + span.duration
+            _current_span.reset(token)
+            for sink in self.sinks:
+                sink.export(span)
@@ -0,0 +1,133 @@
+from automind.llms.base import BaseLLM
+from automind.actions.base import BaseAction
+from pydantic import Field, PrivateAttr
+from typing import Any, ClassVar, List, Optional
+import asyncio
+import json
+import threading
+import time
+
+LOREM = (
+    "Automind benchmark payload sentence describing a synthetic search result about {query} with enough "
+    "distinct words for the observation processor to rank passages by relevance. "
+)
+
+
+def action_response(tool: str, query: str, thought: str = "I should look this up.") -> str:
+    """
+    Builds a ThinkAgent response selecting a tool.
+
+    Args:
+        tool (str): The tool name.
+        query (str): The tool argument.
+        thought (str): The thought preceding the action.
+
+    Returns:
+        str: The response.
+    """
+    action = json.dumps({"name": tool, "arguments": {"query": query}})
+    return f"Thought: {thought}\nAction:\n```json\n{action}\n```\n"
+
+
+def output_response(tool: str, query: str) -> str:
+    """
+    Builds a SingleAgent response selecting a tool.
+
+    Args:
+        tool (str): The tool name.
+        query (str): The tool argument.
+
+    Returns:
+        str: The response.
+    """
+    action = json.dumps({"name": tool, "arguments": {"query": query}})
+    return f"<output>\n```json\n{action}\n```\n</output>"
+
+
+def final_response(answer: str = "The benchmark answer.") -> str:
+    """
+    Returns:
+        str: A ReAct style response holding a final answer.
+    """
+    return f"Thought: I now know the final answer.\nFinal Answer: {answer}"
+
+
+class ScriptedLLM(BaseLLM):
+    """
+    A deterministic stand-in for an LLM, replaying canned responses in order (cycling once exhausted)
+    after a configurable latency. It needs no model, network or GPU.
+
+    Attributes:
+        responses (List[str]): The responses to replay.
+        latency (float): The number of seconds each call takes.
+        token_latency (float): The number of seconds between streamed chunks.
+    """
+
+    configs: dict = Field(default_factory=dict)
+    responses: List[str]
+    latency: float = 0.0
+    token_latency: float = 0.0
+    _calls: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def build(self):
+        return None
+
+    def next_response(self) -> str:
+        with self._lock:
+            response = self.responses[self._calls % len(self.responses)]
+            self._calls += 1
+        return response
+
+    def generate(self, prompt: str, stop: Optional[List[str]] = None) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.next_response()
+
+    async def agenerate(self, prompt: str, stop: Optional[List[str]] = None) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.next_response()
+
+    def generate_stream(self, prompt: str, stop: Optional[List[str]] = None):
+        if self.latency:
+            time.sleep(self.latency)
+        for chunk in self.next_response().split(" "):
+            if self.token_latency:
+                time.sleep(self.token_latency)
+            yield chunk + " "
+
+
+class PayloadTool(BaseAction):
+    """
+    Returns a synthetic search result of a fixed size.
+    """
+
+    query: str = Field(..., description="The search string.")
+    payload_chars: ClassVar[int] = 4000
+    latency: ClassVar[float] = 0.0
+
+    def execute(self) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        text = LOREM.format(query=self.query)
+        return (text * (self.payload_chars // len(text) + 1))[:self.payload_chars]
+
+
+def payload_tool(name: str, payload_chars: int = 4000, latency: float = 0.0) -> type:
+    """
+    Creates a stub tool class returning `payload_chars` characters after `latency` seconds.
+
+    Args:
+        name (str): The tool (class) name.
+        payload_chars (int): The size of each result.
+        latency (float): The number of seconds each call takes.
+
+    Returns:
+        type: The tool class.
+    """
+    return type(name, (PayloadTool,), {
+        "__doc__": f"Searches the synthetic {name} corpus for a topic.",
+        "payload_chars": payload_chars,
+        "latency": latency,
+    })
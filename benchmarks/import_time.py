@@ -0,0 +1,100 @@
+"""
+Import-time benchmark.
+
+Each module is imported in a fresh interpreter, several times, and the median wall time is reported along with
+any heavy backend it pulled in. Importing the public API or a wrapper must not import its backend until the
+model is built or the tool executed.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --max-seconds 0.5
+"""
+from typing import List, Tuple
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = (
+    "automind",
+    "automind.agents.ThinkAgent",
+    "automind.agents.SingleAgent",
+    "automind.agents.batch",
+    "automind.llms.gemini",
+    "automind.llms.hf",
+    "automind.llms.fast_hf",
+    "automind.actions.tools.duckduckgosearch",
+    "automind.actions.tools.wikisearch",
+)
+
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "vllm",
+    "langchain_core",
+    "langchain_community",
+    "langchain_huggingface",
+    "langchain_google_genai",
+    "duckduckgo_search",
+    "wikipedia",
+    "requests",
+    "sentence_transformers",
+)
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "heavy": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int) -> Tuple[float, List[str]]:
+    """
+    Imports a module in `repeat` fresh interpreters.
+
+    Args:
+        module (str): The module to import.
+        repeat (int): The number of interpreters.
+
+    Returns:
+        Tuple[float, List[str]]: The median import time in seconds, and the heavy modules it imported.
+    """
+    times, heavy = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        times.append(result["seconds"])
+        heavy = result["heavy"]
+    return statistics.median(times), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Automind import-time benchmark.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module.")
+    parser.add_argument("--max-seconds", type=float, help="Fail if a module takes longer to import.")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<42}{'median ms':>12}  heavy imports")
+    for module in MODULES:
+        seconds, heavy = measure(module, args.repeat)
+        print(f"{module:<42}{seconds * 1000:>12.1f}  {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)}")
+        if args.max_seconds is not None and seconds > args.max_seconds:
+            failures.append(f"{module} takes {seconds:.3f}s to import")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Offline benchmark of Automind's own overhead.
+
+Both agents are run against a scripted LLM and stub tools, so no model, GPU or network is needed. The report
+gives the throughput, the latency percentiles of each stage (from the tracing spans), the prompt size at each
+step and the peak memory traced during the runs.
+
+Usage:
+    python -m benchmarks.run --runs 50 --json bench.json
+    python -m benchmarks.run --baseline bench.json --max-regression 0.2
+"""
+from automind.agents.ThinkAgent import ThinkAgent
+from automind.agents.SingleAgent import SingleAgent
+from automind.events import EventBus
+from automind.tracing import Tracer, InMemorySink
+from benchmarks.fakes import ScriptedLLM, payload_tool, action_response, output_response, final_response
+from typing import Any, Dict, List
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+
+SCENARIOS = ("think", "single")
+
+
+def build_agent(scenario: str, args: argparse.Namespace, tracer: Tracer, run: int) -> Any:
+    """
+    Builds an agent of a scenario wired to the scripted LLM and the stub tools.
+
+    Args:
+        scenario (str): Either `think` or `single`.
+        args (argparse.Namespace): The benchmark options.
+        tracer (Tracer): The tracer recording the run.
+        run (int): The index of the run, used to vary the tool queries.
+
+    Returns:
+        BaseLLM: The agent.
+    """
+    tools = [
+        payload_tool("WebSearch", payload_chars=args.payload_chars, latency=args.tool_latency),
+        payload_tool("EncyclopediaSearch", payload_chars=args.payload_chars * 4, latency=args.tool_latency),
+    ]
+    common = dict(
+        question=f"Benchmark question {run}",
+        actions=tools,
+        backstory="You are a benchmark agent.",
+        tracer=tracer,
+        events=EventBus(enabled=False),
+    )
+
+    if scenario == "think":
+        responses = [
+            action_response(tools[step % len(tools)].__name__, f"topic {run}-{step}")
+            for step in range(args.iterations)
+        ]
+        llm = ScriptedLLM(responses=responses + [final_response()], latency=args.llm_latency)
+        return ThinkAgent(llm=llm, num_iterations=args.iterations, **common)
+
+    llm = ScriptedLLM(responses=[output_response(tools[0].__name__, f"topic {run}"), final_response()], latency=args.llm_latency)
+    return SingleAgent(llm=llm, summary=True, summary_mode=args.summary_mode, **common)
+
+
+def run_agents(scenario: str, args: argparse.Namespace, tracer: Tracer, runs: int):
+    """
+    Runs `runs` agents, one after the other or `concurrency` at a time on an event loop.
+
+    Args:
+        scenario (str): Either `think` or `single`.
+        args (argparse.Namespace): The benchmark options.
+        tracer (Tracer): The tracer recording the runs.
+        runs (int): The number of agents to run.
+    """
+    agents = [build_agent(scenario, args, tracer, run) for run in range(runs)]
+    if args.concurrency <= 1:
+        for agent in agents:
+            agent.run()
+        return
+
+    async def run_all():
+        for start in range(0, len(agents), args.concurrency):
+            await asyncio.gather(*(agent.arun() for agent in agents[start:start + args.concurrency]))
+
+    asyncio.run(run_all())
+
+
+def prompt_growth(sink: InMemorySink) -> List[dict]:
+    """
+    Averages the prompt size at each step of the runs.
+
+    Args:
+        sink (InMemorySink): The sink holding the spans of the runs.
+
+    Returns:
+        List[dict]: For each step, the mean prompt size in characters and estimated tokens.
+    """
+    runs: Dict[str, list] = {}
+    for span in sorted(sink.spans, key=lambda span: span.start_time):
+        if span.name == "prompt_build":
+            runs.setdefault(span.trace_id, []).append(span.attributes)
+
+    steps: Dict[int, list] = {}
+    for prompts in runs.values():
+        for step, attributes in enumerate(prompts, start=1):
+            steps.setdefault(step, []).append(attributes)
+    return [
+        {
+            "step": step,
+            "prompt_chars": sum(a["prompt_chars"] for a in prompts) / len(prompts),
+            "prompt_tokens": sum(a["prompt_tokens"] for a in prompts) / len(prompts),
+        }
+        for step, prompts in sorted(steps.items())
+    ]
+
+
+def benchmark(scenario: str, args: argparse.Namespace) -> dict:
+    """
+    Benchmarks a scenario: a warm-up run, a timed pass and a separate pass tracing the memory allocations.
+
+    Args:
+        scenario (str): Either `think` or `single`.
+        args (argparse.Namespace): The benchmark options.
+
+    Returns:
+        dict: The scenario report.
+    """
+    run_agents(scenario, args, Tracer(), 1)
+
+    sink = InMemorySink()
+    start = time.perf_counter()
+    run_agents(scenario, args, Tracer(sinks=[sink]), args.runs)
+    wall = time.perf_counter() - start
+
+    tracemalloc.start()
+    run_agents(scenario, args, Tracer(), args.memory_runs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "runs": args.runs,
+        "wall_seconds": wall,
+        "runs_per_second": args.runs / wall,
+        "stages": sink.summary(),
+        "prompt_growth": prompt_growth(sink),
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def print_report(scenario: str, report: dict):
+    print(f"\n=== {scenario}: {report['runs']} runs in {report['wall_seconds']:.3f}s "
+          f"({report['runs_per_second']:.1f} runs/s), peak memory {report['peak_memory_kb']:.0f} KiB ===")
+    print(f"{'stage':<16}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["stages"].items():
+        print(f"{name:<16}{stats['count']:>8}" + "".join(
+            f"{stats[key] * 1000:>10.3f}" for key in ("mean", "p50", "p95", "p99")
+        ))
+    print(f"{'step':<16}{'prompt chars':>14}{'prompt tokens':>15}")
+    for step in report["prompt_growth"]:
+        print(f"{step['step']:<16}{step['prompt_chars']:>14.0f}{step['prompt_tokens']:>15.0f}")
+
+
+def regressions(results: dict, baseline: dict, max_regression: float) -> List[str]:
+    """
+    Compares the throughput and peak memory of each scenario against a baseline report.
+
+    Args:
+        results (dict): The current reports, keyed by scenario.
+        baseline (dict): The baseline reports, keyed by scenario.
+        max_regression (float): The tolerated relative regression, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: A description of each regression found.
+    """
+    found = []
+    for scenario, report in results.items():
+        if scenario not in baseline:
+            continue
+        base = baseline[scenario]
+        if report["runs_per_second"] < base["runs_per_second"] * (1 - max_regression):
+            found.append(f"{scenario}: throughput {report['runs_per_second']:.1f} runs/s, baseline {base['runs_per_second']:.1f}")
+        if report["peak_memory_kb"] > base["peak_memory_kb"] * (1 + max_regression):
+            found.append(f"{scenario}: peak memory {report['peak_memory_kb']:.0f} KiB, baseline {base['peak_memory_kb']:.0f}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Automind benchmark.")
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="Scenario to run (default: all).")
+    parser.add_argument("--runs", type=int, default=50, help="Agent runs per scenario.")
+    parser.add_argument("--memory-runs", type=int, default=5, help="Agent runs traced for peak memory.")
+    parser.add_argument("--iterations", type=int, default=4, help="ThinkAgent iterations.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Agents run concurrently with arun.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per LLM call.")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="Seconds per tool call.")
+    parser.add_argument("--summary-mode", choices=("llm", "fused", "extractive", "capped"), default="llm", help="SingleAgent summary mode.")
+    parser.add_argument("--payload-chars", type=int, default=4000, help="Characters returned by the web search stub.")
+    parser.add_argument("--json", help="Write the report to this file.")
+    parser.add_argument("--baseline", help="Fail if a scenario regresses against this report.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Tolerated relative regression.")
+    args = parser.parse_args()
+
+    results = {}
+    for scenario in args.scenario or SCENARIOS:
+        results[scenario] = benchmark(scenario, args)
+        print_report(scenario, results[scenario])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as out:
+            json.dump(results, out, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline:
+            found = regressions(results, json.load(baseline), args.max_regression)
+        for regression in found:
+            print(f"REGRESSION {regression}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
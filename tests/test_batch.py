@@ -0,0 +1,57 @@
+import pytest
+
+from automind.actions.base import BaseAction
+from automind.agents.ThinkAgent import ThinkAgent
+from automind.agents.batch import AgentBatch
+from automind.events import EventBus
+from benchmarks.fakes import ScriptedLLM, action_response, final_response
+
+
+class Echo(BaseAction):
+    """Echoes a query."""
+
+    query: str
+
+    def execute(self):
+        if self.query == "broken":
+            raise RuntimeError("upstream down")
+        return f"echoed {self.query}"
+
+
+class PromptLLM(ScriptedLLM):
+    """Fails on the prompts of the "boom" question, and answers the others after one tool call."""
+
+    def generate(self, prompt, stop=None):
+        if "boom" in prompt:
+            raise RuntimeError("llm down")
+        if "Observation" in prompt:
+            return final_response("done")
+        return action_response("Echo", "broken" if "broken" in prompt else "x")
+
+    def generate_batch(self, prompts, stop=None):
+        return [self.generate(prompt, stop=stop) for prompt in prompts]
+
+
+def batch(return_exceptions):
+    return AgentBatch(
+        agent_cls=ThinkAgent, llm=PromptLLM(responses=[]), actions=[Echo], backstory="b",
+        agent_kwargs={"num_iterations": 3, "events": EventBus(enabled=False)}, return_exceptions=return_exceptions
+    )
+
+
+def test_failing_llm_call_only_fails_its_agent():
+    results = batch(True).run_many(["first", "boom", "second"])
+
+    assert results[0].strip() == results[2].strip() == "done"
+    assert isinstance(results[1], RuntimeError)
+
+
+def test_failing_tool_only_fails_its_agent():
+    results = batch(True).run_many(["broken", "first"])
+
+    assert [result.strip() for result in results] == ["done", "done"]
+
+
+def test_failures_are_raised_without_return_exceptions():
+    with pytest.raises(RuntimeError):
+        batch(False).run_many(["first", "boom"])
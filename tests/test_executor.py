@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import pytest
+
+from automind.actions.base import BaseAction
+from automind.actions.executor import aexecute_actions, execute_actions
+
+
+class Echo(BaseAction):
+    """Echoes a query."""
+
+    query: str
+
+    def execute(self):
+        return f"echoed {self.query}"
+
+
+class Broken(BaseAction):
+    """Always fails."""
+
+    query: str
+
+    def execute(self):
+        raise RuntimeError("upstream down")
+
+
+class Slow(BaseAction):
+    """Takes a while."""
+
+    query: str
+
+    def execute(self):
+        time.sleep(0.5)
+        return "late"
+
+
+ERROR = "Error: Broken failed with RuntimeError: upstream down"
+
+
+@pytest.mark.parametrize("actions, expected", [
+    ([Broken(query="a")], [ERROR]),
+    ([Broken(query="a"), Echo(query="b")], [ERROR, "echoed b"]),
+])
+@pytest.mark.parametrize("timeout", [None, 5.0])
+def test_failures_are_observations_whatever_the_batch_size(actions, expected, timeout):
+    assert execute_actions(actions, timeout=timeout) == expected
+
+
+@pytest.mark.parametrize("actions, expected", [
+    ([Broken(query="a")], [ERROR]),
+    ([Broken(query="a"), Echo(query="b")], [ERROR, "echoed b"]),
+])
+def test_async_failures_are_observations_whatever_the_batch_size(actions, expected):
+    assert asyncio.run(aexecute_actions(actions)) == expected
+
+
+def test_slow_actions_time_out():
+    assert execute_actions([Slow(query="a"), Echo(query="b")], timeout=0.05) == [
+        "Error: Slow timed out after 0.05s.", "echoed b"
+    ]
@@ -0,0 +1,95 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+
+import pytest
+import requests
+
+from automind.actions.cache import tool_cache
+from automind.actions.http import HTTPClient
+from automind.actions.tools import wikisearch
+from automind.actions.tools.wikisearch import WikiSearch
+
+
+class WikiStub(BaseHTTPRequestHandler):
+    """
+    Answers like the MediaWiki API, after failing with the statuses queued in `failures`.
+    """
+
+    failures = []
+    requests = []
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        type(self).requests.append(params)
+        if type(self).failures:
+            self.reply(type(self).failures.pop(0), {"error": "try again"})
+        elif params.get("list") == "search":
+            self.reply(200, {"query": {"search": [{"title": "Jaipur"}]}})
+        else:
+            self.reply(200, {"query": {"pages": {"1": {"title": "Jaipur", "extract": "The Pink City."}}}})
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def wiki(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WikiStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    WikiStub.failures, WikiStub.requests = [], []
+    client = HTTPClient(max_attempts=3, backoff=0.01, max_backoff=0.05)
+    monkeypatch.setattr(WikiSearch, "api_url", f"http://127.0.0.1:{server.server_port}/w/api.php")
+    monkeypatch.setattr(wikisearch, "http_client", client)
+    tool_cache.clear()
+    yield WikiStub
+    tool_cache.clear()
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_wikisearch_returns_the_first_article(wiki):
+    assert WikiSearch(query="Jaipur").execute() == "Jaipur\nThe Pink City."
+    assert [request.get("list", request.get("prop")) for request in wiki.requests] == ["search", "extracts"]
+
+
+def test_wikisearch_retries_server_errors(wiki):
+    wiki.failures = [503, 502]
+
+    assert WikiSearch(query="Jaipur").execute() == "Jaipur\nThe Pink City."
+    assert len(wiki.requests) == 4
+
+
+def test_wikisearch_retries_rate_limited_requests(wiki):
+    wiki.failures = [429]
+
+    assert WikiSearch(query="Jaipur").execute() == "Jaipur\nThe Pink City."
+    assert len(wiki.requests) == 3
+
+
+def test_wikisearch_gives_up_after_max_attempts(wiki):
+    wiki.failures = [429, 429, 429, 429]
+
+    with pytest.raises(requests.HTTPError) as info:
+        WikiSearch(query="Jaipur").execute()
+    assert info.value.response.status_code == 429
+    assert len(wiki.requests) == 3
+
+
+def test_client_errors_are_not_retried(wiki):
+    wiki.failures = [404]
+
+    with pytest.raises(requests.HTTPError):
+        WikiSearch(query="Jaipur").execute()
+    assert len(wiki.requests) == 1
@@ -0,0 +1,114 @@
+from types import SimpleNamespace
+
+import pytest
+
+from automind.llms import cache as llm_cache_module
+from automind.llms.base import BaseLLM
+from automind.llms.cache import InMemoryCache, SQLiteCache, TieredCache, make_cache_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache_module, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+def test_cache_key_depends_on_every_input():
+    key = make_cache_key("gemini", {"temperature": 0.0}, "prompt", stop=["Observation:"])
+
+    assert key == make_cache_key("gemini", {"temperature": 0.0}, "prompt", stop=["Observation:"])
+    assert key != make_cache_key("gemini-pro", {"temperature": 0.0}, "prompt", stop=["Observation:"])
+    assert key != make_cache_key("gemini", {"temperature": 0.5}, "prompt", stop=["Observation:"])
+    assert key != make_cache_key("gemini", {"temperature": 0.0}, "prompt!", stop=["Observation:"])
+    assert key != make_cache_key("gemini", {"temperature": 0.0}, "prompt", stop=None)
+
+
+def test_cache_key_ignores_config_order():
+    assert make_cache_key("m", {"a": 1, "b": 2}, "p") == make_cache_key("m", {"b": 2, "a": 1}, "p")
+
+
+def test_in_memory_cache_expires_entries(clock):
+    cache = InMemoryCache(ttl=10)
+    cache.set("key", "response")
+
+    clock.now += 5
+    assert cache.get("key") == "response"
+    clock.now += 10
+    assert cache.get("key") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.lookup("a") == 1
+    assert cache.lookup("b") is None
+    assert len(cache) == 2
+
+
+def test_lookup_does_not_count(clock):
+    cache = InMemoryCache()
+    cache.set("key", "response")
+    cache.lookup("key")
+    cache.lookup("missing")
+
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+def test_sqlite_cache_persists(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SQLiteCache(path=path)
+    cache.set("key", "response")
+    cache.close()
+
+    reopened = SQLiteCache(path=path)
+    assert reopened.get("key") == "response"
+    reopened.close()
+
+
+def test_sqlite_cache_expires_entries(tmp_path, clock):
+    cache = SQLiteCache(path=str(tmp_path / "cache.sqlite"), ttl=10)
+    cache.set("key", "response")
+    clock.now += 11
+
+    assert cache.get("key") is None
+    cache.close()
+
+
+def test_tiered_cache_promotes_slow_hits(tmp_path):
+    fast, slow = InMemoryCache(), SQLiteCache(path=str(tmp_path / "cache.sqlite"))
+    cache = TieredCache(tiers=[fast, slow])
+    slow.set("key", "response")
+
+    assert cache.get("key") == "response"
+    assert fast.lookup("key") == "response"
+    assert cache.stats()["hits"] == 1
+    slow.close()
+
+
+def test_subclass_implementing_run_keeps_working_with_the_cache():
+    class LegacyLLM(BaseLLM):
+        def build(self):
+            pass
+
+        def run(self, prompt):
+            return f"echo {prompt}"
+
+    llm = LegacyLLM(configs={}, cache=InMemoryCache())
+
+    assert llm.run("hi") == llm.run("hi") == "echo hi"
+    assert llm.cache.stats()["hits"] == 1
+    assert list(llm.stream("there")) == ["echo there"]
@@ -0,0 +1,33 @@
+from automind.agents.ThinkAgent import ThinkAgent
+from automind.events import EventBus
+from automind.memory.retrieval import ObservationProcessor
+from benchmarks.fakes import ScriptedLLM, payload_tool
+
+Search = payload_tool("Search", payload_chars=20000)
+
+
+def agent(**kwargs):
+    return ThinkAgent(
+        question="What is Jaipur?", llm=ScriptedLLM(responses=[""]), actions=[Search], backstory="b",
+        events=EventBus(enabled=False), **kwargs
+    )
+
+
+def test_long_observations_are_shrunk_by_default():
+    observation = Search(query="Jaipur").execute()
+
+    processed = agent().process_observation(observation, "What is Jaipur?")
+
+    assert isinstance(agent().observation_processor, ObservationProcessor)
+    assert len(processed) <= 3000
+    assert "Jaipur" in processed
+
+
+def test_short_observations_are_kept():
+    assert agent().process_observation("Jaipur is a city.", "What is Jaipur?") == "Jaipur is a city."
+
+
+def test_processing_can_be_disabled():
+    observation = Search(query="Jaipur").execute()
+
+    assert agent(observation_processor=None).process_observation(observation, "What is Jaipur?") == observation
@@ -0,0 +1,99 @@
+import pytest
+
+from automind.agents.parser import StreamParser, find_json, parse_response, repair_json
+
+
+ACTION = {"name": "WikiSearch", "arguments": {"query": "Jaipur"}}
+
+
+def test_valid_json_is_not_repaired():
+    assert repair_json('{"name": "WikiSearch", "arguments": {"query": "Jaipur"}}') == (ACTION, False)
+
+
+@pytest.mark.parametrize("text", [
+    '{"name": "WikiSearch", "arguments": {"query": "Jaipur"},}',
+    "{'name': 'WikiSearch', 'arguments': {'query': 'Jaipur'}}",
+    '{"name": "WikiSearch", "arguments": {"query": "Jaipur"',
+    '{"name": "WikiSearch", "arguments": {"query": "Jaipur',
+    '{"name": "WikiSearch", "arguments": {"query": "Jaipur"}} and then I will answer.',
+])
+def test_repairs_llm_json(text):
+    assert repair_json(text) == (ACTION, True)
+
+
+def test_repairs_python_literals():
+    assert repair_json('{"name": "Flag", "arguments": {"on": True, "off": False, "value": None}}') == (
+        {"name": "Flag", "arguments": {"on": True, "off": False, "value": None}}, True
+    )
+
+
+@pytest.mark.parametrize("text", [
+    '{"name": "WikiSearch", "arguments": {"query": "True Detective None",}}',
+    "{'name': 'WikiSearch', 'arguments': {'query': 'True Detective None'}}",
+    '{"name": "WikiSearch", "arguments": {"query": "True Detective None"',
+])
+def test_repair_leaves_strings_alone(text):
+    assert repair_json(text) == ({"name": "WikiSearch", "arguments": {"query": "True Detective None"}}, True)
+
+
+def test_repair_only_removes_trailing_commas_outside_strings():
+    assert repair_json('{"query": "a, }", "escaped": "say \\"None,]\\"", "on": True,}') == (
+        {"query": "a, }", "escaped": 'say "None,]"', "on": True}, True
+    )
+
+
+def test_unrepairable_json_raises():
+    with pytest.raises(ValueError):
+        repair_json("{name: WikiSearch}")
+
+
+def test_find_json_reads_unclosed_fences():
+    assert find_json('Action:\n```json\n{"name": "WikiSearch"}') == '{"name": "WikiSearch"}'
+
+
+def test_find_json_without_json():
+    assert find_json("No action here.") is None
+
+
+def test_parse_react_response():
+    parsed = parse_response(
+        'Thought: I should search.\nAction:\n```json\n{"name": "WikiSearch", "arguments": {"query": "Jaipur"}}\n```\n'
+    )
+
+    assert parsed.thought == "I should search."
+    assert parsed.action == ACTION
+    assert not parsed.repaired
+    assert parsed.action_text.startswith("```json\n")
+
+
+def test_parse_markdown_decorated_response():
+    parsed = parse_response('**Thought:** s\n**Action:** ```json {"name": "WikiSearch", "arguments": {"query": "Jaipur"},} ```')
+
+    assert parsed.thought == "s"
+    assert parsed.action == ACTION
+    assert parsed.repaired
+
+
+def test_parse_final_answer():
+    parsed = parse_response("Thought: I now know the final answer.\nFinal Answer: 42")
+
+    assert parsed.action is None
+    assert parsed.final_answer.strip() == "42"
+
+
+def test_parse_invalid_action_reports_the_error():
+    parsed = parse_response("Thought: s\nAction:\n```json\n{name: WikiSearch}\n```")
+
+    assert parsed.action is None
+    assert parsed.action_error
+    assert parsed.action_text == "```json\n{name: WikiSearch}\n```"
+
+
+def test_stream_parser_stops_at_the_closed_action():
+    parser = StreamParser()
+    chunks = ["Thought: s\nAction:\n``", '`json\n{"name": "WikiSearch", ', '"arguments": {"query": "Jaipur"}}\n`', "``\nObservation:"]
+
+    closed = [parser.feed(chunk) for chunk in chunks]
+
+    assert closed == [False, False, False, True]
+    assert parser.result().action == ACTION
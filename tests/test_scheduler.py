@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from automind.llms.hf import AnyhfLLM
+from automind.scheduler import DeadlineExceeded, QueueFull, Run, RunCancelled, Scheduler
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_unknown_resources_are_unlimited():
+    scheduler = Scheduler(limits={})
+
+    assert scheduler.resource("anything") is None
+    assert scheduler.call("anything", None, lambda: 42) == 42
+
+
+def test_waiting_requests_are_served_by_priority():
+    scheduler = Scheduler(limits={"gpu": 1})
+    resource = scheduler.resource("gpu")
+    release = threading.Event()
+    order = []
+
+    holder = threading.Thread(target=scheduler.call, args=("gpu", None, release.wait, 5))
+    holder.start()
+    wait_until(lambda: resource.in_flight == 1)
+
+    threads = []
+    for name, priority in [("low", 0), ("high", 10), ("mid", 5)]:
+        thread = threading.Thread(target=scheduler.call, args=("gpu", Run(priority=priority), order.append, name))
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda: resource.queued == len(threads))
+
+    release.set()
+    for thread in [holder, *threads]:
+        thread.join(5)
+
+    assert order == ["high", "mid", "low"]
+    assert resource.stats()["peak_queued"] == 3
+
+
+def test_full_queue_rejects_requests():
+    scheduler = Scheduler(limits={"gpu": 1}, max_queue=0)
+    release = threading.Event()
+    holder = threading.Thread(target=scheduler.call, args=("gpu", None, release.wait, 5))
+    holder.start()
+    wait_until(lambda: scheduler.resource("gpu").in_flight == 1)
+
+    with pytest.raises(QueueFull):
+        scheduler.call("gpu", None, lambda: None)
+    release.set()
+    holder.join(5)
+
+    assert scheduler.resource("gpu").stats()["rejected"] == 1
+
+
+def test_queued_request_fails_at_the_deadline():
+    scheduler = Scheduler(limits={"gpu": 1})
+    release = threading.Event()
+    holder = threading.Thread(target=scheduler.call, args=("gpu", None, release.wait, 5))
+    holder.start()
+    wait_until(lambda: scheduler.resource("gpu").in_flight == 1)
+
+    with pytest.raises(DeadlineExceeded):
+        scheduler.call("gpu", Run(timeout=0.1), lambda: None)
+    release.set()
+    holder.join(5)
+
+    stats = scheduler.resource("gpu").stats()
+    assert stats["expired"] == 1 and stats["queued"] == 0 and stats["in_flight"] == 0
+
+
+def test_running_call_is_abandoned_at_the_deadline():
+    scheduler = Scheduler(limits={"gemini": 1})
+    release = threading.Event()
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        scheduler.call("gemini", Run(timeout=0.1), release.wait, 5)
+    assert time.monotonic() - start < 1
+    assert scheduler.stats()["runs"]["abandoned"] == 1
+
+    release.set()
+    wait_until(lambda: scheduler.stats()["runs"]["abandoned"] == 0)
+    wait_until(lambda: scheduler.resource("gemini").in_flight == 0)
+
+
+def test_cancelled_run_stops_waiting():
+    scheduler = Scheduler(limits={"gpu": 1})
+    release = threading.Event()
+    holder = threading.Thread(target=scheduler.call, args=("gpu", None, release.wait, 5))
+    holder.start()
+    wait_until(lambda: scheduler.resource("gpu").in_flight == 1)
+
+    run, errors = Run(), []
+
+    def waiter():
+        try:
+            scheduler.call("gpu", run, lambda: None)
+        except RunCancelled as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    wait_until(lambda: scheduler.resource("gpu").queued == 1)
+    run.cancel()
+    thread.join(5)
+    release.set()
+    holder.join(5)
+
+    assert len(errors) == 1
+    assert scheduler.resource("gpu").queued == 0
+
+
+def test_rate_limit_token_is_kept_when_the_deadline_is_too_close():
+    scheduler = Scheduler(limits={"gemini": 2}, rates={"gemini": 1.0})
+    scheduler.call("gemini", None, lambda: None)
+
+    with pytest.raises(DeadlineExceeded):
+        scheduler.call("gemini", Run(timeout=0.1), lambda: None)
+
+    assert scheduler.resource("gemini").in_flight == 0
+    start = time.monotonic()
+    scheduler.call("gemini", None, lambda: None)
+    assert time.monotonic() - start < 1.1
+
+
+def test_runs_are_counted():
+    scheduler = Scheduler()
+    run = scheduler.start_run(timeout=1)
+    scheduler.finish_run(run, DeadlineExceeded())
+    scheduler.finish_run(scheduler.start_run(), RunCancelled())
+    scheduler.finish_run(scheduler.start_run())
+
+    assert scheduler.stats()["runs"] == {"started": 3, "completed": 3, "expired": 1, "cancelled": 1, "abandoned": 0}
+
+
+def test_async_call_is_cancelled_at_the_deadline():
+    scheduler = Scheduler(limits={"gemini": 1})
+
+    async def main():
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.acall("gemini", Run(timeout=0.1), asyncio.sleep, 5)
+        return await scheduler.acall("gemini", None, asyncio.sleep, 0, "done")
+
+    assert asyncio.run(main()) == "done"
+    assert scheduler.resource("gemini").in_flight == 0
+
+
+@pytest.mark.parametrize("device, resource", [("cpu", "cpu"), (-1, "cpu"), (0, "gpu"), ("cuda:1", "gpu"), ("auto", "gpu")])
+def test_hf_resource_follows_the_resolved_device(device, resource):
+    assert AnyhfLLM(hf_model_name="gpt2", configs={}, device=device).resource() == resource
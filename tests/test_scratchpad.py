@@ -0,0 +1,79 @@
+from automind.llms.tokens import CharTokenCounter
+from automind.memory.scratchpad import Scratchpad, ScratchpadStep
+
+
+def test_render_labels_each_section_once():
+    step = ScratchpadStep(thought="search", action='```json\n{"name": "Echo"}\n```', observation="found")
+
+    assert step.render() == 'Thought: search\nAction:\n```json\n{"name": "Echo"}\n```\nObservation: found\n'
+
+
+def test_long_observations_are_truncated():
+    pad = Scratchpad(max_tokens=None, max_observation_chars=10)
+    step = pad.add("t", "a", "x" * 100)
+
+    assert step.observation == "x" * 10 + " ...[truncated]"
+    assert step.tokens_saved > 0
+
+
+def test_older_steps_are_compacted_first():
+    pad = Scratchpad(max_tokens=200, keep_recent=1, compacted_observation_chars=20)
+    pad.add("first", "a", "x" * 400)
+    pad.add("second", "a", "y" * 400)
+
+    first, second = pad.steps
+    assert first.compacted and first.observation == "x" * 20 + " ...[compacted]"
+    assert not second.compacted and second.observation == "y" * 400
+    assert pad.total_tokens <= 200
+    assert pad.evicted == 0
+
+
+def test_summarizer_compacts_older_steps():
+    pad = Scratchpad(max_tokens=150, keep_recent=1, summarizer=lambda text: f"{len(text)} chars")
+    pad.add("first", "a", "x" * 400)
+    pad.add("second", "a", "y" * 400)
+
+    assert pad.steps[0].observation == "400 chars"
+
+
+def test_oldest_steps_are_evicted_when_compaction_is_not_enough():
+    pad = Scratchpad(max_tokens=60, keep_recent=1, compacted_observation_chars=100)
+    for index in range(4):
+        pad.add(f"thought {index}", "a", str(index) * 200)
+
+    assert [step.thought for step in pad.steps] == ["thought 3"]
+    assert pad.evicted == 3
+    assert pad.tokens_saved >= pad.evicted_tokens > 0
+
+
+def test_recent_steps_are_kept_verbatim():
+    pad = Scratchpad(max_tokens=10, keep_recent=2)
+    pad.add("first", "a", "x" * 400)
+    pad.add("second", "a", "y" * 400)
+
+    assert [step.compacted for step in pad.steps] == [False, False]
+
+
+def test_fit_gives_up_older_steps_before_trimming_recent_ones():
+    pad = Scratchpad(max_tokens=None, keep_recent=1, token_counter=CharTokenCounter())
+    pad.add("first", "a", "x" * 400)
+    pad.add("second", "a", "y" * 400)
+
+    pad.fit(150)
+    assert [step.thought for step in pad.steps] == ["second"]
+    assert pad.steps[0].observation == "y" * 400
+
+    pad.fit(60)
+    assert pad.total_tokens <= 60
+    assert pad.steps[0].observation.startswith("y")
+    assert pad.steps[0].observation.endswith(" ...[trimmed]")
+
+
+def test_fit_with_no_budget_empties_the_scratchpad():
+    pad = Scratchpad(max_tokens=None)
+    pad.add("first", "a", "x" * 400)
+
+    pad.fit(0)
+
+    assert pad.steps == []
+    assert pad.evicted == 1
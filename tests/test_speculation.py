@@ -0,0 +1,119 @@
+from typing import ClassVar, List
+import time
+
+import pytest
+
+from automind.actions.base import BaseAction
+from automind.agents.SingleAgent import SingleAgent
+from automind.agents.speculation import Speculation, SpeculationStats, prefetched_result, speculative_calls
+from automind.events import EventBus
+from benchmarks.fakes import ScriptedLLM, output_response
+
+executed: List[str] = []
+
+
+class Search(BaseAction):
+    """Searches for a query."""
+
+    query: str
+    speculative: ClassVar[bool] = True
+
+    def execute(self):
+        executed.append(self.query)
+        time.sleep(0.05)
+        return f"result for {self.query}"
+
+
+class Lookup(BaseAction):
+    """Looks a key up, never speculatively."""
+
+    key: str
+
+    def execute(self):
+        return self.key
+
+
+class FailingLLM(ScriptedLLM):
+    def generate(self, prompt, stop=None):
+        raise RuntimeError("llm down")
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    executed.clear()
+
+
+def agent(llm, stats, **kwargs):
+    return SingleAgent(
+        question="Capital of France?", llm=llm, actions=[Search, Lookup], backstory="b", summary=False,
+        speculative=True, speculation_stats=stats, events=EventBus(enabled=False), **kwargs
+    )
+
+
+def test_only_speculative_single_argument_actions_are_guessed():
+    calls = speculative_calls([Search, Lookup], "Capital of France?")
+
+    assert [(type(call), call.query) for call in calls] == [(Search, "Capital of France?")]
+
+
+def test_resolve_matches_normalized_queries():
+    stats = SpeculationStats()
+    speculation = Speculation.start([Search(query="Capital of France?")], stats)
+
+    matched = speculation.resolve([Lookup(key="x"), Search(query="capital of  france")])
+
+    assert list(matched) == [1]
+    assert prefetched_result(Search(query="capital of france"), matched[1], timeout=5) == "result for Capital of France?"
+    assert stats.stats()["hits"] == 1 and stats.stats()["misses"] == 1 and stats.stats()["wasted"] == 0
+
+
+def test_resolve_only_counts_once():
+    stats = SpeculationStats()
+    speculation = Speculation.start([Search(query="q")], stats)
+
+    speculation.resolve([])
+    assert speculation.resolve([Search(query="q")]) == {}
+    assert stats.stats()["wasted"] == 1 and stats.stats()["hits"] == 0
+
+
+def test_agent_uses_the_prefetched_result():
+    stats = SpeculationStats()
+    llm = ScriptedLLM(responses=[output_response("Search", "capital of france")], latency=0.1)
+
+    result = agent(llm, stats).run()
+
+    assert result["tool_response"] == "result for Capital of France?"
+    assert executed == ["Capital of France?"]
+    assert stats.stats()["hits"] == 1
+    assert stats.stats()["latency_saved"] > 0
+
+
+def test_agent_executes_the_tool_on_a_miss():
+    stats = SpeculationStats()
+    llm = ScriptedLLM(responses=[output_response("Search", "Paris population")], latency=0.1)
+
+    result = agent(llm, stats).run()
+
+    assert result["tool_response"] == "result for Paris population"
+    assert "Paris population" in executed
+    assert stats.stats()["misses"] == 1 and stats.stats()["wasted"] == 1
+
+
+def test_prefetches_are_discarded_when_the_llm_fails():
+    stats = SpeculationStats()
+
+    with pytest.raises(RuntimeError):
+        agent(FailingLLM(responses=[]), stats).run()
+
+    counters = stats.stats()
+    assert counters["prefetched"] == counters["hits"] + counters["wasted"] == 1
+
+
+def test_prefetches_are_discarded_when_the_task_is_closed():
+    stats = SpeculationStats()
+    task = agent(ScriptedLLM(responses=[]), stats).task()
+
+    next(task)
+    task.close()
+
+    assert stats.stats()["wasted"] == 1
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from automind.actions.base import BaseAction
+from automind.agents.ThinkAgent import ThinkAgent
+from automind.agents.parser import StreamParser
+from automind.events import EventBus
+from benchmarks.fakes import ScriptedLLM, action_response
+
+ANSWER = "run ```pip install x``` then restart the machine"
+
+
+class Echo(BaseAction):
+    """Echoes a query."""
+
+    query: str
+
+    def execute(self):
+        return f"echoed {self.query}"
+
+
+def feed_words(parser, text):
+    return [parser.feed(word + " ") for word in text.split(" ")]
+
+
+def agent(responses, stream):
+    return ThinkAgent(
+        question="How do I install x?", llm=ScriptedLLM(responses=responses), actions=[Echo], backstory="b",
+        num_iterations=2, stream=stream, on_token=lambda chunk: None, events=EventBus(enabled=False)
+    )
+
+
+def test_action_block_closes_the_stream():
+    closed = feed_words(StreamParser(), action_response("Echo", "x") + "Observation: made up")
+
+    assert closed.index(True) < len(closed) - 1
+
+
+@pytest.mark.parametrize("text", [
+    f"Thought: I now know the final answer.\nFinal Answer: {ANSWER}",
+    "Thought: the docs say ```pip install x``` works.\nFinal Answer: pip install x",
+    "Final Answer: ```json\n{\"name\": \"Echo\"}\n``` is an action, not an answer.",
+])
+def test_code_outside_actions_does_not_close_the_stream(text):
+    assert not any(feed_words(StreamParser(), text))
+
+
+def test_fences_split_across_chunks():
+    parser = StreamParser()
+    chunks = ["Final Answer: ``", "`code`", "``\nAction:\n``", '`json\n{"name": "Echo"}\n`', "``"]
+
+    assert [parser.feed(chunk) for chunk in chunks] == [False, False, False, False, False]
+    parser = StreamParser()
+    chunks = ["Thought: s\nAct", "ion:\n``", '`json\n{"name": "Echo"}\n`', "``"]
+    assert [parser.feed(chunk) for chunk in chunks] == [False, False, False, True]
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_streamed_final_answer_keeps_its_code(stream):
+    responses = [f"Thought: I now know the final answer.\nFinal Answer: {ANSWER}"]
+
+    assert agent(responses, stream).run().strip() == ANSWER
+
+
+def test_async_streamed_final_answer_keeps_its_code():
+    responses = [action_response("Echo", "x"), f"Thought: I now know the final answer.\nFinal Answer: {ANSWER}"]
+
+    assert asyncio.run(agent(responses, True).arun()).strip() == ANSWER
@@ -0,0 +1,96 @@
+from types import SimpleNamespace
+import threading
+
+import pytest
+
+from automind.actions import cache as tool_cache_module
+from automind.actions.cache import ToolCache, action_cache_key, cached
+from automind.actions.tools.wikisearch import WikiSearch
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(tool_cache_module, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+def test_tool_cache_key_depends_on_the_call():
+    assert action_cache_key(WikiSearch(query="Jaipur")) == action_cache_key(WikiSearch(query="Jaipur"))
+    assert action_cache_key(WikiSearch(query="Jaipur")) != action_cache_key(WikiSearch(query="Delhi"))
+
+
+def test_tool_cache_expires_entries(clock):
+    cache = ToolCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.fetch("key", compute, ttl=60) == (1, "miss")
+    clock.now += 30
+    assert cache.fetch("key", compute, ttl=60) == (1, "hit")
+    clock.now += 31
+    assert cache.fetch("key", compute, ttl=60) == (2, "miss")
+
+
+def test_tool_cache_does_not_store_failures():
+    cache = ToolCache()
+
+    def fail():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.fetch("key", fail)
+    assert cache.fetch("key", lambda: "ok") == ("ok", "miss")
+
+
+def test_tool_cache_coalesces_concurrent_calls():
+    cache = ToolCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "result"
+
+    outcomes = []
+    owner = threading.Thread(target=lambda: outcomes.append(cache.fetch("key", compute)))
+    owner.start()
+    started.wait(5)
+    waiters = [threading.Thread(target=lambda: outcomes.append(cache.fetch("key", compute))) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    while cache.coalesced < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in [owner, *waiters]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(status for _, status in outcomes) == ["coalesced"] * 3 + ["miss"]
+    assert {value for value, _ in outcomes} == {"result"}
+
+
+def test_cached_decorator_records_the_status():
+    cache = ToolCache()
+
+    class Echo(WikiSearch):
+        @cached(ttl=60, cache=cache)
+        def execute(self):
+            return self.query.upper()
+
+    first, second = Echo(query="jaipur"), Echo(query="jaipur")
+    assert first.execute() == second.execute() == "JAIPUR"
+    assert (first._cache_status, second._cache_status) == ("miss", "hit")